@@ -0,0 +1,104 @@
+# -----------------------------------------------------------------------------
+# 홈 배경 이미지
+# -----------------------------------------------------------------------------
+# 배경 이미지를 매 화면마다 base64 로 인코딩해 CSS 에 넣지 않고,
+#   1) Streamlit 정적 파일(./static, server.enableStaticServing)로 한 번만 내려보내거나
+#   2) 정적 서비스가 꺼져 있으면 프로세스당 한 번 만든 data URI 를 재사용한다.
+# 휴대폰(세로 화면)용으로는 화면에 실제로 보이는 가운데 부분만 잘라낸 WebP 를 따로 둔다.
+# (Pillow 가 없으면 원본만 사용)
+import base64
+import mimetypes
+import os
+import shutil
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow 미설치 환경
+    Image = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+STATIC_URL = "app/static"
+BG_SOURCES = ["bg.jpg", "bg.png"]
+MOBILE_NAME = "bg_mobile.webp"
+MOBILE_ASPECT = 3 / 4   # 세로 화면에서 background-size: cover 로 보이는 가로:세로 비율
+MOBILE_QUALITY = 75
+
+
+def find_source(app_dir=APP_DIR):
+    for name in BG_SOURCES:
+        path = os.path.join(app_dir, name)
+        if os.path.exists(path): return path
+    return None
+
+
+def _is_fresh(target, source):
+    return os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source)
+
+
+def make_mobile_variant(source, target):
+    """가운데를 세로 3:4 로 잘라낸 WebP (높이는 그대로 유지해 확대 시 흐려지지 않게)"""
+    if Image is None: return False
+    with Image.open(source) as im:
+        width = min(im.width, round(im.height * MOBILE_ASPECT))
+        left = (im.width - width) // 2
+        im.crop((left, 0, left + width, im.height)).convert("RGB").save(target, "WEBP", quality=MOBILE_QUALITY)
+    return True
+
+
+def prepare_static_background(app_dir=APP_DIR, static_dir=STATIC_DIR):
+    """./static 에 배경 원본과 모바일 변형을 준비 → (데스크톱 URL, 모바일 URL 또는 None)"""
+    source = find_source(app_dir)
+    if source is None: return None, None
+    os.makedirs(static_dir, exist_ok=True)
+
+    name = os.path.basename(source)
+    target = os.path.join(static_dir, name)
+    if not _is_fresh(target, source): shutil.copy2(source, target)
+
+    mobile = os.path.join(static_dir, MOBILE_NAME)
+    try:
+        has_mobile = _is_fresh(mobile, source) or make_mobile_variant(source, mobile)
+    except OSError:
+        has_mobile = False
+    return f"{STATIC_URL}/{name}", (f"{STATIC_URL}/{MOBILE_NAME}" if has_mobile else None)
+
+
+def data_uri(path):
+    """파일 → data URI (정적 서비스를 쓸 수 없을 때)"""
+    mime = mimetypes.guess_type(path)[0] or "image/jpeg"
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def background_css(desktop_url, mobile_url=None):
+    """홈 화면 배경 CSS"""
+    mobile_css = f"""
+    @media only screen and (max-width: 600px) and (orientation: portrait) {{
+        .stApp {{ background-image: url("{mobile_url}"); }}
+    }}""" if mobile_url else ""
+    return f"""
+    <style>
+    .stApp {{
+        background-image: url("{desktop_url}");
+        background-size: cover;
+        background-position: center;
+        background-repeat: no-repeat;
+        background-attachment: fixed;
+    }}{mobile_css}
+    .block-container {{
+        padding-top: 0rem;
+    }}
+    .footer-credit {{
+        position: fixed;
+        bottom: 10px;
+        right: 10px;
+        color: rgba(255, 255, 255, 0.5) !important;
+        font-size: 0.8rem;
+        padding: 4px 10px;
+        background-color: rgba(0, 0, 0, 0.4);
+        border-radius: 15px;
+        z-index: 9999;
+    }}
+    </style>
+    """
@@ -0,0 +1,82 @@
+# -----------------------------------------------------------------------------
+# 회비 계산 벤치마크: 기존 iterrows 반복 vs 회비 현황표 엔진 (이름 해석표 + 회비 타임라인)
+# -----------------------------------------------------------------------------
+# 실행: python -m benchmarks.bench_dues
+import time
+
+import numpy as np
+import pandas as pd
+
+from dues import compute_dues_table, total_due_target, COL_PAID
+from dues_timeline import build_timeline, as_of_month
+
+# (회원 수, 장부 행 수)
+SIZES = [(30, 2000), (100, 10000), (300, 50000), (1000, 200000)]
+REPEAT = 3
+
+
+def make_frames(n_members, n_rows, seed=0):
+    """합성 회원/장부 데이터"""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"회원{i:05d}" for i in range(n_members)])
+    df_members = pd.DataFrame({'성명': names})
+    df_ledger = pd.DataFrame({
+        '구분': rng.choice(['입금', '출금'], size=n_rows, p=[0.9, 0.1]),
+        '분류': rng.choice(['회비', '상조금', '근조화환', '회의비외'], size=n_rows),
+        '내용': rng.choice(names, size=n_rows),
+        '금액': rng.choice([30000, 100000, 1000000], size=n_rows).astype("int64"),
+    })
+    return df_members, df_ledger
+
+
+def legacy_dues_table(df_members, df_ledger, due_target):
+    """page_all_status 의 기존 회원별 반복 로직"""
+    analysis_data = []
+    for index, row in df_members.iterrows():
+        name = row['성명']
+        paid_total = df_ledger[(df_ledger['구분'] == '입금') & (df_ledger['내용'] == name)]['금액'].sum()
+        unpaid = due_target - paid_total
+        note = "미납" if unpaid > 0 else ("선납" if unpaid < 0 else "완납")
+        analysis_data.append({
+            "회원명": name,
+            "A.납부할금액": due_target,
+            "B.납부한금액": paid_total,
+            "차이금액(=A-B)": unpaid,
+            "상태": note
+        })
+    return pd.DataFrame(analysis_data)
+
+
+def timeline_dues_table(df_members, df_ledger, months_passed):
+    """화면과 같은 경로 (장부 내용 → 회원번호 해석 후 회원 × 월 집계)"""
+    return compute_dues_table(build_timeline(df_members, df_ledger, as_of_month(months_passed)))
+
+
+def best_of(fn, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    months_passed = 80
+    due = total_due_target(months_passed)
+    print(f"{'회원':>6} {'장부행':>8} {'기존(ms)':>10} {'엔진(ms)':>10} {'배율':>7}")
+    for n_members, n_rows in SIZES:
+        df_members, df_ledger = make_frames(n_members, n_rows)
+
+        # 결과 일치 확인
+        old = legacy_dues_table(df_members, df_ledger, due)
+        new = timeline_dues_table(df_members, df_ledger, months_passed)
+        assert (old[COL_PAID].to_numpy() == new[COL_PAID].to_numpy()).all()
+
+        t_old = best_of(legacy_dues_table, df_members, df_ledger, due)
+        t_new = best_of(timeline_dues_table, df_members, df_ledger, months_passed)
+        print(f"{n_members:>6} {n_rows:>8} {t_old * 1000:>10.1f} {t_new * 1000:>10.1f} {t_old / t_new:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
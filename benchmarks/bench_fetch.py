@@ -0,0 +1,56 @@
+# -----------------------------------------------------------------------------
+# 시트 가져오기 벤치마크: 시트별 순차 요청 vs 동시 요청 + 조건부 재검증
+# -----------------------------------------------------------------------------
+# 실행: python -m benchmarks.bench_fetch
+import time
+
+import pandas as pd
+
+from benchmarks.bench_dues import make_frames
+from benchmarks.mock_sheets import MockSheetServer
+from sheets import SheetFetcher, sheet_csv_url, SHEET_NAMES
+
+LATENCY = 0.2  # 요청당 지연(초) - 구글 응답 시간 흉내
+
+
+def make_sheets():
+    df_members, df_ledger = make_frames(100, 20000)
+    return {
+        "members": df_members,
+        "ledger": df_ledger,
+        "assets": pd.DataFrame({'항목': ['회비통장', '적금통장'], '금액': ['55,000,000', '10,500,000']}),
+        "rules": pd.DataFrame({'조항': ['제1조'], '제목': ['목적'], '내용': ['상부상조']}),
+    }
+
+
+def sequential(sheet_url):
+    """기존 load_data 방식 (시트마다 순차 read_csv)"""
+    return {name: pd.read_csv(sheet_csv_url(sheet_url, name), dtype=str) for name in SHEET_NAMES}
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    with MockSheetServer(make_sheets(), latency=LATENCY) as server:
+        _, t_seq = timed(sequential, server.sheet_url)
+
+        fetcher = SheetFetcher(server.sheet_url)
+        cold, t_cold = timed(fetcher.fetch_all)
+        warm, t_warm = timed(fetcher.fetch_all)
+        server.set_sheet("ledger", make_frames(100, 20001)[1])
+        partial, t_partial = timed(fetcher.fetch_all)
+        fetcher.close()
+
+        print(f"순차 요청 (기존)       : {t_seq:8.1f} ms")
+        print(f"동시 요청 (최초)       : {t_cold:8.1f} ms  변경 {sum(r.changed for r in cold.values())}장")
+        print(f"동시 요청 (변경 없음)  : {t_warm:8.1f} ms  변경 {sum(r.changed for r in warm.values())}장")
+        print(f"동시 요청 (ledger 변경): {t_partial:8.1f} ms  변경 {sum(r.changed for r in partial.values())}장")
+        print(f"304 응답 {server.not_modified}회 / 전체 {server.requests}회")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------
+# 장부 메모리 벤치마크: 기존 문자열(object) 프레임 vs 압축 스키마
+# -----------------------------------------------------------------------------
+# 실행: python -m benchmarks.bench_memory [--sizes xs,s,m]
+# 기존 load_data 는 pd.read_csv(dtype=str) 그대로 모든 컬럼을 문자열로 들고 있었다.
+# 컬럼별 실제 메모리(deep)와, st.cache_data 가 보관하는 pickle 크기를 함께 비교한다.
+# 읽는 동안의 최대 메모리(tracemalloc)는 한 번에 읽기 vs 청크 읽기(ingest.read_sheet)로 비교한다.
+import argparse
+import io
+import pickle
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.bench_suite import SIZES, DEFAULT_SIZES
+from benchmarks.synthetic import generate, to_csv_bytes
+from ingest import read_sheet
+from schema import normalize_ledger
+
+
+def legacy_ledger(raw):
+    """기존 방식: 문자열 그대로"""
+    return pd.read_csv(io.BytesIO(raw), dtype=str)
+
+
+def column_mb(df):
+    return df.memory_usage(deep=True, index=False) / 2**20
+
+
+def peak_mb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장부 메모리 비교")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"쉼표로 구분 ({','.join(SIZES)}) 또는 all")
+    args = parser.parse_args()
+
+    labels = list(SIZES) if args.sizes == "all" else args.sizes.split(",")
+    for label in labels:
+        n_members, n_rows = SIZES[label]
+        raw = to_csv_bytes(generate(n_members, n_rows)["ledger"])
+        old = legacy_ledger(raw)
+        new = normalize_ledger(old)
+
+        old_mb, new_mb = column_mb(old), column_mb(new)
+        print(f"\n[{label}] 회원 {n_members:,}명, 장부 {n_rows:,}행")
+        print(f"{'컬럼':<8} {'기존(MB)':>10} {'압축(MB)':>10}  압축 타입")
+        for col in old.columns:
+            print(f"{col:<8} {old_mb[col]:>10.1f} {new_mb[col]:>10.1f}  {new[col].dtype.name}")
+        old_pickle = len(pickle.dumps(old)) / 2**20
+        new_pickle = len(pickle.dumps(new)) / 2**20
+        print(f"{'합계':<8} {old_mb.sum():>10.1f} {new_mb.sum():>10.1f}  ({old_mb.sum() / new_mb.sum():.1f}배 감소)")
+        print(f"{'pickle':<8} {old_pickle:>10.1f} {new_pickle:>10.1f}")
+        whole = peak_mb(lambda: normalize_ledger(legacy_ledger(raw)))
+        chunked = peak_mb(lambda: read_sheet("ledger", io.BytesIO(raw)))
+        print(f"{'읽기최대':<8} {whole:>10.1f} {chunked:>10.1f}  (한 번에 읽기 vs 청크 읽기)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# -----------------------------------------------------------------------------
+# 전체 벤치마크: 합성 데이터로 단계별 시간 / 처리량 / 최대 메모리 측정
+# -----------------------------------------------------------------------------
+# 실행: python -m benchmarks.bench_suite [--sizes xs,s,m] [--json out.json] [--baseline base.json]
+#   parse    : 시트 CSV → ingest.read_sheet (청크 파싱 + 스키마 검증 + 정규화, load_data 의 파싱 경로)
+#   ledger_cube : 장부 집계 큐브 (구분 × 분류 × 월/내용)
+#   paid_append : 장부 동기화로 새로 붙은 행(APPEND_ROWS)만 회원번호로 해석해서 입금 합계에 더하기
+#   status   : 회비 타임라인 + 회원 전체 현황 집계 (잔액 대사 포함)
+#   personal : 회원 색인 생성 + 아이디 조회 (개인 현황)
+#   statements : 회원별 현황표 일괄 내보내기 (html zip, 풀 없이 한 프로세스)
+#   rules    : 회칙 색인 생성 + 검색
+# --baseline 을 주면 이전 결과보다 TOLERANCE 이상 느려진 단계를 표시하고 종료 코드 1 로 끝난다.
+import argparse
+import io
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import generate, to_csv_bytes
+from dues import get_dues_calc_info
+from dues_timeline import build_timeline, as_of_month, tally_paid
+from ledger_cube import build_ledger_cube
+from member_index import build_member_index
+from member_resolve import MemberResolver, member_names, resolve_members
+from reports import build_status_report, build_personal_report
+from rules_search import RuleIndex
+from statements import export_statements
+from ingest import read_sheet
+from sheets import SHEET_NAMES
+from store import DataSnapshot
+
+# 이름 → (회원 수, 장부 행 수)
+SIZES = {
+    "xs": (30, 3000),
+    "s": (300, 30000),
+    "m": (1000, 200000),
+    "l": (3000, 1000000),
+    "xl": (10000, 3000000),
+}
+DEFAULT_SIZES = "xs,s,m"
+REPEAT = 3
+N_LOOKUPS = 2000
+APPEND_ROWS = 100
+QUERIES = ["회비", "상조금 지급", "ㅎㅂ", "정기총회 의결", "제1", "탈퇴", "(", "없는말"]
+TOLERANCE = 0.25
+
+
+def measure(fn, repeat=REPEAT):
+    """(결과, 최소 시간 초, 최대 메모리 MB) - 시간은 추적 없이, 메모리는 한 번 더 추적해서"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, peak / 2**20
+
+
+def parse_all(raw):
+    return {name: read_sheet(name, io.BytesIO(raw[name])).frame for name in SHEET_NAMES}
+
+
+def run_size(label, n_members, n_rows, repeat=REPEAT):
+    sheets = generate(n_members, n_rows)
+    raw = {name: to_csv_bytes(df) for name, df in sheets.items()}
+    raw_mb = sum(len(b) for b in raw.values()) / 2**20
+    results = []
+
+    def record(stage, seconds, peak_mb, items, unit):
+        results.append({
+            "size": label, "members": n_members, "rows": n_rows, "stage": stage,
+            "ms": seconds * 1000, "peak_mb": peak_mb, "throughput": items / seconds if seconds else 0.0,
+            "unit": unit,
+        })
+
+    frames, t, mem = measure(lambda: parse_all(raw), repeat)
+    record("parse", t, mem, raw_mb, "MB/s")
+
+    _, months_passed = get_dues_calc_info()
+    snapshot = DataSnapshot(frames, version=label)
+
+    resolution, t, mem = measure(lambda: resolve_members(frames["members"], frames["ledger"]), repeat)
+    record("resolve", t, mem, n_rows, "rows/s")
+
+    cube, t, mem = measure(lambda: build_ledger_cube(frames["ledger"], resolution.member_ids), repeat)
+    record("ledger_cube", t, mem, n_rows, "rows/s")
+
+    resolver = MemberResolver(member_names(frames["members"]))
+    totals = tally_paid(resolver.names, resolver.member_ids(frames["ledger"]), frames["ledger"])
+    tail = frames["ledger"].tail(APPEND_ROWS)
+    _, t, mem = measure(lambda: tally_paid(resolver.names, resolver.member_ids(tail), tail, totals), repeat)
+    record("paid_append", t, mem, len(tail), "rows/s")
+
+    def status():
+        timeline = build_timeline(frames["members"], frames["ledger"], as_of_month(months_passed),
+                                  resolution=resolution, paid_totals=totals)
+        return build_status_report(snapshot, months_passed, timeline, cube), timeline
+    (_, timeline), t, mem = measure(status, repeat)
+    record("status", t, mem, n_rows, "rows/s")
+
+    index, t, mem = measure(lambda: build_member_index(frames["members"], frames["ledger"], resolution, cube), repeat)
+    record("member_index", t, mem, n_members, "members/s")
+
+    ids = np.random.default_rng(1).choice(frames["members"]['아이디'].to_numpy(), N_LOOKUPS)
+
+    def lookups():
+        return [build_personal_report(index, timeline, user_id) for user_id in ids]
+    found, t, mem = measure(lookups, repeat)
+    assert all(found)
+    record("personal", t, mem, N_LOOKUPS, "lookups/s")
+
+    # 풀 시작 비용을 빼고 현황표 그리기만 재도록 이 프로세스에서
+    count, t, mem = measure(lambda: export_statements(io.BytesIO(), index, timeline, workers=1), repeat)
+    record("statements", t, mem, count, "statements/s")
+
+    rule_index, t, mem = measure(lambda: RuleIndex(frames["rules"]), repeat)
+    record("rule_index", t, mem, len(frames["rules"]), "rules/s")
+
+    _, t, mem = measure(lambda: [rule_index.search(q) for q in QUERIES * 50], repeat)
+    record("rules", t, mem, len(QUERIES) * 50, "queries/s")
+    return results
+
+
+def compare(results, baseline):
+    """이전 결과 대비 느려진 단계 목록"""
+    before = {(r["size"], r["stage"]): r["ms"] for r in baseline}
+    slower = []
+    for r in results:
+        old = before.get((r["size"], r["stage"]))
+        if old and r["ms"] > old * (1 + TOLERANCE):
+            slower.append((r["size"], r["stage"], old, r["ms"]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상조회 앱 벤치마크")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"쉼표로 구분 ({','.join(SIZES)}) 또는 all")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    labels = list(SIZES) if args.sizes == "all" else args.sizes.split(",")
+    print(f"{'크기':>4} {'회원':>6} {'장부행':>8}  {'단계':<12} {'시간(ms)':>10} {'최대메모리(MB)':>14} {'처리량':>16}")
+    results = []
+    for label in labels:
+        n_members, n_rows = SIZES[label]
+        for r in run_size(label, n_members, n_rows, args.repeat):
+            results.append(r)
+            print(f"{label:>4} {n_members:>6} {n_rows:>8}  {r['stage']:<12} {r['ms']:>10.1f} {r['peak_mb']:>14.1f} "
+                  f"{r['throughput']:>10,.0f} {r['unit']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(results, f, ensure_ascii=False, indent=1)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = compare(results, json.load(f))
+        for size, stage, old, new in slower:
+            print(f"⚠️ {size}/{stage}: {old:.1f} ms → {new:.1f} ms")
+        if slower: raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
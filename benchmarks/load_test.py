@@ -0,0 +1,263 @@
+# -----------------------------------------------------------------------------
+# 동시 접속 부하 테스트: 실제 streamlit 서버 + 로컬 구글 시트 대역
+# -----------------------------------------------------------------------------
+# 실행: python -m benchmarks.load_test [--sessions 10,50,100] [--size s] [--latency 0.2]
+# 조의 공지 직후처럼 회원들이 한꺼번에 링크를 여는 상황을 흉내 낸다.
+#   1. 합성 시트(synthetic.py)를 MockSheetServer 로 띄우고
+#   2. 그 주소를 가리키는 임시 secrets.toml 로 `streamlit run streamlit_app.py` 를 띄운 뒤
+#   3. 브라우저 대신 웹소켓(/_stcore/stream)으로 N 개의 세션을 동시에 열어
+#      홈 → 회원전체현황 → 개인현황(아이디 입력) → 회칙(검색) 순서로 화면을 요청한다.
+# 화면별 응답 시간(요청 → script_finished)의 p50/p95/p99 와
+# 서버 프로세스의 CPU 시간 / 최대 메모리(RSS)를 세션 수로 나눈 값을 출력한다.
+# CPU/메모리는 /proc 에서 읽으므로 리눅스에서만 표시된다. 웹소켓 클라이언트는 websockets 패키지.
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks.bench_suite import SIZES
+from benchmarks.mock_sheets import MockSheetServer
+from benchmarks.synthetic import generate
+
+try:
+    import websockets
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.proto.WidgetStates_pb2 import WidgetStates
+except ImportError:  # pragma: no cover - websockets 미설치 환경
+    websockets = None
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+PAGES = ["home", "status", "personal", "personal.lookup", "rules", "rules.search"]
+PAGE_TIMEOUT = 120   # 화면 하나를 기다리는 최대 시간(초)
+TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+# --- 서버 프로세스 -------------------------------------------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def write_secrets(path, sheet_url, snapshot_dir):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'[connections]\nsheet_url = "{sheet_url}"\n\n[snapshot]\ndir = "{snapshot_dir}"\n')
+
+
+def start_app(port, secrets_path):
+    cmd = [sys.executable, "-m", "streamlit", "run", APP, "--server.port", str(port),
+           "--server.headless", "true", "--browser.gatherUsageStats", "false",
+           "--server.fileWatcherType", "none", "--secrets.files", secrets_path]
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(APP), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit 실행 실패:\n{proc.stderr.read().decode(errors='replace')}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200: return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("streamlit 서버가 60초 안에 뜨지 않았습니다")
+
+
+def proc_cpu(pid):
+    """프로세스 누적 CPU 시간(초) / 읽을 수 없으면 None"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / TICKS
+    except OSError:
+        return None
+
+
+def proc_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"): return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+# --- 세션 (브라우저 대역) ---------------------------------------------------------
+class Session:
+    """웹소켓 세션 하나: 화면 요청을 보내고 script_finished 까지 기다림"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = WidgetStates()
+
+    async def run(self, page):
+        """page 를 실행 → (ms, 화면 요소 목록, 예외 메시지 목록)"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_name = "" if page == "home" else page
+        msg.rerun_script.widget_states.CopyFrom(self.widgets)
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        elements, errors = [], []
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await asyncio.wait_for(self.ws.recv(), PAGE_TIMEOUT))
+            kind = fm.WhichOneof("type")
+            if kind == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                element = fm.delta.new_element
+                elements.append(element)
+                if element.WhichOneof("type") == "exception": errors.append(element.exception.message)
+            elif kind == "script_finished":
+                return (time.perf_counter() - t0) * 1000, elements, errors
+
+    def set_text(self, elements, label, value):
+        """화면의 text_input(label) 에 값 입력 (다음 run 에 반영)"""
+        widget_id = next(el.text_input.id for el in elements
+                         if el.WhichOneof("type") == "text_input" and el.text_input.label == label)
+        self.widgets = WidgetStates()
+        state = self.widgets.widgets.add()
+        state.id = widget_id
+        state.string_value = value
+
+
+def has_text(elements, needle):
+    """markdown / 알림(st.success 등) 본문에 needle 이 있는지"""
+    for el in elements:
+        kind = el.WhichOneof("type")
+        if kind in ("markdown", "alert") and needle in getattr(el, kind).body: return True
+    return False
+
+
+async def user_flow(url, user_id, query, think, timings, errors, barrier):
+    """홈 → 회원전체현황 → 개인현황(아이디 입력) → 회칙(검색)"""
+    try:
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            session = Session(ws)
+
+            async def step(name, page):
+                ms, elements, failed = await session.run(page)
+                timings[name].append(ms)
+                errors.extend(failed)
+                if think: await asyncio.sleep(think)
+                return elements
+
+            await step("home", "home")
+            await step("status", "status")
+            elements = await step("personal", "personal")
+            session.set_text(elements, "아이디입력", user_id)
+            elements = await step("personal.lookup", "personal")
+            if not has_text(elements, "환영합니다"): errors.append(f"개인현황 조회 실패: {user_id}")
+            session.widgets = WidgetStates()
+            elements = await step("rules", "rules")
+            session.set_text(elements, "규정 검색", query)
+            await step("rules.search", "rules")
+            # 모든 세션이 끝날 때까지 연결 유지 (동시 접속 메모리 측정)
+            await barrier.wait()
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+        barrier.abort()
+
+
+async def run_sessions(url, pid, n, user_ids, query, think):
+    timings = {page: [] for page in PAGES}
+    errors = []
+    barrier = asyncio.Barrier(n)
+    peak = {"rss": proc_rss_mb(pid)}
+    sampling = True
+
+    async def sample():
+        while sampling:
+            rss = proc_rss_mb(pid)
+            if rss is not None and (peak["rss"] is None or rss > peak["rss"]): peak["rss"] = rss
+            await asyncio.sleep(0.05)
+
+    sampler = asyncio.create_task(sample())
+    cpu0, t0 = proc_cpu(pid), time.perf_counter()
+    await asyncio.gather(*[user_flow(url, user_ids[i % len(user_ids)], query, think, timings, errors, barrier)
+                           for i in range(n)])
+    wall, cpu1 = time.perf_counter() - t0, proc_cpu(pid)
+    sampling = False
+    await sampler
+    cpu = cpu1 - cpu0 if cpu0 is not None and cpu1 is not None else None
+    return timings, errors, wall, cpu, peak["rss"]
+
+
+# --- 보고 ----------------------------------------------------------------------
+def percentiles(values):
+    if not values: return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": p50, "p95": p95, "p99": p99}
+
+
+def fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 접속 부하 테스트")
+    parser.add_argument("--sessions", default="10,50,100", help="동시 세션 수 (쉼표로 여러 단계)")
+    parser.add_argument("--size", default="s", choices=list(SIZES), help="합성 데이터 크기 (bench_suite 와 동일)")
+    parser.add_argument("--latency", type=float, default=0.2, help="시트 대역의 요청당 지연(초)")
+    parser.add_argument("--think", type=float, default=0.0, help="화면 사이 대기 시간(초)")
+    parser.add_argument("--query", default="회비", help="회칙 검색어")
+    parser.add_argument("--json", help="결과를 JSON 으로 저장")
+    args = parser.parse_args()
+    if websockets is None:
+        parser.error("부하 테스트에는 websockets 가 필요합니다 (pip install websockets)")
+
+    n_members, n_rows = SIZES[args.size]
+    sheets = generate(n_members, n_rows)
+    user_ids = sheets["members"]["아이디"].tolist()
+    results = []
+    with MockSheetServer(sheets, latency=args.latency) as mock, tempfile.TemporaryDirectory() as tmp:
+        secrets_path = os.path.join(tmp, "secrets.toml")
+        write_secrets(secrets_path, mock.sheet_url, os.path.join(tmp, "snapshots"))
+        port = free_port()
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        app = start_app(port, secrets_path)
+        try:
+            base_rss = proc_rss_mb(app.pid)
+            # 첫 세션: 시트 로딩 + 공유 집계 계산 (콜드 스타트)
+            cold, cold_errors, cold_wall, _, _ = asyncio.run(run_sessions(url, app.pid, 1, user_ids, args.query, 0))
+            warm_rss = proc_rss_mb(app.pid)
+            print(f"데이터: 회원 {n_members:,}명, 장부 {n_rows:,}행 / 시트 지연 {args.latency * 1000:.0f} ms")
+            print(f"콜드 스타트 1세션: {cold_wall * 1000:,.0f} ms (회원전체현황 {cold['status'][0]:,.0f} ms)"
+                  f" / 서버 메모리 {fmt(base_rss, ',.0f')} → {fmt(warm_rss, ',.0f')} MB"
+                  + (f" / 오류 {len(cold_errors)}건" if cold_errors else ""))
+
+            for n in [int(x) for x in args.sessions.split(",")]:
+                timings, errors, wall, cpu, peak = asyncio.run(
+                    run_sessions(url, app.pid, n, user_ids, args.query, args.think))
+                per_session_mb = (peak - warm_rss) / n if peak is not None and warm_rss is not None else None
+                print(f"\n[동시 {n}세션] {wall:,.1f} 초, 흐름 {n / wall:,.1f}개/초, 오류 {len(errors)}건")
+                print(f"  CPU {fmt(cpu, ',.1f')} 초 (세션당 {fmt(cpu / n * 1000 if cpu is not None else None, ',.0f')} ms)"
+                      f" · 최대 메모리 {fmt(peak, ',.0f')} MB (세션당 {fmt(per_session_mb, ',.2f')} MB)")
+                print(f"  {'화면':<16} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+                for page in PAGES:
+                    p = percentiles(timings[page])
+                    print(f"  {page:<16} {p['p50']:>9,.0f} {p['p95']:>9,.0f} {p['p99']:>9,.0f}")
+                    results.append({"sessions": n, "page": page, **{k: round(v, 1) for k, v in p.items()}})
+                results.append({"sessions": n, "page": "*", "wall_s": round(wall, 2), "errors": len(errors),
+                                "cpu_s": cpu, "peak_rss_mb": peak, "mb_per_session": per_session_mb})
+                for message in sorted(set(errors))[:5]:
+                    print(f"  ⚠️ {message}")
+        finally:
+            app.terminate()
+            app.wait(10)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
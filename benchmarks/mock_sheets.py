@@ -0,0 +1,143 @@
+# -----------------------------------------------------------------------------
+# 로컬 구글 시트 대역 (gviz CSV 엔드포인트 흉내)
+# -----------------------------------------------------------------------------
+# /spreadsheets/d/<id>/gviz/tq?tqx=out:csv&sheet=<시트명> 요청에 CSV 를 돌려준다.
+# ETag / If-None-Match(304), gviz 쿼리의 offset/limit, 인위적인 지연(latency)을 지원한다.
+# touch() 로 내용은 그대로 두고 ETag 만 바꿀 수 있다 (구글 시트가 같은 내용을 새 ETag 로 내보내는 경우).
+#
+#   python -m benchmarks.mock_sheets --dir ./sheets --port 8765
+#   → secrets.toml 의 sheet_url = "http://127.0.0.1:8765/spreadsheets/d/LOCAL/edit"
+import argparse
+import csv
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def apply_query(content, query):
+    """'select * offset N limit M' 만 흉내 (헤더 행은 항상 포함)"""
+    offset = re.search(r'offset\s+(\d+)', query, re.I)
+    limit = re.search(r'limit\s+(\d+)', query, re.I)
+    rows = list(csv.reader(io.StringIO(content.decode("utf-8"))))
+    header, body = rows[:1], rows[1:]
+    if offset: body = body[int(offset.group(1)):]
+    if limit: body = body[:int(limit.group(1))]
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerows(header + body)
+    return out.getvalue().encode("utf-8")
+
+
+class MockSheetServer:
+    """시트명 → CSV 바이트를 서비스하는 로컬 HTTP 서버 (with 문 지원)"""
+
+    def __init__(self, sheets=None, host="127.0.0.1", port=0, latency=0.0):
+        self.sheets = {}
+        self.latency = latency
+        self.requests = 0        # 전체 요청 수
+        self.not_modified = 0    # 304 응답 수
+        self.revisions = {}      # 시트명 → touch() 횟수 (ETag 에 섞음)
+        for name, content in (sheets or {}).items():
+            self.set_sheet(name, content)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def sheet_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/spreadsheets/d/LOCAL/edit"
+
+    def set_sheet(self, name, content):
+        """시트 내용 교체 (DataFrame 또는 CSV 문자열/바이트)"""
+        if hasattr(content, "to_csv"): content = content.to_csv(index=False)
+        if isinstance(content, str): content = content.encode("utf-8")
+        self.sheets[name] = content
+
+    def touch(self, name):
+        """내용은 그대로 두고 ETag 만 바꾸기"""
+        self.revisions[name] = self.revisions.get(name, 0) + 1
+
+    def load_dir(self, path):
+        for fname in os.listdir(path):
+            if fname.endswith(".csv"):
+                with open(os.path.join(path, fname), "rb") as f:
+                    self.set_sheet(fname[:-4], f.read())
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                if server.latency: time.sleep(server.latency)
+                query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                name = query.get("sheet", [""])[0]
+                content = server.sheets.get(name)
+                if content is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if "tq" in query:
+                    content = apply_query(content, query["tq"][0])
+                etag = '"%s-%d"' % (hashlib.sha1(content).hexdigest(), server.revisions.get(name, 0))
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 구글 시트 대역 서버")
+    parser.add_argument("--dir", required=True, help="<시트명>.csv 파일이 있는 폴더")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연(초)")
+    args = parser.parse_args()
+
+    server = MockSheetServer(port=args.port, latency=args.latency)
+    server.load_dir(args.dir)
+    print(f"sheet_url = \"{server.sheet_url}\"  (시트: {', '.join(sorted(server.sheets))})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
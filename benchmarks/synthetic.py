@@ -0,0 +1,169 @@
+# -----------------------------------------------------------------------------
+# 합성 상조회 데이터 생성기
+# -----------------------------------------------------------------------------
+# 실제 구글 시트와 같은 컬럼/문자열 형식(금액 "30,000", 거래일시 "2021-03-05 10:12:00")으로
+# members / ledger / assets / rules 네 장을 만든다. 회원 30명 ~ 1만 명, 장부 수백만 행까지.
+#
+#   python -m benchmarks.synthetic --members 300 --rows 50000 --out /tmp/sheets
+#   python -m benchmarks.mock_sheets --dir /tmp/sheets      # 로컬 시트 서버로 띄우기
+import argparse
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from dues import DUES_START_DATE, INITIAL_FEE, MONTHLY_FEE
+from sheets import SHEET_NAMES
+
+SURNAMES = list("김이박최정강조윤장임한오서신권황안송류홍")
+GIVEN = list("민서준지현우수영진하은도윤성재연주희태호경석")
+ROLES = ["회원"] * 20 + ["총무", "감사"]
+
+# 출금 분류별 (비율, 금액 후보)
+EXPENSES = {
+    '상조금': (0.10, [1000000]),
+    '근조화환': (0.10, [100000]),
+    '회의비외': (0.80, [50000, 120000, 250000, 480000]),
+}
+DEPOSIT_SHARE = 0.95
+RULE_WORDS = ["회원", "회비", "상조금", "근조화환", "총무", "감사", "정기총회", "임원", "경조사",
+              "납부", "지급", "의결", "탈퇴", "가입", "적립", "통장", "회계", "보고"]
+
+
+def member_names(n, rng):
+    """성+이름 두 글자, 겹치면 번호를 붙여 고유하게"""
+    base = (rng.choice(SURNAMES, n).astype(object)
+            + rng.choice(GIVEN, n).astype(object)
+            + rng.choice(GIVEN, n).astype(object))
+    names = pd.Series(base)
+    dup = names.groupby(names).cumcount()
+    return np.where(dup > 0, names + dup.astype(str), names).astype(object)
+
+
+def make_members(n_members, rng, today):
+    names = member_names(n_members, rng)
+    # 창립 회원 60%, 나머지는 기준일 ~ 오늘 사이 가입
+    span = max((today - DUES_START_DATE).days, 1)
+    offsets = np.where(rng.random(n_members) < 0.6, 0, rng.integers(0, span, n_members))
+    joined = pd.Timestamp(DUES_START_DATE) + pd.to_timedelta(offsets, unit="D")
+    roles = rng.choice(ROLES, n_members).astype(object)
+    roles[0] = "회장"
+    return pd.DataFrame({
+        '성명': names,
+        '직책': roles,
+        '가입일자': joined.strftime("%Y-%m-%d"),
+        '아이디': [f"user{i:05d}" for i in range(n_members)],
+    }), joined
+
+
+def make_ledger(members, joined, n_rows, rng, today):
+    """회비 입금 위주 + 상조금/근조화환/회의비 출금 + 적금 가입 1건"""
+    n_dep = int(n_rows * DEPOSIT_SHARE)
+    n_out = n_rows - n_dep - 1
+    end = pd.Timestamp(today)
+
+    who = rng.integers(0, len(members), n_dep)
+    start = joined[who]
+    span = (end - start).days.to_numpy().clip(1)
+    dep_dates = start + pd.to_timedelta(rng.integers(0, span) * 86400 + rng.integers(32400, 64800, n_dep), unit="s")
+    dep_amount = rng.choice([MONTHLY_FEE, MONTHLY_FEE * 2, MONTHLY_FEE * 3, INITIAL_FEE], n_dep, p=[0.85, 0.06, 0.04, 0.05])
+
+    kinds = rng.choice(list(EXPENSES), n_out, p=[share for share, _ in EXPENSES.values()])
+    out_amount = np.empty(n_out, dtype="int64")
+    for kind, (_, amounts) in EXPENSES.items():
+        mask = kinds == kind
+        out_amount[mask] = rng.choice(amounts, mask.sum())
+    out_name = np.where(kinds == '회의비외', "정기모임", members['성명'].to_numpy()[rng.integers(0, len(members), n_out)])
+    total_days = max((end - pd.Timestamp(DUES_START_DATE)).days, 1)
+    out_dates = pd.Timestamp(DUES_START_DATE) + pd.to_timedelta(rng.integers(0, total_days * 86400, n_out), unit="s")
+
+    ledger = pd.DataFrame({
+        '거래일시': np.concatenate([dep_dates.to_numpy(), out_dates.to_numpy(), [np.datetime64(DUES_START_DATE, "s") + np.timedelta64(140, "D")]]),
+        '구분': np.concatenate([np.full(n_dep, '입금', dtype=object), np.full(n_out + 1, '출금', dtype=object)]),
+        '분류': np.concatenate([np.full(n_dep, '회비', dtype=object), kinds.astype(object), ['적금']]),
+        '내용': np.concatenate([members['성명'].to_numpy()[who], out_name, ['적금가입']]),
+        '금액': np.concatenate([dep_amount, out_amount, [10000000]]),
+    }).sort_values('거래일시', kind="stable", ignore_index=True)
+    return ledger
+
+
+def make_assets(ledger):
+    deposits = ledger.loc[ledger['구분'] == '입금', '금액'].sum()
+    expenses = ledger.loc[ledger['구분'] == '출금', '금액'].sum()
+    fee_account = int(deposits - expenses) + 1234567
+    savings = 10500000
+    return pd.DataFrame({
+        '항목': ['회비통장', '적금통장', '합계'],
+        '은행': ['국민', '신한', ''],
+        '금액': [fee_account, savings, fee_account + savings],
+        '비고': ['', '', ''],
+    })
+
+
+def make_rules(n_rules, rng):
+    words = np.array(RULE_WORDS, dtype=object)
+    contents = [
+        " ".join(rng.choice(words, rng.integers(8, 60))) + " 에 관한 사항은 총회의 의결을 따른다."
+        for _ in range(n_rules)
+    ]
+    return pd.DataFrame({
+        '조항': [f"제{i}조" for i in range(1, n_rules + 1)],
+        '제목': [f"{rng.choice(words)}의 {rng.choice(words)}" for _ in range(n_rules)],
+        '내용': contents,
+    })
+
+
+def to_sheet_strings(df):
+    """시트 CSV 내보내기 형식으로 (금액은 천 단위 콤마, 날짜는 문자열)"""
+    out = df.copy()
+    for col in out.columns:
+        if col in ('금액',):
+            out[col] = pd.Series(out[col].to_numpy(), dtype="int64").map("{:,}".format)
+        elif pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+    return out
+
+
+def generate(n_members, n_rows, n_rules=60, seed=0, today=None):
+    """원본 시트 네 장 (문자열) → {시트명: DataFrame}"""
+    rng = np.random.default_rng(seed)
+    today = today or pd.Timestamp.now().normalize().to_pydatetime()
+    members, joined = make_members(n_members, rng, today)
+    ledger = make_ledger(members, joined, n_rows, rng, today)
+    sheets = {
+        "members": members,
+        "ledger": ledger,
+        "assets": make_assets(ledger),
+        "rules": make_rules(n_rules, rng),
+    }
+    return {name: to_sheet_strings(df) for name, df in sheets.items()}
+
+
+def to_csv_bytes(df):
+    buf = io.StringIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue().encode("utf-8")
+
+
+def write_dir(sheets, path):
+    """시트마다 <이름>.csv 로 저장 (MockSheetServer.load_dir 로 읽을 수 있게)"""
+    os.makedirs(path, exist_ok=True)
+    for name in SHEET_NAMES:
+        sheets[name].to_csv(os.path.join(path, f"{name}.csv"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 상조회 시트 생성")
+    parser.add_argument("--members", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--rules", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="CSV 를 저장할 폴더")
+    args = parser.parse_args()
+    write_dir(generate(args.members, args.rows, args.rules, args.seed), args.out)
+    print(f"{args.out}: 회원 {args.members}명, 장부 {args.rows}행, 회칙 {args.rules}조")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+# -----------------------------------------------------------------------------
+# 데이터 로딩 (구글 시트 → 캐시)
+# -----------------------------------------------------------------------------
+# 상조회(tenants.py)마다 하나의 DataSource(store.py)를 만들어 그 상조회의 모든 페이지/세션이 공유한다.
+# DataSource 의 백그라운드 스레드가 TTL 마다 네 장의 시트를 동시에 새로고침하고, 바뀐 시트만 정규화하며,
+# 장부는 새로 추가된 행만 받아 붙이고 회원별 입금 합계도 그 행만큼 더한다.
+# 새 버전의 공유 집계도 그 스레드에서 미리 계산한 뒤 스냅샷을 바꿔 끼우므로,
+# 화면 요청은 시트 응답도 집계 계산도 기다리지 않는다.
+# 앱이 새로 뜰 때는 로컬 스냅샷(.snapshots)을 먼저 보여주고,
+# 구글 시트가 응답하지 않으면 마지막 정상 스냅샷을 계속 보여준다.
+# 공유 집계는 상조회별 AggregateCache 에 두므로 한 상조회의 집계가 다른 상조회의 집계를 밀어내지 않는다.
+# 공유 프레임은 읽기 전용으로 취급하며, 페이지는 얕은 복사본을 받는다.
+# (Copy-on-Write 덕분에 페이지에서 컬럼을 바꿔도 캐시 원본은 그대로)
+from dataclasses import astuple
+
+import streamlit as st
+
+from dues import get_dues_calc_info
+from dues_timeline import build_timeline, as_of_month, load_rate_schedule, RATE_SCHEDULE
+from ledger_cube import build_ledger_cube
+from member_index import build_member_index
+from member_resolve import resolve_members
+from perf import span, cache_call, cache_miss
+from reconcile import load_reconcile_config, ReconcileConfig
+from reports import build_status_report, build_personal_report
+from rules_search import RuleIndex
+from sheets import SheetFetcher
+from snapshots import SnapshotStore, DEFAULT_SNAPSHOT_DIR
+from store import DataSource, LedgerSync, empty_snapshot
+from tenants import AggregateCache, TenantRegistry, load_clubs, CLUB_PARAM, MAX_ACTIVE, TENANT_MEMORY_MB
+
+CACHE_TTL = 60  # 초 (백그라운드 새로고침 주기)
+
+# 상조회를 고르지 못했을 때(시트 주소 없음)의 빈 스냅샷 집계
+_NO_CLUB = AggregateCache(TENANT_MEMORY_MB * 2**20)
+
+
+def get_clubs():
+    """secrets 의 상조회 목록 → {아이디: Club}"""
+    try:
+        return load_clubs(st.secrets)
+    except Exception:
+        return {}
+
+
+def get_snapshot_dir():
+    try:
+        return st.secrets["snapshot"]["dir"]
+    except Exception:
+        return DEFAULT_SNAPSHOT_DIR
+
+
+def get_max_active():
+    try:
+        return int(st.secrets["tenancy"]["max_active"])
+    except Exception:
+        return MAX_ACTIVE
+
+
+def get_rate_schedule():
+    """월 회비 변경 이력 (secrets 의 [dues] rates = {"2020-02" = 30000, ...}, 없으면 기본값)"""
+    try:
+        return load_rate_schedule(st.secrets)
+    except Exception:
+        return RATE_SCHEDULE
+
+
+def get_reconcile_config():
+    """잔액 대사 허용 범위 등 (secrets 의 [reconcile], 없으면 기본값)"""
+    try:
+        return load_reconcile_config(st.secrets)
+    except Exception:
+        return ReconcileConfig()
+
+
+def current_club():
+    """이번 세션의 상조회 (?club=<아이디> 로 한 번 고르면 세션 동안 유지, 하나뿐이면 그것) / 없으면 None"""
+    clubs = get_clubs()
+    requested = st.query_params.get(CLUB_PARAM)
+    if requested in clubs:
+        st.session_state["club"] = requested
+    club_id = st.session_state.get("club")
+    if club_id not in clubs:
+        club_id = next(iter(clubs)) if len(clubs) == 1 else None
+    return clubs.get(club_id)
+
+
+def get_sheet_url():
+    club = current_club()
+    return club.sheet_url if club else ""
+
+
+def _make_source(tenant):
+    """상조회 하나의 데이터 소스 (HTTP 세션, 재검증 정보, 장부 동기화 상태, 새로고침 스레드)"""
+    cache_miss("source")
+    sheet_url = tenant.club.sheet_url
+    fetcher = SheetFetcher(sheet_url)
+    disk = SnapshotStore(get_snapshot_dir(), sheet_url)
+    return DataSource(fetcher, LedgerSync(fetcher), disk, ttl=CACHE_TTL,
+                      prepare=lambda snap: tenant.prepare(snap, warm_aggregates))
+
+
+@st.cache_resource(max_entries=1, on_release=lambda registry: registry.close())
+def get_registry(clubs_key, max_active, _clubs):
+    """프로세스당 하나의 상조회 목록 (secrets 의 상조회 설정이 바뀌면 새로 만듦)"""
+    return TenantRegistry(_clubs, _make_source, max_active)
+
+
+def _registry():
+    clubs = get_clubs()
+    return get_registry(tuple(astuple(club) for club in clubs.values()), get_max_active(), clubs)
+
+
+def get_tenant():
+    """이번 세션 상조회의 Tenant / 고르지 못했으면 None"""
+    club = current_club()
+    return _registry().get(club.club_id) if club else None
+
+
+def get_registry_table():
+    """메모리에 올라온 상조회별 데이터/집계 메모리 (관리자 패널)"""
+    return _registry().table()
+
+
+def get_source():
+    tenant = get_tenant()
+    return tenant.source if tenant else None
+
+
+def _snapshot(tenant):
+    cache_call("source")
+    with span("load_data"):
+        return tenant.source.get()
+
+
+def load_all(view=None):
+    """현재 데이터 스냅샷 (메모리에서 바로 - 새로고침은 백그라운드 스레드가 함, view 를 주면 그 스냅샷)"""
+    if view is not None: return view[1]
+    tenant = get_tenant()
+    return _snapshot(tenant) if tenant else empty_snapshot()
+
+
+def _current():
+    """(이번 세션 상조회의 공유 집계 캐시, 현재 스냅샷) - 한 화면의 집계가 같은 버전을 보도록 함께 꺼냄"""
+    tenant = get_tenant()
+    if tenant is None: return _NO_CLUB, empty_snapshot()
+    return tenant.aggregates, _snapshot(tenant)
+
+
+def load_view():
+    """페이지용 (공유 집계 캐시, 스냅샷) 한 쌍
+
+    페이지 시작에서 한 번 꺼내 아래 load_*(view=...) 에 넘기면, 페이지를 그리는 도중 백그라운드 새로고침이
+    스냅샷을 바꿔 끼워도 한 화면의 표/검색/캐시 키가 모두 같은 버전에서 나온다.
+    """
+    return _current()
+
+
+def load_data(sheet_name, view=None):
+    """정규화된 공유 프레임 (얕은 복사본 반환)"""
+    return load_all(view).frames[sheet_name].copy(deep=False)
+
+
+def load_members(view=None): return load_data("members", view)
+def load_ledger(view=None): return load_data("ledger", view)
+def load_assets(view=None): return load_data("assets", view)
+def load_rules(view=None): return load_data("rules", view)
+
+
+
+# -----------------------------------------------------------------------------
+# 공유 집계 캐시 (상조회/데이터 버전별로 한 번만 계산, 그 상조회의 모든 세션 공유)
+# -----------------------------------------------------------------------------
+# _이름(cache, snap, ...) 은 필요한 다른 집계도 같은 스냅샷으로 꺼내므로 버전이 섞이지 않는다.
+def _member_resolution(cache, snap):
+    cache_call("member_resolution")
+
+    def build():
+        cache_miss("member_resolution")
+        with span("build.member_resolution"):
+            return resolve_members(snap.frames["members"], snap.frames["ledger"])
+    return cache.get("member_resolution", snap.version, build)
+
+
+def _ledger_cube(cache, snap):
+    resolution = _member_resolution(cache, snap)
+    cache_call("ledger_cube")
+
+    def build():
+        cache_miss("ledger_cube")
+        with span("build.ledger_cube"):
+            return build_ledger_cube(snap.frames["ledger"], resolution.member_ids)
+    return cache.get("ledger_cube", snap.version, build)
+
+
+def _member_index(cache, snap):
+    resolution, cube = _member_resolution(cache, snap), _ledger_cube(cache, snap)
+    cache_call("member_index")
+
+    def build():
+        cache_miss("member_index")
+        with span("build.member_index"):
+            return build_member_index(snap.frames["members"], snap.frames["ledger"], resolution, cube)
+    return cache.get("member_index", snap.version, build)
+
+
+def _dues_timeline(cache, snap, months_passed, schedule):
+    resolution = _member_resolution(cache, snap)
+    cache_call("dues_timeline")
+
+    def build():
+        cache_miss("dues_timeline")
+        with span("build.dues_timeline"):
+            return build_timeline(snap.frames["members"], snap.frames["ledger"], as_of_month(months_passed), schedule,
+                                  resolution=resolution, paid_totals=snap.paid_totals)
+    return cache.get("dues_timeline", (snap.version, months_passed, schedule), build)
+
+
+def _status_report(cache, snap, months_passed, schedule, reconcile_config):
+    timeline, cube = _dues_timeline(cache, snap, months_passed, schedule), _ledger_cube(cache, snap)
+    cache_call("status_report")
+
+    def build():
+        cache_miss("status_report")
+        with span("build.status_report"):
+            return build_status_report(snap, months_passed, timeline, cube, reconcile_config)
+    return cache.get("status_report", (snap.version, months_passed, schedule, reconcile_config), build)
+
+
+def _rule_index(cache, snap):
+    cache_call("rule_index")
+
+    def build():
+        cache_miss("rule_index")
+        with span("build.rule_index"):
+            return RuleIndex(snap.frames["rules"])
+    return cache.get("rule_index", snap.digests.get("rules", ""), build)
+
+
+def load_member_resolution(view=None):
+    """장부 내용 → 회원번호 해석표 (데이터 버전이 바뀔 때만 다시 만듦)"""
+    return _member_resolution(*(view or _current()))
+
+
+def load_ledger_cube(view=None):
+    """구분 × 분류 × 월/회원번호 집계 (데이터 버전이 바뀔 때만 다시 만듦)"""
+    return _ledger_cube(*(view or _current()))
+
+
+def load_member_index(view=None):
+    """아이디/회원명 색인 (데이터 버전이 바뀔 때만 다시 만듦)"""
+    return _member_index(*(view or _current()))
+
+
+def load_dues_timeline(view=None):
+    """회원 × 월 회비 타임라인 (데이터 버전/기준월이 바뀔 때만 다시 계산)"""
+    _, months_passed = get_dues_calc_info()
+    return _dues_timeline(*(view or _current()), months_passed, get_rate_schedule())
+
+
+def load_status_report(view=None):
+    """회원 전체 현황 집계 (데이터 버전/기준월이 바뀔 때만 다시 계산)"""
+    _, months_passed = get_dues_calc_info()
+    return _status_report(*(view or _current()), months_passed, get_rate_schedule(), get_reconcile_config())
+
+
+def load_personal_report(user_id, view=None):
+    """아이디 → 개인 현황 (색인/타임라인 조회만 하므로 따로 캐시하지 않음) / 없으면 None"""
+    cache, snap = view or _current()
+    _, months_passed = get_dues_calc_info()
+    return build_personal_report(_member_index(cache, snap),
+                                 _dues_timeline(cache, snap, months_passed, get_rate_schedule()), user_id)
+
+
+def load_statement_inputs(view=None):
+    """현황표 일괄 내보내기용 (데이터 버전, 아이디 색인, 회비 타임라인, 전체 현황) - 모두 같은 스냅샷에서"""
+    cache, snap = view or _current()
+    _, months_passed = get_dues_calc_info()
+    schedule = get_rate_schedule()
+    return (snap.version, _member_index(cache, snap), _dues_timeline(cache, snap, months_passed, schedule),
+            _status_report(cache, snap, months_passed, schedule, get_reconcile_config()))
+
+
+def load_rule_index(view=None):
+    """회칙 검색 색인 (회칙 시트가 바뀔 때만 다시 만듦)"""
+    return _rule_index(*(view or _current()))
+
+
+def cached_render(name, key, build, max_entries, view=None):
+    """화면 조각(HTML 등) 캐시 - 이번 세션 상조회의 캐시에 두어 상조회끼리 밀어내지 않음"""
+    cache = (view or _current())[0]
+    cache_call(name)
+
+    def counted():
+        cache_miss(name)
+        return build()
+    return cache.get(name, key, counted, max_entries)
+
+
+def warm_aggregates(cache, snap):
+    """새 스냅샷의 공유 집계를 미리 계산 (새로고침 스레드에서, 스냅샷을 바꿔 끼우기 전에)
+
+    화면의 load_* 와 같은 키로 넣으므로 바꿔 끼운 뒤 첫 화면부터 캐시에서 바로 읽는다.
+    이전 버전 집계는 종류별 보관 수(AGGREGATE_VERSIONS)나 상조회 메모리 한도를 넘으면 밀려난다.
+    """
+    _, months_passed = get_dues_calc_info()
+    _member_index(cache, snap)
+    _status_report(cache, snap, months_passed, get_rate_schedule(), get_reconcile_config())
+    _rule_index(cache, snap)
@@ -0,0 +1,55 @@
+# -----------------------------------------------------------------------------
+# 회비 계산 엔진
+# -----------------------------------------------------------------------------
+# 회비 기준일/금액, 회원별 현황표의 열 이름과 현황표/개인 조회 진입점.
+# 회원별 납부할 금액 / 납부한 금액은 이름 해석표(member_resolve)를 거쳐 dues_timeline 이 한 번에 산출하고,
+# 여기서는 그 결과를 현황표(compute_dues_table)와 개인 조회(lookup_member_dues)로 꺼낸다.
+# streamlit 에 의존하지 않으므로 벤치마크/배치 작업에서도 그대로 사용한다.
+from datetime import datetime
+
+DUES_START_DATE = datetime(2020, 2, 1)  # 회비 기준일
+INITIAL_FEE = 100000                    # 최초 가입금
+MONTHLY_FEE = 30000                     # 월 회비
+
+COL_NAME = "회원명"
+COL_DUE = "A.납부할금액"
+COL_PAID = "B.납부한금액"
+COL_DIFF = "차이금액(=A-B)"
+COL_STATUS = "상태"
+DUES_COLUMNS = [COL_NAME, COL_DUE, COL_PAID, COL_DIFF, COL_STATUS]
+
+
+def get_dues_calc_info(today=None):
+    """기준일부터 경과 월수 계산 → (오늘, 경과 월수)"""
+    today = today or datetime.now()
+    # 경과 월수 계산 (현재년 - 시작년)*12 + (현재월 - 시작월)
+    months_passed = (today.year - DUES_START_DATE.year) * 12 + (today.month - DUES_START_DATE.month)
+
+    if months_passed < 0: months_passed = 0
+    return today, months_passed
+
+
+def total_due_target(months_passed):
+    """1인당 납부해야 할 회비 총액"""
+    return INITIAL_FEE + (months_passed * MONTHLY_FEE)
+
+
+def dues_status(unpaid):
+    """차이금액 → 미납/선납/완납"""
+    return "미납" if unpaid > 0 else ("선납" if unpaid < 0 else "완납")
+
+
+def compute_dues_table(timeline):
+    """회원별 회비 납부 현황표 (DUES_COLUMNS, 합계 행 제외)
+
+    회원 × 월 타임라인(dues_timeline.build_timeline)의 회원별 합계를 그대로 쓴다.
+    (장부 전체를 회원 수만큼 다시 훑지 않고, 입금은 이름 해석표의 회원번호로 한 번에 집계됨)
+    """
+    return timeline.summary()[DUES_COLUMNS]
+
+
+def lookup_member_dues(timeline, name):
+    """회원 한 명의 납부 현황 → dict(due, paid, unpaid, status, overdue, overdue_since) / 없으면 None"""
+    dues = timeline.member_dues(name)
+    if dues is None: return None
+    return {**dues, "status": dues_status(dues["unpaid"])}
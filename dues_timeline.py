@@ -0,0 +1,233 @@
+# -----------------------------------------------------------------------------
+# 회비 타임라인 (회원 × 월 행렬)
+# -----------------------------------------------------------------------------
+# 회원별로 매월 납부할 금액과 실제 입금액을 (회원 수 × 월 수) 정수 행렬로 만든다.
+#   - 가입월에 최초 가입금, 그 다음 달부터 월 회비 (가입일자가 기준일 이전/공란이면 기준일부터)
+#   - 월 회비는 RATE_SCHEDULE 의 적용 시작월 기준으로 바뀔 수 있음 (첫 적용월 이전 달은 기본 월 회비)
+#   - 입금은 거래일시의 월에 반영 (기준일 이전/날짜 없음 → 첫 달, 기준월 이후 → 마지막 달)
+#   - 입금 행은 이름 해석표(member_resolve)의 회원번호로 회원에 붙인다
+# 회원번호 × 월 입금액(PaidTotals)은 장부 동기화(store.LedgerSync)가 새로 붙은 행만큼 더해 두므로
+# 스냅샷에 있으면 장부를 다시 훑지 않고 그대로 쓴다.
+# 누적합 한 번으로 월별 미납 잔액과 연체 개월수를 전체 회원에 대해 한 번에 구한다.
+# 연체 개월수: 총 입금액을 오래된 달부터 채웠을 때 채우지 못한 달의 수
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from dues import (DUES_START_DATE, INITIAL_FEE, MONTHLY_FEE,
+                  COL_NAME, COL_DUE, COL_PAID, COL_DIFF, COL_STATUS)
+from member_resolve import member_names, resolve_members
+from schema import parse_datetime
+
+# (적용 시작일, 월 회비) - 시작일 순서로
+RATE_SCHEDULE = ((DUES_START_DATE, MONTHLY_FEE),)
+
+COL_OVERDUE = "연체개월"
+COL_OVERDUE_SINCE = "연체시작월"
+
+
+def to_month(value):
+    return pd.Period(value, freq="M")
+
+
+def as_of_month(months_passed, start=DUES_START_DATE):
+    """기준일부터 경과 월수 → 기준월"""
+    return to_month(start) + int(months_passed)
+
+
+def monthly_rates(months, schedule=RATE_SCHEDULE):
+    """월(PeriodIndex)별 월 회비 배열 (변경 이력의 첫 적용월 이전은 MONTHLY_FEE)"""
+    starts = np.array([to_month(start).ordinal for start, _ in schedule], dtype="int64")
+    fees = np.array([fee for _, fee in schedule], dtype="int64")
+    pos = np.searchsorted(starts, months.asi8, side="right") - 1
+    return np.where(pos >= 0, fees[np.clip(pos, 0, None)], MONTHLY_FEE)
+
+
+def load_rate_schedule(secrets):
+    """secrets 의 [dues] rates = {"2020-02" = 30000, ...} → 월 회비 변경 이력 (없으면 RATE_SCHEDULE)"""
+    rates = (secrets.get("dues") or {}).get("rates") or {}
+    return tuple(sorted((str(start), int(fee)) for start, fee in rates.items())) or RATE_SCHEDULE
+
+
+def _month_offsets(dates, first):
+    """날짜 Series → 첫 달 기준 열 번호 (첫 달 이전/날짜 없음은 첫 달)"""
+    offsets = (dates.dt.year - first.year) * 12 + (dates.dt.month - first.month)
+    return offsets.fillna(0).clip(lower=0).to_numpy(dtype="int64")
+
+
+@dataclass(frozen=True)
+class PaidTotals:
+    """회원번호 × 월 입금액 (열은 첫 달부터 장부에 나온 마지막 달까지)"""
+    names: pd.Index          # 회원번호 → 성명 (member_resolve.member_names)
+    first: pd.Period         # 첫 열의 달
+    paid: np.ndarray         # (회원번호, 월) 입금액
+
+    def columns(self, n_months):
+        """첫 달부터 n_months 개 열로 (그 뒤 달의 입금은 마지막 열에 합침)"""
+        paid = self.paid
+        if paid.shape[1] > n_months:
+            return np.concatenate([paid[:, :n_months - 1], paid[:, n_months - 1:].sum(axis=1, keepdims=True)], axis=1)
+        return np.pad(paid, ((0, 0), (0, n_months - paid.shape[1])))
+
+
+def tally_paid(names, member_ids, df_ledger, base=None, start=DUES_START_DATE):
+    """장부 행과 그 회원번호 → PaidTotals (base 가 있으면 거기에 더함 - 새로 붙은 행만 넘기면 됨)"""
+    first = base.first if base is not None else to_month(start)
+    paid = base.paid if base is not None else np.zeros((len(names), 1), dtype="int64")
+    if not len(names) or df_ledger.empty or not {'구분', '금액'} <= set(df_ledger.columns):
+        return base if base is not None else PaidTotals(names, first, paid)
+
+    is_deposit = (df_ledger['구분'] == '입금').to_numpy(dtype=bool, na_value=False)
+    rows = member_ids[is_deposit].astype("int64")
+    ok = rows >= 0
+    deposits = df_ledger[is_deposit]
+    if '거래일시' in deposits.columns:
+        offsets = _month_offsets(deposits['거래일시'], first)[ok]
+    else:
+        offsets = np.zeros(int(ok.sum()), dtype="int64")
+    if len(offsets):
+        n_months = max(paid.shape[1], int(offsets.max()) + 1)
+        flat = np.bincount(rows[ok] * n_months + offsets,
+                           weights=deposits['금액'].to_numpy()[ok], minlength=len(names) * n_months)
+        paid = np.pad(paid, ((0, 0), (0, n_months - paid.shape[1]))) \
+            + np.rint(flat).astype("int64").reshape(len(names), n_months)
+    return PaidTotals(names, first, paid)
+
+
+@dataclass(frozen=True)
+class DuesTimeline:
+    names: pd.Index          # 회원명 (회원 시트 순서)
+    months: pd.PeriodIndex   # 기준일 ~ 기준월
+    join: np.ndarray         # 회원별 가입월 열 번호 (기준월 이후 가입이면 len(months))
+    expected: np.ndarray     # (회원, 월) 납부할 금액
+    paid: np.ndarray         # (회원, 월) 입금액
+    rates: np.ndarray = None # 월별 월 회비
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    @property
+    def due_from_start(self):
+        """기준일부터 회원이었던 경우의 1인당 납부할 금액 (최초 가입금 + 이후 달의 월 회비)"""
+        return INITIAL_FEE + int(self.rates[1:].sum())
+
+    @cached_property
+    def due_total(self):
+        return self.expected.sum(axis=1)
+
+    @cached_property
+    def paid_total(self):
+        return self.paid.sum(axis=1)
+
+    def arrears(self):
+        """(회원, 월) 월말 기준 누적 미납 잔액 (음수는 선납)"""
+        return np.cumsum(self.expected, axis=1) - np.cumsum(self.paid, axis=1)
+
+    @cached_property
+    def month_labels(self):
+        return self.months.strftime("%Y-%m").to_numpy()
+
+    def overdue_months(self):
+        """회원별 (연체 개월수, 연체 시작 열 번호 또는 -1) - 한 번 계산해서 재사용"""
+        return self._overdue
+
+    @cached_property
+    def _overdue(self):
+        charged = np.cumsum(self.expected, axis=1)
+        uncovered = (charged > self.paid_total[:, None]) & (self.expected > 0)
+        count = uncovered.sum(axis=1)
+        since = np.where(count > 0, uncovered.argmax(axis=1), -1)
+        return count, since
+
+    def summary(self):
+        """회원별 납부 현황표 (dues.DUES_COLUMNS + 연체개월/연체시작월)"""
+        due, paid = self.due_total, self.paid_total
+        unpaid = due - paid
+        count, since = self.overdue_months()
+        month_labels = self.month_labels
+        return pd.DataFrame({
+            COL_NAME: self.names,
+            COL_DUE: due,
+            COL_PAID: paid,
+            COL_DIFF: unpaid,
+            COL_STATUS: np.select([unpaid > 0, unpaid < 0], ["미납", "선납"], default="완납"),
+            COL_OVERDUE: count,
+            COL_OVERDUE_SINCE: np.where(since >= 0, month_labels[np.clip(since, 0, None)], "-"),
+        })
+
+    @cached_property
+    def _rows(self):
+        # 회원명 → 첫 행 번호 (동명이인은 첫 번째)
+        return {name: i for i, name in reversed(list(enumerate(self.names)))}
+
+    def _row(self, name):
+        return self._rows.get(name)
+
+    def member_dues(self, name):
+        """회원 한 명의 납부 현황 → dict(due, paid, unpaid, overdue, overdue_since) / 없으면 None"""
+        i = self._row(name)
+        if i is None: return None
+        count, since = self.overdue_months()
+        due, paid = int(self.due_total[i]), int(self.paid_total[i])
+        return {
+            "due": due,
+            "paid": paid,
+            "unpaid": due - paid,
+            "overdue": int(count[i]),
+            "overdue_since": self.month_labels[since[i]] if since[i] >= 0 else None,
+        }
+
+    def history(self, name):
+        """회원 한 명의 월별 내역 (가입월부터) / 없으면 None"""
+        i = self._row(name)
+        if i is None: return None
+        cols = slice(min(self.join[i], len(self.months) - 1), None)
+        expected, paid = self.expected[i], self.paid[i]
+        return pd.DataFrame({
+            "월": self.month_labels[cols],
+            "납부할금액": expected[cols],
+            "납부한금액": paid[cols],
+            "누적미납액": (np.cumsum(expected) - np.cumsum(paid))[cols],
+        })
+
+
+def build_timeline(df_members, df_ledger, as_of=None, schedule=RATE_SCHEDULE, start=DUES_START_DATE, resolution=None,
+                   paid_totals=None):
+    """회원/장부 프레임 → DuesTimeline (as_of: 기준월, 기본값은 이번 달)
+
+    resolution: 같은 버전의 이름 해석표, paid_totals: 같은 버전의 회원번호 × 월 입금액
+    (성명 목록/첫 달이 맞으면 장부를 다시 훑지 않음, 없으면 여기서 집계)
+    """
+    first = to_month(start)
+    last = max(to_month(as_of if as_of is not None else pd.Timestamp.now()), first)
+    months = pd.period_range(first, last, freq="M")
+    n_months = len(months)
+
+    names = pd.Index(df_members['성명'] if '성명' in df_members.columns else [], dtype=object)
+    n = len(names)
+
+    # 가입월 열 번호: 공란/기준일 이전 → 0, 기준월 이후 → n_months (청구 없음)
+    if '가입일자' in df_members.columns:
+        joined = parse_datetime(df_members['가입일자'].astype(str)).reset_index(drop=True)
+        join = ((joined.dt.year - first.year) * 12 + (joined.dt.month - first.month))
+        join = join.fillna(0).clip(0, n_months).to_numpy(dtype="int64")
+    else:
+        join = np.zeros(n, dtype="int64")
+
+    col = np.arange(n_months)
+    rates = monthly_rates(months, schedule)
+    expected = np.where(col > join[:, None], rates, 0)
+    expected[join < n_months, join[join < n_months]] = INITIAL_FEE
+
+    # 입금: 회원번호 × 월 로 한 번에 합산 (동명이인은 같은 번호라 같은 입금액을 봄 - 기존 규칙과 동일)
+    if paid_totals is None or paid_totals.first != first or not paid_totals.names.equals(member_names(df_members)):
+        if resolution is None: resolution = resolve_members(df_members, df_ledger)
+        paid_totals = tally_paid(resolution.names, resolution.member_ids, df_ledger, start=start)
+    paid = paid_totals.columns(n_months)[paid_totals.names.get_indexer(names)]
+
+    return DuesTimeline(names=names, months=months, join=join, expected=expected, paid=paid, rates=rates)
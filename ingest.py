@@ -0,0 +1,120 @@
+# -----------------------------------------------------------------------------
+# 시트 CSV 청크 읽기 (스키마 검증 + 정규화 + 오류 행 보고)
+# -----------------------------------------------------------------------------
+# 시트 전체를 문자열 프레임으로 한 번에 읽지 않고 CHUNK_ROWS 행씩 읽으면서
+#   - 청크마다 바로 정규화해서 (공백 제거, 콤마 제거, 금액/날짜 변환, category)
+#     문자열 원본은 청크 하나만큼만 메모리에 남고
+#   - 스키마(schema.SCHEMAS)에 맞지 않는 행은 버리거나 값을 비운 뒤 bad_rows 로 모은다.
+# 필수 컬럼이 없으면 SchemaError 로 실패해서 '데이터 없음' 대신 오류로 드러난다.
+# 행 번호는 머리글을 1행으로 센 시트 행 번호.
+#
+# pandas 의 청크 읽기(C 엔진)는 필드가 남는 행을 경고 없이 잘라 버리므로,
+# 머리글 뒤에 여분 컬럼(EXTRA_FIELDS 개)을 두고 거기에 값이 들어온 행을 '컬럼 수 초과'로 버린다.
+# 그보다 더 많이 남는 행은 잘린 채로 같이 버리거나, pandas 가 읽기를 멈추면 SchemaError (행 번호 포함).
+from dataclasses import dataclass, field
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from schema import SCHEMAS, NORMALIZERS, SheetSchema, SchemaError, find_column
+
+CHUNK_ROWS = 100_000
+MAX_BAD_ROWS = 1000   # 보관할 오류 행 수 (전체 개수는 bad_count)
+EXTRA_FIELDS = 4
+EXTRA = [f"__extra{i}__" for i in range(EXTRA_FIELDS)]
+BAD_COLUMNS = ['행', '컬럼', '값', '사유']
+
+
+def empty_bad_rows():
+    return pd.DataFrame(columns=BAD_COLUMNS)
+
+
+@dataclass
+class IngestResult:
+    frame: pd.DataFrame
+    bad_rows: pd.DataFrame = field(default_factory=empty_bad_rows)  # 행, 컬럼, 값, 사유
+    bad_count: int = 0      # 오류 행 전체 개수 (bad_rows 는 MAX_BAD_ROWS 까지만)
+    rows: int = 0           # 읽은 데이터 행 수 (버린 행 포함)
+
+
+def _issues(values, column, reason):
+    """오류 칸 값(Series, 원본 청크 인덱스) → 오류 행 프레임"""
+    return pd.DataFrame({'행': values.index + 2, '컬럼': column, '값': values.to_numpy(), '사유': reason})
+
+
+def _check_chunk(raw, kept, norm, schema):
+    """원본 청크 / 남긴 행 / 정규화 결과 비교 → 오류 행 프레임 목록
+
+    값 검사는 변환 결과가 0/NaT/허용 밖인 칸만 원본과 대조하므로 정상 행은 거의 비용이 없다.
+    """
+    issues = []
+    extra = raw[EXTRA].dropna(how='all')
+    if not extra.empty:
+        values = extra.apply(lambda row: ",".join(row.dropna()), axis=1)
+        issues.append(_issues(values, '', '컬럼 수 초과 (행 제외)'))
+
+    amount_col = find_column(kept, schema.amount)
+    if amount_col:
+        values = kept.loc[norm[amount_col].eq(0), amount_col].dropna()
+        cleaned = values.str.replace(r'[,\s]', '', regex=True)
+        bad = cleaned.ne('') & ~cleaned.str.fullmatch(r'[+-]?\d+').fillna(False).astype(bool)
+        if bad.any(): issues.append(_issues(values[bad], amount_col, '금액 형식 오류 (0 으로 처리)'))
+
+    for col in schema.dates:
+        if col not in kept.columns: continue
+        values = kept.loc[norm[col].isna(), col].dropna()
+        bad = values.str.strip().ne('')
+        if bad.any(): issues.append(_issues(values[bad], col, '날짜 형식 오류 (빈 값으로 처리)'))
+
+    for col, allowed in schema.choices:
+        if col not in norm.columns: continue
+        values = norm[col].astype(str)
+        bad = ~values.isin(allowed) & values.ne('')
+        if bad.any(): issues.append(_issues(values[bad], col, '허용되지 않는 값'))
+    return issues
+
+
+def concat_chunks(chunks):
+    """정규화된 청크 합치기 (category 컬럼은 범주를 합쳐 정렬된 category 로 유지)"""
+    if len(chunks) == 1: return chunks[0]
+    first = chunks[0]
+    categorical = [col for col in first.columns if isinstance(first[col].dtype, pd.CategoricalDtype)]
+    merged = pd.concat([chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True)
+    for col in categorical:
+        merged[col] = union_categoricals([chunk[col] for chunk in chunks], sort_categories=True)
+    return merged[list(first.columns)]
+
+
+def read_sheet(sheet_name, stream, schema=None, chunksize=CHUNK_ROWS):
+    """CSV 스트림(파일 객체) → IngestResult (필수 컬럼이 없으면 SchemaError)"""
+    schema = schema or SCHEMAS.get(sheet_name, SheetSchema())
+    normalize = NORMALIZERS.get(sheet_name, lambda df: df)
+
+    start = stream.tell()
+    try:
+        header = pd.read_csv(stream, dtype=str, nrows=0).columns.str.strip()
+    except pd.errors.EmptyDataError:
+        raise SchemaError("빈 시트 (머리글 없음)") from None
+    missing = schema.missing(header)
+    if missing:
+        raise SchemaError(f"필수 컬럼 없음: {', '.join(missing)}")
+    stream.seek(start)
+
+    chunks, issues, rows = [], [], 0
+    reader = pd.read_csv(stream, dtype=str, header=None, skiprows=1, names=[*header, *EXTRA], index_col=False,
+                         chunksize=chunksize)
+    try:
+        for raw in reader:
+            rows += len(raw)
+            extra = raw[EXTRA[0]].notna()
+            kept = (raw[~extra] if extra.any() else raw).drop(columns=EXTRA)
+            norm = normalize(kept)
+            issues += _check_chunk(raw, kept, norm, schema)
+            chunks.append(norm)
+    except pd.errors.ParserError as e:
+        raise SchemaError(f"CSV 형식 오류: {str(e).strip()}") from None
+
+    frame = concat_chunks(chunks) if chunks else normalize(pd.DataFrame(columns=header, dtype=str))
+    frame = frame.reset_index(drop=True)
+    bad = pd.concat(issues, ignore_index=True).sort_values('행', kind='stable') if issues else empty_bad_rows()
+    return IngestResult(frame, bad.head(MAX_BAD_ROWS), len(bad), rows)
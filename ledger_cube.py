@@ -0,0 +1,99 @@
+# -----------------------------------------------------------------------------
+# 장부 집계 큐브 (구분 × 분류 × 월 / 구분 × 분류 × 회원번호)
+# -----------------------------------------------------------------------------
+# 장부를 데이터 버전마다 한 번만 훑어 두 개의 작은 집계표(합계/건수)를 만든다.
+#   - monthly : 구분 × 분류 × 월   → 지출 항목표, 적금 원금, 연도별/월별 추이, 기간 조회
+#   - members : 구분 × 분류 × 회원번호 → 회원별 입금/조의금/근조화환 (개인 현황)
+#               회원번호는 member_resolve 가 내용을 회원에 맞춘 정수 배열 (못 찾은 행은 빠짐)
+# 이후의 요약은 모두 이 표에서 꺼내므로 분류마다 장부 전체를 다시 거르지 않는다.
+# 거래일시가 없는 행은 월이 NaT 로 남아 합계에는 들어가고 기간 조회에서만 빠진다.
+from dataclasses import dataclass
+
+import pandas as pd
+
+from member_resolve import UNRESOLVED
+
+KEYS = ['구분', '분류']
+
+
+def _month_bound(value, how):
+    """'YYYY' → 그 해의 첫/마지막 달, 'YYYY-MM' → 그 달"""
+    value = str(value)
+    return pd.Period(value, 'Y').asfreq('M', how) if len(value) == 4 else pd.Period(value, 'M')
+
+
+def _group(df, keys):
+    amounts = df['금액'].astype("int64")
+    grouped = amounts.groupby([df[k] if isinstance(k, str) else k for k in keys],
+                              observed=True, sort=True, dropna=False).agg(['sum', 'count'])
+    return grouped.rename(columns={'sum': '금액', 'count': '건수'})
+
+
+@dataclass(frozen=True)
+class LedgerCube:
+    monthly: pd.DataFrame   # index (구분, 분류, 월) → 금액, 건수
+    members: pd.DataFrame   # index (구분, 분류, 회원번호) → 금액, 건수
+
+    @property
+    def empty(self):
+        return self.monthly.empty
+
+    def totals(self, kind=None):
+        """분류별 합계 Series (kind: '입금'/'출금', None 이면 구분 무관)"""
+        if self.empty: return pd.Series(dtype="int64")
+        frame = self.monthly if kind is None else self._select(self.monthly, kind)
+        return frame.groupby(level='분류', observed=True)['금액'].sum()
+
+    def amount(self, kind, category):
+        """구분/분류 한 칸의 합계"""
+        return int(self.totals(kind).get(category, 0))
+
+    def trend(self, kind='출금', freq='Y', start=None, end=None):
+        """기간(연 'Y' / 월 'M') × 분류 합계 표 (start/end: 'YYYY' 또는 'YYYY-MM', 양 끝 포함)"""
+        if self.empty: return pd.DataFrame()
+        frame = self._select(self.monthly, kind)['금액'].reset_index()
+        frame = frame[frame['월'].notna()]
+        if start is not None: frame = frame[frame['월'] >= _month_bound(start, 'start')]
+        if end is not None: frame = frame[frame['월'] <= _month_bound(end, 'end')]
+        period = frame['월'].dt.asfreq(freq) if freq != 'M' else frame['월']
+        table = frame.assign(기간=period.astype(str)).pivot_table(
+            index='기간', columns='분류', values='금액', aggfunc='sum', fill_value=0, observed=True)
+        table.columns = table.columns.astype(str)
+        return table.astype("int64")
+
+    def by_member(self, kind, categories=None):
+        """회원번호별 {'금액': {…}, '건수': {…}} (categories 로 분류 한정 시 (회원번호, 분류) 키)"""
+        if self.members.empty: return {'금액': {}, '건수': {}}
+        frame = self._select(self.members, kind)
+        if categories is None:
+            frame = frame.groupby(level='회원번호').sum()
+        else:
+            frame = frame[frame.index.get_level_values('분류').isin(categories)]
+            frame = frame.reorder_levels(['회원번호', '분류'])
+        return frame.to_dict()
+
+    @staticmethod
+    def _select(frame, kind):
+        if kind not in frame.index.get_level_values('구분'):
+            return frame.iloc[:0].droplevel('구분')
+        return frame.xs(kind, level='구분')
+
+
+def build_ledger_cube(df_ledger, member_ids=None):
+    """장부 프레임 (+ 행별 회원번호) → LedgerCube (member_ids 가 없으면 회원별 집계는 비어 있음)"""
+    columns = {'구분', '분류', '내용', '금액'}
+    if df_ledger.empty or not columns <= set(df_ledger.columns):
+        empty = pd.DataFrame(columns=['금액', '건수'])
+        return LedgerCube(empty, empty)
+    if '거래일시' in df_ledger.columns:
+        month = df_ledger['거래일시'].dt.to_period('M').rename('월')
+    else:
+        month = pd.Series(pd.NaT, index=df_ledger.index, dtype="period[M]", name='월')
+    members = pd.DataFrame(columns=['금액', '건수'])
+    if member_ids is not None:
+        ids = pd.Series(member_ids, index=df_ledger.index, name='회원번호')
+        members = _group(df_ledger, KEYS + [ids]).drop(UNRESOLVED, level='회원번호', errors='ignore')
+    return LedgerCube(
+        monthly=_group(df_ledger, KEYS + [month]),
+        members=members,
+    )
@@ -0,0 +1,87 @@
+# -----------------------------------------------------------------------------
+# 회원 색인 (개인 현황 조회용)
+# -----------------------------------------------------------------------------
+# 데이터가 바뀔 때 한 번만 만들어 두는 사전:
+#   - 아이디(소문자) → 회원 정보
+#   - 회원명 → 입금/조의금/근조화환 합계와 건수
+#     (장부 내용을 회원에 맞춘 회원번호(member_resolve) 기준이라 '홍길동님' 같은 입금도 합산됨)
+# 개인 현황 조회는 사전 조회 두 번으로 끝난다.
+from dataclasses import dataclass
+
+from ledger_cube import build_ledger_cube
+from member_resolve import resolve_members
+
+CONDOLENCE_UNIT = 1000000  # 조의 1건당 상조금
+
+
+@dataclass(frozen=True)
+class MemberStats:
+    deposit: int = 0            # 납부한 회비
+    deposit_count: int = 0
+    condolence_amt: int = 0     # 조의금(상조금) 수령액
+    condolence_rows: int = 0
+    wreath_amt: int = 0         # 근조화환 수령액
+    wreath_count: int = 0
+
+    @property
+    def condolence_count(self):
+        """조의횟수 (건당 1백만원 기준)"""
+        return int(self.condolence_amt / CONDOLENCE_UNIT) if self.condolence_amt > 0 else 0
+
+
+EMPTY_STATS = MemberStats()
+
+
+def normalize_id(value):
+    return str(value).strip().lower()
+
+
+def id_column(df_members):
+    return '아이디' if '아이디' in df_members.columns else '비밀번호'
+
+
+class MemberIndex:
+    def __init__(self, by_id, stats):
+        self.by_id = by_id      # 아이디 → 회원 정보(dict)
+        self.stats = stats      # 회원명 → MemberStats
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def lookup(self, user_id):
+        """아이디 → (회원 정보, MemberStats) / 없으면 None"""
+        user = self.by_id.get(normalize_id(user_id))
+        if user is None:
+            return None
+        return user, self.stats.get(user.get('성명'), EMPTY_STATS)
+
+
+def build_member_index(df_members, df_ledger, resolution=None, cube=None):
+    """회원/장부 → MemberIndex (회원별 합계는 장부 큐브에서, 이름 해석표/큐브가 없으면 여기서 만듦)"""
+    by_id = {}
+    if not df_members.empty and id_column(df_members) in df_members.columns:
+        keys = df_members[id_column(df_members)].map(normalize_id)
+        for key, record in zip(keys, df_members.to_dict("records")):
+            by_id.setdefault(key, record)  # 아이디가 겹치면 첫 행 우선
+
+    stats = {}
+    if df_ledger.empty or '금액' not in df_ledger.columns or '성명' not in df_members.columns:
+        return MemberIndex(by_id, stats)
+
+    if resolution is None: resolution = resolve_members(df_members, df_ledger)
+    if cube is None: cube = build_ledger_cube(df_ledger, resolution.member_ids)
+    deposits = cube.by_member('입금')                            # {'금액': {회원번호: 값}, '건수': ...}
+    d_sum, d_count = deposits['금액'], deposits['건수']
+    benefits = cube.by_member('출금', ['상조금', '근조화환'])       # {'금액': {(회원번호, 분류): 값}, '건수': ...}
+    b_sum, b_count = benefits['금액'], benefits['건수']
+
+    for i, name in enumerate(resolution.names):
+        stats[name] = MemberStats(
+            deposit=int(d_sum.get(i, 0)),
+            deposit_count=int(d_count.get(i, 0)),
+            condolence_amt=int(b_sum.get((i, '상조금'), 0)),
+            condolence_rows=int(b_count.get((i, '상조금'), 0)),
+            wreath_amt=int(b_sum.get((i, '근조화환'), 0)),
+            wreath_count=int(b_count.get((i, '근조화환'), 0)),
+        )
+    return MemberIndex(by_id, stats)
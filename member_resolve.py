@@ -0,0 +1,209 @@
+# -----------------------------------------------------------------------------
+# 장부 내용 → 회원 매칭 (이름 해석표)
+# -----------------------------------------------------------------------------
+# 장부의 '내용'은 입금자명/메모라서 회원 시트의 성명과 조금씩 다를 수 있다.
+#   (공백, '님'/'회비'/'3월' 같은 꼬리말, 괄호 메모, 은행이 잘라 낸 이름 등)
+# 장부 버전마다 한 번, 회원과 연결되는 행(MEMBER_KINDS)에 나온 서로 다른 내용 값만 아래 순서로 맞춰 본다.
+#   1. 일치    : 성명과 정확히 같음
+#   2. 정규화  : 공백/구두점/괄호 메모/꼬리말을 지운 키가 같음
+#   3. 앞부분  : 은행이 끝 한 글자를 잘라 낸 이름 (TRUNCATED_MIN 글자 이상)
+#                또는 성명 뒤에 꼬리말(_SUFFIX)만 덧붙은 내용
+#   4. 유사    : 글자 수가 같은 키 중 difflib 유사도 FUZZY_CUTOFF 이상 (오타 한 글자)
+# '이자'→이자영, '최민수'→최민, '김철수 박영희'→김철수 처럼 다른 사람/다른 뜻일 수 있는 경우는 맞추지 않는다.
+# 후보가 둘 이상이면 맞추지 않고 미해결로 남긴다 (잘못 더하는 것보다 검토 목록에 올리는 편이 낫다).
+# 결과는 장부 행별 정수 회원번호 배열(member_ids, 못 찾으면 -1)이라서
+# 회원별 합계는 문자열 비교 없이 정수 groupby/bincount 로 끝난다.
+# 회원번호는 성명 순번 (회원 시트에 처음 나온 순서) - 동명이인은 같은 번호 (기존 규칙과 동일)
+# 내용 값 하나의 결과는 성명 목록에만 달려 있으므로, 장부 동기화(store.LedgerSync)는 MemberResolver 로
+# 새로 붙은 꼬리 행만 해석해도 장부 전체를 해석한 것과 같은 회원번호를 얻는다.
+import bisect
+import difflib
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# 회원과 연결되는 장부 행: (구분, 분류 목록 / None 이면 모든 분류)
+MEMBER_KINDS = (('입금', None), ('출금', ('상조금', '근조화환')))
+MIN_KEY = 2             # 정규화 키에 필요한 최소 글자 수
+TRUNCATED_MIN = 3       # 잘린 이름으로 인정하는 최소 글자 수 (성명보다 한 글자까지만 짧게)
+FUZZY_CUTOFF = 0.8      # 유사도 매칭 기준 (difflib 비율)
+UNRESOLVED = -1
+
+TABLE_COLUMNS = ['내용', '회원번호', '성명', '방법']
+UNRESOLVED_COLUMNS = ['내용', '구분', '분류', '건수', '금액', '사유']
+
+_BRACKETS = re.compile(r'[(\[{（【].*?[)\]}）】]')
+_NOISE = re.compile(r'[\s.,_/·\-]+')
+_SUFFIX = re.compile(r'(님|회원|회비|입금|\d{1,2}월분?|\d{4}년)+$')
+
+
+def name_key(value):
+    """비교용 이름 키 (괄호 메모/공백/구두점/꼬리말 제거, 소문자)"""
+    key = _NOISE.sub('', _BRACKETS.sub('', str(value))).lower()
+    stripped = _SUFFIX.sub('', key)
+    return stripped if len(stripped) >= MIN_KEY else key
+
+
+def member_rows(df_ledger):
+    """회원과 연결되는 장부 행 (bool 배열)"""
+    mask = np.zeros(len(df_ledger), dtype=bool)
+    for kind, categories in MEMBER_KINDS:
+        rows = df_ledger['구분'] == kind
+        if categories is not None:
+            if '분류' not in df_ledger.columns: continue
+            rows &= df_ledger['분류'].isin(categories)
+        mask |= rows.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+class _Matcher:
+    """성명 목록 → 내용 값 하나를 (회원번호, 방법) 으로"""
+
+    def __init__(self, names):
+        self.exact = {name: i for i, name in enumerate(names)}
+        keys = [name_key(name) for name in names]
+        counts = pd.Series(keys, dtype=object).value_counts()
+        self.ambiguous = set(counts.index[counts > 1])
+        self.keys = {key: i for i, key in enumerate(keys) if key not in self.ambiguous}
+        self.sorted_keys = sorted(self.keys)
+        self.by_length = {}
+        for key in self.sorted_keys:
+            self.by_length.setdefault(len(key), []).append(key)
+
+    def _prefix(self, key):
+        """앞부분 일치 후보 회원번호 집합"""
+        found = set()
+        if len(key) >= TRUNCATED_MIN:                                    # 끝 한 글자가 잘린 이름
+            lo = bisect.bisect_left(self.sorted_keys, key)
+            hi = bisect.bisect_left(self.sorted_keys, key + '\uffff')
+            found |= {self.keys[k] for k in self.sorted_keys[lo:hi] if len(k) == len(key) + 1}
+        for end in range(len(key) - 1, MIN_KEY - 1, -1):                 # 꼬리말이 덧붙은 이름 (가장 긴 성명)
+            if key[:end] in self.keys and _SUFFIX.fullmatch(key[end:]):
+                found.add(self.keys[key[:end]])
+                break
+        return found
+
+    def match(self, value):
+        if value in self.exact: return self.exact[value], '일치'
+        key = name_key(value)
+        if key in self.ambiguous: return UNRESOLVED, '후보 여럿'
+        if key in self.keys: return self.keys[key], '정규화'
+        if len(key) < MIN_KEY: return UNRESOLVED, '없음'
+        found = self._prefix(key)
+        if len(found) == 1: return found.pop(), '앞부분'
+        if found: return UNRESOLVED, '후보 여럿'
+        same_length = self.by_length.get(len(key), [])
+        close = difflib.get_close_matches(key, same_length, n=2, cutoff=FUZZY_CUTOFF)
+        if len(close) == 2 and _ratio(key, close[0]) == _ratio(key, close[1]): return UNRESOLVED, '후보 여럿'
+        if close: return self.keys[close[0]], '유사'
+        return UNRESOLVED, '없음'
+
+
+def _ratio(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+@dataclass(frozen=True)
+class MemberResolution:
+    names: pd.Index             # 회원번호 → 성명
+    table: pd.DataFrame         # 회원 행에 나온 서로 다른 내용 값 → 회원번호, 성명, 방법
+    member_ids: np.ndarray      # 장부 행별 회원번호 (int32, 회원 행이 아니거나 못 찾으면 -1)
+    unresolved: pd.DataFrame    # 못 찾은 회원 행을 내용별로 (내용, 구분, 분류, 건수, 금액, 사유)
+
+    @property
+    def unresolved_count(self):
+        return int(self.unresolved['건수'].sum())
+
+    def fuzzy(self):
+        """정확히 일치하지 않고 맞춘 내용 값 (검토용)"""
+        return self.table[self.table['방법'].isin(['정규화', '앞부분', '유사'])]
+
+
+class MemberResolver:
+    """성명 목록 하나에 대한 장부 행 → 회원번호 (맞춰 본 내용 값은 기억해 두고 처음 보는 값만 맞춤)"""
+
+    def __init__(self, names):
+        self.names = names
+        self._matcher = _Matcher(names)
+        self._matched = {}
+
+    def match(self, value):
+        """내용 값 → (회원번호, 방법)"""
+        found = self._matched.get(value)
+        if found is None:
+            found = self._matched[value] = self._matcher.match(value)
+        return found
+
+    def member_ids(self, df_ledger):
+        """장부 행별 회원번호 (int32, 회원 행이 아니거나 못 찾으면 -1)"""
+        if not len(self.names) or df_ledger.empty or not {'구분', '내용'} <= set(df_ledger.columns):
+            return np.full(len(df_ledger), UNRESOLVED, dtype="int32")
+        rows = member_rows(df_ledger)
+        content = df_ledger['내용']
+        if not isinstance(content.dtype, pd.CategoricalDtype): content = content.astype("category")
+        codes = content.cat.codes.to_numpy()
+        used = np.unique(codes[rows & (codes >= 0)])
+        lookup = np.full(len(content.cat.categories) + 1, UNRESOLVED, dtype="int32")
+        lookup[used] = [self.match(value)[0] for value in content.cat.categories[used]]
+        return np.where(rows, lookup[codes], UNRESOLVED).astype("int32")
+
+
+def member_names(df_members):
+    """회원번호 → 성명 (회원 시트에 처음 나온 순서, 동명이인은 하나로)"""
+    return pd.Index(pd.unique(df_members['성명']) if '성명' in df_members.columns else [], dtype=object)
+
+
+def _empty_resolution(names, n_rows):
+    return MemberResolution(names, pd.DataFrame(columns=TABLE_COLUMNS), np.full(n_rows, UNRESOLVED, dtype="int32"),
+                            pd.DataFrame(columns=UNRESOLVED_COLUMNS))
+
+
+def resolve_members(df_members, df_ledger):
+    """회원/장부 → MemberResolution (장부 버전마다 한 번)"""
+    names = member_names(df_members)
+    if not len(names) or df_ledger.empty or not {'구분', '내용'} <= set(df_ledger.columns):
+        return _empty_resolution(names, len(df_ledger))
+
+    rows = member_rows(df_ledger)
+    content = df_ledger['내용']
+    if not isinstance(content.dtype, pd.CategoricalDtype): content = content.astype("category")
+    codes = content.cat.codes.to_numpy()
+    used = np.unique(codes[rows & (codes >= 0)])
+    values = content.cat.categories[used].astype(object)
+
+    matcher = _Matcher(names)
+    matched = [matcher.match(value) for value in values]
+    ids = np.array([i for i, _ in matched], dtype="int32")
+    how = [method for _, method in matched]
+
+    # 범주 코드 → 회원번호 (마지막 칸은 빈 내용(-1) 용)
+    lookup = np.full(len(content.cat.categories) + 1, UNRESOLVED, dtype="int32")
+    lookup[used] = ids
+    member_ids = np.where(rows, lookup[codes], UNRESOLVED).astype("int32")
+
+    table = pd.DataFrame({
+        '내용': values,
+        '회원번호': ids,
+        '성명': np.where(ids >= 0, names.to_numpy()[np.clip(ids, 0, None)], ''),
+        '방법': how,
+    })
+    return MemberResolution(names, table, member_ids, _unresolved(df_ledger, rows & (member_ids < 0), table))
+
+
+def _unresolved(df_ledger, missing, table):
+    if not missing.any():
+        return pd.DataFrame(columns=UNRESOLVED_COLUMNS)
+    subset = df_ledger.loc[missing, [c for c in ['내용', '구분', '분류', '금액'] if c in df_ledger.columns]]
+    subset = subset.assign(내용=subset['내용'].astype(object).fillna(''))
+    if '분류' not in subset.columns: subset['분류'] = ''
+    if '금액' not in subset.columns: subset['금액'] = 0
+    grouped = (subset.assign(금액=subset['금액'].astype("int64"))
+               .groupby(['내용', '구분', '분류'], observed=True, sort=False)['금액'].agg(['count', 'sum'])
+               .rename(columns={'count': '건수', 'sum': '금액'}).reset_index())
+    reasons = table.set_index('내용')['방법']
+    grouped['사유'] = grouped['내용'].map(reasons).fillna('빈 내용')
+    grouped['구분'] = grouped['구분'].astype(object)
+    grouped['분류'] = grouped['분류'].astype(object)
+    return grouped.sort_values(['금액', '내용'], ascending=[False, True], ignore_index=True)[UNRESOLVED_COLUMNS]
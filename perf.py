@@ -0,0 +1,146 @@
+# -----------------------------------------------------------------------------
+# 성능 계측 (타이밍 구간 / 캐시 적중 카운터 / 구조화 로그)
+# -----------------------------------------------------------------------------
+# with span("status.report"): ... 처럼 감싸면
+#   - 현재 화면 실행(trace)에 구간이 기록되고 (관리자 디버그 패널에 표시)
+#   - 프로세스 전체 집계(횟수/평균/p95/최대)에 더해지고
+#   - 'sangjo.perf' 로거로 JSON 한 줄이 남는다 (logging 설정으로 수집)
+# 캐시는 cache_call(이름) / cache_miss(이름) 으로 호출 수와 실제 계산 횟수를 센다.
+# streamlit 에 의존하지 않으며, 계측 비용은 구간당 수 마이크로초 수준.
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger("sangjo.perf")
+
+RECENT_EVENTS = 2000   # 내보내기용으로 보관할 최근 이벤트 수
+SAMPLES = 200          # 구간별 p95 계산에 쓰는 최근 측정값 수
+
+_lock = threading.Lock()
+_stats = {}                              # 구간 이름 → _SpanStats
+_counters = defaultdict(int)             # 카운터 이름 → 값
+_events = deque(maxlen=RECENT_EVENTS)    # 최근 이벤트 (dict)
+_trace = ContextVar("perf_trace", default=None)
+
+
+class _SpanStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLES)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.samples.append(ms)
+
+
+def _emit(event):
+    with _lock:
+        _events.append(event)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(event, ensure_ascii=False))
+
+
+def start_trace(page):
+    """화면 실행 한 번의 구간 기록 시작 (해당 스레드/컨텍스트에만 적용)"""
+    trace = {"page": page, "started": time.time(), "spans": []}
+    _trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _trace.get()
+
+
+@contextmanager
+def span(name, **fields):
+    """구간 시간 측정 (예외가 나도 기록)"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        with _lock:
+            stats = _stats.get(name)
+            if stats is None: stats = _stats[name] = _SpanStats()
+            stats.add(ms)
+        trace = _trace.get()
+        if trace is not None: trace["spans"].append((name, ms))
+        _emit({"type": "span", "name": name, "ms": round(ms, 3), "ts": time.time(),
+               "page": trace["page"] if trace else None, **fields})
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] += n
+
+
+def cache_call(name):
+    """캐시를 거치는 호출 1회"""
+    count(f"cache.{name}.calls")
+
+
+def cache_miss(name):
+    """캐시에 없어 실제로 계산한 1회 (캐시된 함수 본문 안에서 호출)"""
+    count(f"cache.{name}.misses")
+    _emit({"type": "cache_miss", "name": name, "ts": time.time()})
+
+
+def span_table():
+    """구간별 집계 → [dict(구간, 횟수, 평균ms, p95ms, 최대ms)] (총 시간 순)"""
+    with _lock:
+        items = [(name, s.count, s.total, s.max, sorted(s.samples)) for name, s in _stats.items()]
+    rows = []
+    for name, n, total, peak, samples in sorted(items, key=lambda item: -item[2]):
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        rows.append({"구간": name, "횟수": n, "평균ms": round(total / n, 2), "p95ms": round(p95, 2),
+                     "최대ms": round(peak, 2), "합계ms": round(total, 1)})
+    return rows
+
+
+def cache_table():
+    """캐시별 호출/계산/적중률 → [dict]"""
+    with _lock:
+        counters = dict(_counters)
+    names = sorted({key.split(".")[1] for key in counters if key.startswith("cache.")})
+    rows = []
+    for name in names:
+        calls = counters.get(f"cache.{name}.calls", 0)
+        misses = counters.get(f"cache.{name}.misses", 0)
+        hits = max(calls - misses, 0)
+        rows.append({"캐시": name, "호출": calls, "적중": hits, "계산": misses,
+                     "적중률": f"{hits / calls:.0%}" if calls else "-"})
+    return rows
+
+
+def frame_memory(frames):
+    """시트별 메모리 사용량 (문자열 포함 실제 크기) → [dict]"""
+    rows = []
+    for name, df in frames.items():
+        usage = df.memory_usage(deep=True, index=False)
+        rows.append({"시트": name, "행": len(df), "MB": round(usage.sum() / 2**20, 2),
+                     "컬럼별 KB": ", ".join(f"{col}={int(b / 1024):,}" for col, b in usage.items())})
+    return rows
+
+
+def export_events():
+    """최근 이벤트를 JSON Lines 문자열로"""
+    with _lock:
+        events = list(_events)
+    return "\n".join(json.dumps(event, ensure_ascii=False) for event in events)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+        _events.clear()
@@ -0,0 +1,294 @@
+# -----------------------------------------------------------------------------
+# 잔액 대사 (장부 잔액 ↔ 통장 잔액)
+# -----------------------------------------------------------------------------
+# 장부를 거래일시 순으로 정렬해 누적합 한 번으로 거래마다의 장부 잔액을 구하고,
+# 자산 시트의 통장 잔액 기록(기준일별 '회비통장' 행)과 맞춰 본다.
+#   - 기준일마다: 그날까지의 장부 잔액 vs 통장 잔액 → 차이
+#   - 기준일 사이 기간마다: 차이가 얼마나 변했는지 (이 기간에 장부에 없거나 잘못 적힌 거래가 있다는 뜻)
+#   - 허용 범위를 넘는 기간의 거래 중 차이를 설명할 만한 거래를 표시
+#       차이와 같은 금액 / 같은 거래가 두 번 (중복 의심) / 큰 금액
+#     장부 잔액이 음수로 내려간 거래는 기간과 상관없이 표시 (통장 잔액은 음수가 될 수 없음)
+#   - 통장 이자는 장부에 적지 않으므로, 장부 잔액에 연 interest_rate 로 붙었을 이자(단리, 일할)까지는
+#     통장 잔액이 더 많아도 차이로 보지 않는다 (은행이 반기마다 몰아서 주므로 누계로 비교)
+# 자산 시트에 기준일 컬럼이 없으면 '회비통장' 잔액 하나를 장부 전체와 맞춘다 (기준일 '현재').
+# 허용 범위 등은 secrets.toml 의 [reconcile] 에서 (load_reconcile_config).
+#   [reconcile]
+#   tolerance = 10000          # 차이 허용 범위 (원) - 수수료/원 단위 반올림 같은 잔돈 차이만 넘기도록
+#                              #   월 회비(30,000원)보다 작게 잡아서 빠진 회비 입금 한 건도 놓치지 않음
+#   interest_rate = 0.001      # 회비통장 연 이율 (보통예금 0.1%) - 예상 이자는 허용 범위와 별도로 뺌, 0 이면 끔
+#   large_amount = 3000000     # 확인 필요 기간에서 함께 보여줄 큰 거래 기준 (원, 상조금 1건보다 크게)
+#   opening_balance = 0        # 장부 첫 거래 전 통장 잔액
+#   account = "회비통장"        # 자산 시트에서 대사할 통장 항목 이름
+# streamlit 에 의존하지 않는 순수 pandas 코드.
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from schema import find_asset_columns, find_column, ASSET_DATE_COLS
+
+MAX_FLAGGED = 200       # 표시할 확인 필요 거래 수 (사유 우선순위 순)
+
+SNAPSHOT_COLUMNS = ['기준일', '통장 잔액', '장부 잔액', '차이', '예상 이자', '기간 거래 수', '기간 입금', '기간 출금',
+                    '차이 변동', '판정']
+FLAGGED_COLUMNS = ['거래일시', '구분', '분류', '내용', '금액', '장부 잔액', '사유']
+BALANCE_COLUMNS = ['장부 잔액', '통장 잔액']
+
+# 사유 (우선순위 순)
+REASON_MATCH = '차이와 같은 금액'
+REASON_DUPLICATE = '중복 의심'
+REASON_NEGATIVE = '장부 잔액 음수'
+REASON_LARGE = '큰 금액'
+_REASONS = (REASON_MATCH, REASON_DUPLICATE, REASON_NEGATIVE, REASON_LARGE)
+_RANK = {reason: i for i, reason in enumerate(_REASONS)}
+CURRENT_LABEL = '현재'
+
+# 기준일 판정
+VERDICT_OK = '일치'
+VERDICT_DRIFT = '차이 발생'           # 이 기간에 차이가 허용 범위 넘게 변함
+VERDICT_CARRIED = '이전 차이 이어짐'   # 이 기간 변동은 없지만 앞 기간의 차이가 남아 있음
+
+
+@dataclass(frozen=True)
+class ReconcileConfig:
+    tolerance: int = 10_000         # 월 회비보다 작은 잔돈 차이 (빠진 거래는 한 건이라도 넘음)
+    interest_rate: float = 0.001    # 연 이율 - 이만큼 붙었을 이자는 차이에서 뺌
+    large_amount: int = 3_000_000
+    opening_balance: int = 0
+    account: str = '회비통장'
+
+
+def load_reconcile_config(secrets):
+    """secrets 의 [reconcile] → ReconcileConfig (없는 값은 기본값)"""
+    conf = secrets.get("reconcile") or {}
+    default = ReconcileConfig()
+    return ReconcileConfig(
+        tolerance=int(conf.get("tolerance", default.tolerance)),
+        interest_rate=float(conf.get("interest_rate", default.interest_rate)),
+        large_amount=int(conf.get("large_amount", default.large_amount)),
+        opening_balance=int(conf.get("opening_balance", default.opening_balance)),
+        account=str(conf.get("account", default.account)),
+    )
+
+
+@dataclass(frozen=True)
+class Reconciliation:
+    config: ReconcileConfig
+    snapshots: pd.DataFrame     # 기준일별 대사표 (SNAPSHOT_COLUMNS)
+    flagged: pd.DataFrame       # 확인 필요 거래 (FLAGGED_COLUMNS, 최대 MAX_FLAGGED)
+    flagged_count: int          # 잘리기 전 확인 필요 거래 수
+    balance: pd.DataFrame       # 월말 장부 잔액 + 그달 마지막 통장 잔액 (그래프용, 월 인덱스)
+    undated: int = 0            # 거래일시가 없어 누적에서 빠진 장부 행 수
+    closing: int = 0            # 장부 마지막 거래 후 잔액
+
+    @property
+    def book_balance(self):
+        """마지막 기준일의 장부 잔액 (통장 잔액 기록이 없으면 장부 끝 잔액)"""
+        return int(self.snapshots['장부 잔액'].iloc[-1]) if len(self.snapshots) else self.closing
+
+    @property
+    def bank_balance(self):
+        """마지막 기준일의 통장 잔액 / 기록이 없으면 None"""
+        return int(self.snapshots['통장 잔액'].iloc[-1]) if len(self.snapshots) else None
+
+    @property
+    def mismatches(self):
+        """허용 범위를 넘는 기준일 수"""
+        return int((self.snapshots['판정'] != VERDICT_OK).sum()) if len(self.snapshots) else 0
+
+    @property
+    def ok(self):
+        return len(self.snapshots) > 0 and self.mismatches == 0 and self.flagged_count == 0
+
+    def conclusion(self):
+        """대사 결과 문장 (수치에 따라)"""
+        tol = f"{self.config.tolerance:,}"
+        if not len(self.snapshots):
+            return f"자산 시트에 '{self.config.account}' 잔액이 없어 장부 잔액과 맞춰 볼 수 없습니다."
+        last = self.snapshots.iloc[-1]
+        checked = f"기준일 {len(self.snapshots)}개"
+        if self.ok:
+            return (f"{checked} 모두 장부 잔액과 통장 잔액의 차이가 예상 이자를 빼면 허용 범위({tol}원) 안에 있습니다 "
+                    f"(최근 차이 {int(last['차이']):,}원). 입출금 내역에서 설명할 수 없는 차이는 발견되지 않았습니다.")
+        if not self.mismatches:
+            return (f"{checked}의 차이는 허용 범위({tol}원) 안이지만 "
+                    f"장부 잔액이 음수로 내려간 거래가 {self.flagged_count:,}건 있습니다. 거래일시/금액을 확인하세요.")
+        return (f"{checked} 중 {self.mismatches}개에서 예상 이자를 뺀 차이가 허용 범위({tol}원)를 넘습니다 "
+                f"(최근 차이 {int(last['차이']):,}원). 아래 기간과 거래를 확인하세요.")
+
+
+def balance_snapshots(df_assets, account):
+    """자산 시트 → 통장 잔액 기록 [(기준일 또는 NaT, 잔액)] (기준일 순, 기준일 없는 행은 '현재'로 맨 뒤)"""
+    name_col, amount_col = find_asset_columns(df_assets)
+    if df_assets.empty or not (name_col and amount_col):
+        return pd.DataFrame({'기준일': pd.Series(dtype="datetime64[ns]"), '잔액': pd.Series(dtype="int64")})
+    rows = df_assets[df_assets[name_col].str.contains(account, na=False, regex=False)]
+    date_col = find_column(rows, ASSET_DATE_COLS)
+    dates = pd.to_datetime(rows[date_col], errors='coerce') if date_col else pd.Series(pd.NaT, index=rows.index)
+    found = pd.DataFrame({'기준일': dates.to_numpy(dtype="datetime64[ns]"), '잔액': rows[amount_col].astype("int64").to_numpy()})
+    if date_col and found['기준일'].notna().any():
+        # 기준일이 있는 기록만 쓰고, 같은 날 기록이 여럿이면 마지막 행
+        found = found.dropna(subset=['기준일']).drop_duplicates('기준일', keep='last')
+        return found.sort_values('기준일', kind='stable', ignore_index=True)
+    return found.iloc[:1].reset_index(drop=True)
+
+
+def _cutoffs(dates):
+    """기준일 → 포함할 마지막 시각 (시각 없는 날짜는 그날 끝까지, NaT 는 장부 끝까지)"""
+    values = dates.to_numpy(dtype="datetime64[ns]")
+    whole_day = values == values.astype("datetime64[D]")
+    return np.where(whole_day, values + np.timedelta64(1, 'D'), values + np.timedelta64(1, 'ns'))
+
+
+def running_balance(df_ledger, opening=0):
+    """거래일시 순 장부 → (정렬된 행 번호, 거래일시, 부호 있는 금액, 누적 잔액), 거래일시 없는 행 수
+
+    입금 +, 출금 - (그 밖의 구분은 0) 을 안정 정렬 후 누적합 한 번으로.
+    """
+    times = df_ledger['거래일시'].to_numpy(dtype="datetime64[ns]")
+    dated = np.flatnonzero(~np.isnat(times))
+    order = dated[np.argsort(times[dated], kind='stable')]
+    kind = df_ledger['구분']     # category 비교라 문자열로 풀지 않음
+    sign = (kind == '입금').to_numpy(dtype="int64") - (kind == '출금').to_numpy(dtype="int64")
+    signed = (df_ledger['금액'].to_numpy(dtype="int64") * sign)[order]
+    return order, times[order], signed, opening + np.cumsum(signed), len(times) - len(dated)
+
+
+def _days(delta):
+    return delta.astype("timedelta64[s]").astype("float64") / 86400
+
+
+def expected_interest(times, balance, cutoffs, ends, rate):
+    """기준일마다 그때까지 장부 잔액에 붙었을 이자 누계 (단리, 일할 계산, 음수 잔액은 0)
+
+    times/balance: running_balance 의 정렬된 거래일시/누적 잔액, cutoffs: 기준일 시각, ends: 기준일까지의 거래 수
+    """
+    if not rate or not len(times):
+        return np.zeros(len(ends), dtype="int64")
+    held = np.clip(balance, 0, None).astype("float64")
+    # 거래마다 다음 거래까지 잔액 × 일수의 누계 → 기준일은 마지막 거래 이후 남은 일수만 더함
+    balance_days = np.r_[0.0, np.cumsum(held[:-1] * _days(np.diff(times)))]
+    last = np.clip(ends - 1, 0, None)
+    total = balance_days[last] + held[last] * np.maximum(_days(cutoffs - times[last]), 0)
+    return np.rint(np.where(ends > 0, total, 0.0) * rate / 365).astype("int64")
+
+
+def _duplicates(df_ledger, rows):
+    """rows(행 번호) 중 같은 거래일시/구분/내용/금액 행이 둘 이상인 것 (bool)"""
+    subset = df_ledger.iloc[rows][['거래일시', '구분', '내용', '금액']]
+    return subset.duplicated(keep=False).to_numpy()
+
+
+def reconcile(df_ledger, df_assets, config=None, today=None):
+    """장부 + 자산 시트 → Reconciliation
+
+    today: 기준일 없는 통장 잔액의 시각 - 주면 그날까지의 장부 잔액과 맞추고(과거 기준일 보고서),
+    없으면 지금 시각의 장부 전체와 맞춘다.
+    """
+    config = config or ReconcileConfig()
+    snaps = balance_snapshots(df_assets, config.account)
+    if df_ledger.empty or not {'거래일시', '구분', '금액'} <= set(df_ledger.columns):
+        empty = pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+        return Reconciliation(config, empty, pd.DataFrame(columns=FLAGGED_COLUMNS), 0,
+                              pd.DataFrame(columns=BALANCE_COLUMNS), closing=config.opening_balance)
+
+    order, times, signed, balance, undated = running_balance(df_ledger, config.opening_balance)
+
+    # 기준일마다 그때까지의 장부 잔액 (정렬된 거래일시에서 이분 탐색)
+    cutoffs = _cutoffs(snaps['기준일'])
+    ends = np.searchsorted(times, cutoffs, side='left')
+    undated_snap = snaps['기준일'].isna().to_numpy()
+    if today is None:
+        today_cutoff, today_end = np.datetime64(pd.Timestamp.now(), 'ns'), len(times)
+    else:
+        today_cutoff = _cutoffs(pd.Series([pd.Timestamp(today)]))[0]
+        today_end = np.searchsorted(times, today_cutoff, side='left')
+    ends = np.where(undated_snap, today_end, ends)
+    cutoffs = np.where(undated_snap, today_cutoff, cutoffs)
+    book = np.r_[config.opening_balance, balance][ends]
+    bank = snaps['잔액'].to_numpy(dtype="int64")
+    diff = bank - book
+    starts = np.r_[0, ends[:-1]]
+    drift = diff - np.r_[0, diff[:-1]]
+    # 통장이 더 많은 차이 중 예상 이자까지는 설명된 것으로 (판정에만 쓰고, 표의 차이/차이 변동은 그대로)
+    interest = expected_interest(times, balance, cutoffs, ends, config.interest_rate)
+    unexplained = diff - np.clip(diff, 0, interest)
+    unexplained_drift = unexplained - np.r_[0, unexplained[:-1]]
+
+    # 기간별 입금/출금 (누적합 차로)
+    deposits = np.r_[0, np.cumsum(np.maximum(signed, 0))]
+    withdrawals = np.r_[0, np.cumsum(np.maximum(-signed, 0))]
+    # 차이가 이 기간에 새로 생겼는지(거래를 찾아볼 기간), 이전 기간의 차이가 이어지는지
+    drifted = np.abs(unexplained_drift) > config.tolerance
+    carried = ~drifted & (np.abs(unexplained) > config.tolerance)
+    snapshots = pd.DataFrame({
+        '기준일': [CURRENT_LABEL if pd.isna(d) else f"{d:%Y-%m-%d}" for d in snaps['기준일']],
+        '통장 잔액': bank,
+        '장부 잔액': book.astype("int64"),
+        '차이': diff.astype("int64"),
+        '예상 이자': interest,
+        '기간 거래 수': ends - starts,
+        '기간 입금': deposits[ends] - deposits[starts],
+        '기간 출금': withdrawals[ends] - withdrawals[starts],
+        '차이 변동': drift.astype("int64"),
+        '판정': np.select([drifted, carried], [VERDICT_DRIFT, VERDICT_CARRIED], VERDICT_OK),
+    })[SNAPSHOT_COLUMNS]
+
+    flagged = _flag_transactions(df_ledger, config, order, signed, balance, starts, ends, drift, drifted)
+    return Reconciliation(config, snapshots, flagged.head(MAX_FLAGGED).reset_index(drop=True), len(flagged),
+                          _monthly_balance(times, balance, snaps), undated, int(np.r_[config.opening_balance, balance][-1]))
+
+
+def _flag_transactions(df_ledger, config, order, signed, balance, starts, ends, drift, drifted):
+    """확인 필요 거래 (사유 우선순위 → 거래일시 순)"""
+    n = len(order)
+    reason = np.full(n, len(_REASONS), dtype="int8")     # 사유 번호 (작을수록 우선), 없으면 len(_REASONS)
+    amount = np.abs(signed)
+
+    # 차이가 새로 생긴 기간의 거래 (기준일 수만큼만 돌므로 반복문)
+    period = np.zeros(n, dtype=bool)
+    for start, end, change in zip(starts[drifted], ends[drifted], drift[drifted]):
+        if end <= start: continue
+        window = slice(start, end)
+        period[window] = True
+        if change: reason[window] = np.where(amount[window] == abs(change), _RANK[REASON_MATCH], reason[window])
+    inside = np.flatnonzero(period)
+    if len(inside):
+        dup = inside[_duplicates(df_ledger, order[inside])]
+        reason[dup] = np.minimum(reason[dup], _RANK[REASON_DUPLICATE])
+        large = inside[amount[inside] >= config.large_amount]
+        reason[large] = np.minimum(reason[large], _RANK[REASON_LARGE])
+
+    # 장부 잔액이 음수로 내려가기 시작한 거래 (허용 범위 밖으로)
+    negative = balance < -config.tolerance
+    first = negative & ~np.r_[False, negative[:-1]]
+    reason[first] = np.minimum(reason[first], _RANK[REASON_NEGATIVE])
+
+    hits = np.flatnonzero(reason < len(_REASONS))
+    hits = hits[np.lexsort((hits, reason[hits]))]
+    rows = df_ledger.iloc[order[hits]]
+    flagged = pd.DataFrame({col: rows[col].to_numpy() if col in rows.columns else '' for col in ['거래일시', '구분', '분류', '내용']})
+    flagged['금액'] = rows['금액'].to_numpy(dtype="int64")
+    flagged['장부 잔액'] = balance[hits]
+    flagged['사유'] = np.asarray(_REASONS, dtype=object)[reason[hits]]
+    for col in ['구분', '분류', '내용']:
+        flagged[col] = flagged[col].astype(object)
+    return flagged[FLAGGED_COLUMNS]
+
+
+def _monthly_balance(times, balance, snaps):
+    """월말 장부 잔액 + 그달 마지막 통장 잔액 (월 인덱스 'YYYY-MM')"""
+    if not len(times):
+        return pd.DataFrame(columns=BALANCE_COLUMNS)
+    months = times.astype("datetime64[M]")
+    last = np.r_[months[1:] != months[:-1], True]
+    book = pd.Series(balance[last], index=pd.Index(months[last].astype(str), name='월'), name='장부 잔액')
+    dated = snaps.dropna(subset=['기준일'])
+    bank = (pd.Series(dated['잔액'].to_numpy(), index=dated['기준일'].to_numpy().astype("datetime64[M]").astype(str))
+            .groupby(level=0).last())
+    if len(snaps) and not len(dated):
+        bank = pd.Series([snaps['잔액'].iloc[-1]], index=[book.index[-1]])
+    frame = pd.concat([book, bank.rename('통장 잔액')], axis=1).sort_index()
+    frame.index.name = '월'
+    frame['장부 잔액'] = frame['장부 잔액'].ffill()
+    return frame[BALANCE_COLUMNS]
@@ -0,0 +1,78 @@
+# -----------------------------------------------------------------------------
+# HTML 블록 렌더링
+# -----------------------------------------------------------------------------
+# 조항마다 st.markdown / st.divider 를 여러 번 보내지 않고, 목록 전체를
+# 하나의 HTML 문자열로 만들어 한 번에 보낸다. (프런트엔드 메시지/레이아웃 감소)
+# 데이터 버전별로 캐시할 수 있도록 streamlit 에 의존하지 않는 순수 함수로 둔다.
+import html
+
+from rules_search import highlight
+
+RULES_PAGE_SIZE = 20     # 한 화면에 보여줄 조항 수
+COLLAPSE_OVER = 400      # 이 글자 수를 넘는 조항 내용은 접어서 표시
+
+
+def format_comma(val):
+    try: return f"{int(val):,}"
+    except: return val
+
+
+def page_count(n_items, page_size=RULES_PAGE_SIZE):
+    return max(1, -(-n_items // page_size))
+
+
+def _rule_block(row, query):
+    article = highlight(row.get('조항', ''), query)
+    title = row.get('제목', row.get('항목', ''))
+    header_text = f"{article}({highlight(title, query)})" if title and str(title).lower() != 'nan' else article
+    raw_content = str(row.get('내용', '-'))
+    content = highlight(raw_content, query).replace("\n", "<br>")
+    if len(raw_content) > COLLAPSE_OVER and not query:
+        # 긴 조항은 접어 두고 펼칠 때만 보이게
+        content = f"<details><summary>{highlight(raw_content[:80], '')}… (펼치기)</summary>{content}</details>"
+    return (
+        f"<div class='rule-header' style='font-weight:bold; font-size:1.1rem; color:#fff; margin-top:10px;'>{header_text}</div>"
+        f"<div class='rule-content' style='color:#e0e0e0; margin-bottom:10px;'>{content}</div>"
+    )
+
+
+def rules_html(df_rules, positions, query="", page=1, page_size=RULES_PAGE_SIZE):
+    """회칙 목록(해당 페이지)을 하나의 HTML 블록으로"""
+    start = (page - 1) * page_size
+    blocks = [_rule_block(df_rules.iloc[pos], query) for pos in positions[start:start + page_size]]
+    return "<div class='rule-list'>" + "<hr class='rule-divider'>".join(blocks) + "</div>"
+
+
+def personal_card_html(user, stats, total_due, month_label, overdue=0):
+    """회원 개인 현황표를 하나의 HTML 블록으로 (overdue: 연체 개월수)"""
+    unpaid = total_due - stats.deposit
+    if unpaid > 0:
+        months = f" ({overdue}개월분)" if overdue else ""
+        status = f"<div class='status-note unpaid'>👉 <b>미납액: {format_comma(unpaid)} 원</b>{months}</div>"
+    elif unpaid == 0:
+        status = "<div class='status-note paid'>👉 <b>완납</b> 상태입니다.</div>"
+    else:
+        status = f"<div class='status-note prepaid'>👉 <b>선납액: {format_comma(abs(unpaid))} 원</b></div>"
+
+    name, role, joined = (html.escape(str(user.get(col, ''))) for col in ('성명', '직책', '가입일자'))
+    return (
+        "<div class='status-card'>"
+        f"<h3>📋 {name}님의 현황표</h3>"
+        f"<div class='status-caption'>기준월: {month_label}</div>"
+        "<div class='status-grid'>"
+        f"<div><b>1. 성명:</b> {name}</div>"
+        f"<div><b>2. 직책:</b> {role}</div>"
+        f"<div><b>3. 가입일자:</b> {joined}</div>"
+        f"<div><b>4. 조의횟수:</b> {stats.condolence_count} 회</div>"
+        f"<div><b>5. 조의금 수령액:</b> {format_comma(stats.condolence_amt)} 원</div>"
+        f"<div><b>6. 근조화환 수령액:</b> {format_comma(stats.wreath_amt)} 원</div>"
+        "</div>"
+        "<hr>"
+        "<div><b>7. 미납금 현황</b></div>"
+        "<ul>"
+        f"<li><b>총 납부해야 할 회비:</b> {format_comma(total_due)} 원</li>"
+        f"<li><b>실제 납부한 회비:</b> {format_comma(stats.deposit)} 원</li>"
+        "</ul>"
+        f"{status}"
+        "</div>"
+    )
@@ -0,0 +1,184 @@
+# -----------------------------------------------------------------------------
+# 보고서 CLI (streamlit 없이 실행)
+# -----------------------------------------------------------------------------
+# 구글 시트(또는 로컬 스냅샷)를 읽어 회원 전체/개인 현황을 출력하거나 파일로 내보낸다.
+# cron 으로 미리 계산해 두거나, 집계만 따로 프로파일링할 때 사용한다.
+#
+#   python report_cli.py                       # 전체 현황 요약 + 표 출력
+#   python report_cli.py --member abc123       # 개인 현황 출력
+#   python report_cli.py --out reports/        # 표마다 CSV 로 내보내기
+#   python report_cli.py --xlsx report.xlsx    # 한 개의 엑셀 파일로 (openpyxl 필요)
+#   python report_cli.py --offline             # 시트 대신 마지막 로컬 스냅샷 사용
+#   python report_cli.py --statements all.zip  # 회원별 현황표 + 전체 현황을 zip 으로 (--format html|xlsx, --workers N)
+#   python report_cli.py --club seoul          # 여러 상조회 중 하나 (secrets.toml 의 [clubs.<아이디>])
+#
+# 시트 주소는 --sheet-url, --club, 환경변수 SHEET_URL, .streamlit/secrets.toml 순서로 찾는다.
+# 월 회비 변경 이력([dues] rates)과 잔액 대사 설정([reconcile])은 앱과 같은 secrets 를 같은 방식으로 읽는다.
+import argparse
+import importlib.util
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - Python 3.10 이하
+    tomllib = None
+
+from dues import get_dues_calc_info
+from dues_timeline import build_timeline, as_of_month, load_rate_schedule
+from ledger_cube import build_ledger_cube
+from member_index import build_member_index
+from member_resolve import resolve_members
+from reconcile import load_reconcile_config
+from reports import build_status_report, build_personal_report, report_tables, report_summary, personal_tables
+from sheets import SheetFetcher
+from snapshots import SnapshotStore, DEFAULT_SNAPSHOT_DIR
+from statements import export_statements, FORMATS
+from store import DataSnapshot, LedgerSync, load_snapshot
+from tenants import load_clubs
+
+SECRETS_FILE = os.path.join(".streamlit", "secrets.toml")
+
+
+def read_secrets(path=SECRETS_FILE):
+    if tomllib is None or not os.path.exists(path): return {}
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def find_sheet_url(secrets, club_id=None):
+    """--club 의 상조회 → 환경변수 SHEET_URL → secrets 의 상조회가 하나뿐이면 그 주소 / 없으면 빈 문자열"""
+    clubs = load_clubs(secrets)
+    if club_id is None:
+        if os.environ.get("SHEET_URL"): return os.environ["SHEET_URL"]
+        if len(clubs) == 1: club_id = next(iter(clubs))
+    club = clubs.get(club_id)
+    return club.sheet_url if club else ""
+
+
+def fetch_snapshot(sheet_url):
+    """구글 시트 네 장을 동시에 받아 정규화한 DataSnapshot"""
+    fetcher = SheetFetcher(sheet_url)
+    try:
+        return load_snapshot(fetcher, LedgerSync(fetcher))
+    finally:
+        fetcher.close()
+
+
+def stored_snapshot(sheet_url, root=DEFAULT_SNAPSHOT_DIR):
+    """앱이 저장해 둔 로컬 스냅샷 / 없으면 None"""
+    stored = SnapshotStore(root, sheet_url).load()
+    if stored is None: return None
+    frames, meta = stored
+    return DataSnapshot(frames, meta["version"], meta["digests"], loaded_at=meta["loaded_at"],
+                        sheet_loaded_at=meta["sheet_loaded_at"], paid_totals=meta.get("paid_totals"))
+
+
+def print_table(title, df):
+    print(f"\n[{title}]")
+    print(df.to_string(index=False) if not df.empty else "(없음)")
+
+
+def export_csv(tables, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, df in tables.items():
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        df.to_csv(os.path.join(out_dir, f"{name}.csv"), index=False, encoding="utf-8-sig")
+
+
+def export_xlsx(tables, path):
+    with pd.ExcelWriter(path) as writer:
+        for name, df in tables.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="상조회 현황 보고서")
+    parser.add_argument("--sheet-url", help="구글 시트 주소")
+    parser.add_argument("--club", help="상조회 아이디 (secrets.toml 의 [clubs.<아이디>])")
+    parser.add_argument("--offline", action="store_true", help="시트 대신 로컬 스냅샷 사용")
+    parser.add_argument("--snapshot-dir", help="로컬 스냅샷 폴더")
+    parser.add_argument("--as-of", help="기준일 (YYYY-MM-DD, 기본값 오늘)")
+    parser.add_argument("--member", help="개인 현황을 볼 회원 아이디")
+    parser.add_argument("--out", help="표마다 CSV 로 내보낼 폴더")
+    parser.add_argument("--xlsx", help="엑셀 파일로 내보내기")
+    parser.add_argument("--statements", help="회원별 현황표와 전체 현황을 묶은 zip 파일")
+    parser.add_argument("--format", choices=FORMATS, default="html", help="현황표 형식 (기본값 html - 인쇄/PDF 저장용)")
+    parser.add_argument("--workers", type=int, help="현황표를 만들 프로세스 수 (기본값: 회원 수/코어 수에 맞춤)")
+    args = parser.parse_args(argv)
+
+    if (args.xlsx or (args.statements and args.format == "xlsx")) and importlib.util.find_spec("openpyxl") is None:
+        parser.error("엑셀 내보내기에는 openpyxl 이 필요합니다 (pip install openpyxl)")
+
+    secrets = read_secrets()
+    clubs = load_clubs(secrets)
+    if args.club is not None and args.club not in clubs:
+        parser.error(f"상조회 '{args.club}' 가 secrets.toml 에 없습니다 (있는 상조회: {', '.join(clubs) or '없음'})")
+    sheet_url = args.sheet_url or find_sheet_url(secrets, args.club)
+    if not sheet_url and len(clubs) > 1:
+        parser.error(f"상조회가 여럿입니다. --club 으로 고르세요 ({', '.join(clubs)})")
+    if not sheet_url:
+        parser.error("시트 주소가 없습니다 (--sheet-url / --club / SHEET_URL / .streamlit/secrets.toml)")
+    schedule, reconcile_config = load_rate_schedule(secrets), load_reconcile_config(secrets)
+
+    if args.offline:
+        root = args.snapshot_dir or secrets.get("snapshot", {}).get("dir", DEFAULT_SNAPSHOT_DIR)
+        snapshot = stored_snapshot(sheet_url, root)
+        if snapshot is None:
+            print("로컬 스냅샷이 없습니다.", file=sys.stderr)
+            return 1
+    else:
+        snapshot = fetch_snapshot(sheet_url)
+        for name, error in snapshot.errors.items():
+            print(f"⚠️ {name} 시트를 불러오지 못했습니다: {error}", file=sys.stderr)
+        for name, count in snapshot.bad_counts.items():
+            print(f"⚠️ {name} 시트의 {count:,}행이 형식에 맞지 않습니다:", file=sys.stderr)
+            print(snapshot.bad_rows[name].head(20).to_string(index=False), file=sys.stderr)
+
+    as_of = datetime.fromisoformat(args.as_of) if args.as_of else None
+    today, months_passed = get_dues_calc_info(as_of)
+    frames = snapshot.frames
+    resolution = resolve_members(frames["members"], frames["ledger"])
+    if len(resolution.unresolved):
+        print(f"⚠️ 회원에 맞추지 못한 장부 내용 {len(resolution.unresolved):,}건 "
+              f"({resolution.unresolved_count:,}행, 회원별 합계에서 빠짐):", file=sys.stderr)
+        print(resolution.unresolved.head(20).to_string(index=False), file=sys.stderr)
+    timeline = build_timeline(frames["members"], frames["ledger"], as_of_month(months_passed), schedule,
+                              resolution=resolution, paid_totals=snapshot.paid_totals)
+    cube = build_ledger_cube(frames["ledger"], resolution.member_ids)
+
+    if args.statements:
+        index = build_member_index(frames["members"], frames["ledger"], resolution, cube)
+        report = build_status_report(snapshot, months_passed, timeline, cube, reconcile_config, as_of)
+        count = export_statements(args.statements, index, timeline, report, args.format, args.workers, today)
+        print(f"현황표 {count:,}장 + 전체 현황 → {args.statements}")
+        return 0
+
+    if args.member:
+        index = build_member_index(frames["members"], frames["ledger"], resolution, cube)
+        personal = build_personal_report(index, timeline, args.member, today)
+        if personal is None:
+            print("일치하는 아이디가 없습니다.", file=sys.stderr)
+            return 1
+        tables = personal_tables(personal)
+        print(f"{personal.user.get('성명', '')}님의 현황표 (기준월: {personal.month_label})")
+    else:
+        report = build_status_report(snapshot, months_passed, timeline, cube, reconcile_config, as_of)
+        tables = report_tables(report)
+        print(f"회원 전체 현황 (기준일: {today:%Y-%m-%d}, 데이터 버전: {snapshot.version[:12]})")
+        for label, value in report_summary(report).items():
+            print(f"  {label}: {value:,} 원")
+        print(f"  잔액 대사: {report.reconciliation.conclusion()}")
+
+    if args.out: export_csv(tables, args.out)
+    if args.xlsx: export_xlsx(tables, args.xlsx)
+    if not (args.out or args.xlsx):
+        for name, df in tables.items(): print_table(name, df)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
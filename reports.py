@@ -0,0 +1,289 @@
+# -----------------------------------------------------------------------------
+# 회원 전체/개인 현황 보고서 (집계)
+# -----------------------------------------------------------------------------
+# 분석적검토 / 지출 / 자산 / 이자 표와 개인 현황을 일반 데이터(DataFrame, dict)로 만든다.
+# 페이지는 이 결과를 그리기만 하고, 같은 함수를 CLI(report_cli.py)/배치에서도 쓴다.
+# 전체 현황은 모든 사용자가 같은 결과를 보므로 data.py 가 데이터 버전별로 공유 캐시한다.
+# streamlit 에 의존하지 않는 순수 pandas 코드.
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from dues import get_dues_calc_info, total_due_target, lookup_member_dues, dues_status, COL_NAME, COL_DUE, COL_PAID, COL_DIFF, COL_STATUS
+from dues_timeline import build_timeline, as_of_month, COL_OVERDUE, COL_OVERDUE_SINCE
+from ledger_cube import build_ledger_cube
+from reconcile import reconcile
+from schema import find_asset_columns, find_column, ASSET_BANK_COLS, ASSET_DATE_COLS
+
+EXPENSE_ITEMS = [
+    # (분류, 지출 항목, 내용 설명)
+    ('상조금', "(1) 조의금", "조의건당 1백만원"),
+    ('근조화환', "(2) 근조화환", "조의건당 1십만원"),
+    ('회의비외', "(3) 회의비등", "상조기 및 모임식대, 각종소포품 등"),
+    ('적금', "(4) 적금", "최초적금가입원금"),
+]
+
+
+@dataclass
+class StatusReport:
+    version: str = ""
+    due_per_person: int = 0             # 기준일부터 회원이었던 경우의 1인당 납부할 금액
+    analysis: pd.DataFrame = None       # 회원별 납부 현황/연체 개월수 (합계 행 포함), 없으면 None
+    total_paid: int = 0                 # 전체 입금액
+    expenses: pd.DataFrame = None       # 지출 항목별 합계 (합계 행 포함), 없으면 None
+    exp_total: int = 0
+    expense_by_kind: dict = field(default_factory=dict)  # 분류 → 합계
+    expense_trend: pd.DataFrame = None  # 연도 × 분류 지출 합계
+    real_balance: int = 0               # 회비통장 실제 잔액
+    book_balance: int = 0               # 장부상 잔액 (잔액 대사의 마지막 기준일 장부 잔액)
+    review_diff: int = 0
+    review: pd.DataFrame = None
+    reconciliation: object = None       # reconcile.Reconciliation (기준일별 잔액 대사)
+    assets: pd.DataFrame = None         # 보유 자산 (기준일 컬럼이 있으면 항목별 최근 행만)
+    total_assets: int = 0               # 합계 행 제외 총 자산
+    savings_ledger: pd.DataFrame = None  # 적금 원금 내역, 없으면 None
+    savings_principal: int = 0
+    savings_assets: pd.DataFrame = None  # 적금 통장 평가액, 없으면 None
+    savings_value: int = 0
+    interest: int = 0
+
+
+def analysis_table(df_members, df_ledger, timeline):
+    """회원별 납부 현황(가입월 기준) + 합계 행 → (표, 전체 입금액) / 데이터가 없으면 (None, 0)"""
+    if df_members.empty or df_ledger.empty:
+        return None, 0
+    # 회원 × 월 타임라인에서 회원별 합계/연체 개월수를 한 번에
+    df_analysis = timeline.summary()
+    total_paid = int(df_analysis[COL_PAID].sum())
+    total_row = pd.DataFrame([{
+        COL_NAME: "합계",
+        COL_DUE: df_analysis[COL_DUE].sum(),
+        COL_PAID: total_paid,
+        COL_DIFF: df_analysis[COL_DIFF].sum(),
+        COL_STATUS: "-",
+        COL_OVERDUE: df_analysis[COL_OVERDUE].sum(),
+        COL_OVERDUE_SINCE: "-",
+    }])
+    return pd.concat([df_analysis, total_row], ignore_index=True), total_paid
+
+
+def expense_by_kind(cube):
+    """장부 큐브에서 출금 분류별 합계 → {분류: 합계} (장부가 없으면 {})"""
+    if cube.empty:
+        return {}
+    sums = cube.totals('출금')
+    return {kind: int(sums.get(kind, 0)) for kind, _, _ in EXPENSE_ITEMS}
+
+
+def expense_table(by_kind):
+    """지출 항목별 표 (합계 포함) → (표, 지출 합계)"""
+    amounts = [by_kind.get(kind, 0) for kind, _, _ in EXPENSE_ITEMS]
+    # 합계에 적금 포함
+    exp_total = sum(amounts)
+    df_exp = pd.DataFrame({
+        "지출 항목": [label for _, label, _ in EXPENSE_ITEMS] + ["(5) 합계"],
+        "내용 설명": [desc for _, _, desc in EXPENSE_ITEMS] + ["=(1)+(2)+(3)+(4)"],
+        "금액": amounts + [exp_total],
+    })
+    return df_exp, exp_total
+
+
+def fee_account_balance(df_assets):
+    """자산 시트의 첫 '회비통장' 잔액"""
+    name_col, amount_col = find_asset_columns(df_assets)
+    if not (name_col and amount_col):
+        return 0
+    mask = df_assets[name_col].str.contains('회비통장', na=False, regex=False)
+    return int(df_assets[mask][amount_col].iloc[0]) if mask.any() else 0
+
+
+def review_table(real_balance, book_balance):
+    return pd.DataFrame({
+        "구분": ["A. 실제 통장 잔액", "B. 장부상 잔액", "차이 (A-B)"],
+        "산출 근거": [
+            "회비통장실제잔액",
+            "장부 입금 - 출금 누적 (거래일시 순, 통장 잔액 기준일까지 - 4. 잔액 대사와 같은 값)",
+            "이자수익 등 장부에 없는 차이"
+        ],
+        "금액": [real_balance, book_balance, real_balance - book_balance],
+    })
+
+
+def current_assets(df_assets):
+    """자산 시트에 잔액 이력이 쌓여 있으면(기준일 컬럼) 항목별 가장 최근 행만, 아니면 그대로"""
+    name_col, _ = find_asset_columns(df_assets)
+    date_col = find_column(df_assets, ASSET_DATE_COLS)
+    if df_assets.empty or not (name_col and date_col):
+        return df_assets
+    dates = df_assets[date_col]
+    latest = dates.groupby(df_assets[name_col]).transform('max')
+    return df_assets[(dates == latest) | latest.isna()]
+
+
+def total_assets(df_assets):
+    """합계 행을 제외한 총 자산"""
+    name_col, amount_col = find_asset_columns(df_assets)
+    if not amount_col:
+        return 0
+    if name_col:
+        mask = ~df_assets[name_col].astype(str).str.contains('합계', na=False, regex=False)
+        return int(df_assets[mask][amount_col].sum())
+    return int(df_assets[amount_col].sum())
+
+
+def savings_tables(df_ledger, df_assets, cube):
+    """적금 원금(장부) / 평가액(자산) 표 → (원금표, 원금합, 평가표, 평가합) / 데이터 없으면 None
+
+    원금 합계는 큐브에서, 원금 표는 적금 거래 행만 골라서 (상세 내역)
+    """
+    name_col, amount_col = find_asset_columns(df_assets)
+    if df_ledger.empty or df_assets.empty or not (name_col and amount_col) or '금액' not in df_ledger.columns:
+        return None
+    target_ledger = df_ledger[df_ledger['분류'] == '적금']
+    df_principal = pd.DataFrame({
+        '거래일시': target_ledger['거래일시'] if '거래일시' in target_ledger.columns else None,
+        '금액': target_ledger['금액'],
+        '내용': "적금원금",
+    })
+
+    target_assets = df_assets[df_assets[name_col].str.contains('적금', na=False, regex=False)]
+    bank_col = find_column(df_assets, ASSET_BANK_COLS)
+    df_value = pd.DataFrame({
+        '구분': target_assets[name_col],
+        '은행': target_assets[bank_col] if bank_col else '-',
+        '잔액': target_assets[amount_col],
+    })
+    return df_principal, int(cube.totals().get('적금', 0)), df_value, int(df_value['잔액'].sum())
+
+
+def build_status_report(snapshot, months_passed, timeline=None, cube=None, reconcile_config=None, today=None):
+    """스냅샷 → StatusReport (회원 전체 현황 페이지의 모든 수치)
+
+    timeline: 같은 기준월로 미리 만든 DuesTimeline, cube: 같은 버전의 LedgerCube (없으면 여기서 만듦)
+    reconcile_config: 잔액 대사 허용 범위 등 (reconcile.ReconcileConfig, 없으면 기본값)
+    today: 보고서 기준일 - 기준일 없는 통장 잔액을 이 시각의 장부 잔액과 맞춤 (기본값은 지금)
+    """
+    df_members = snapshot.frames["members"]
+    df_ledger = snapshot.frames["ledger"]
+    df_assets = current_assets(snapshot.frames["assets"])
+    report = StatusReport(version=snapshot.version)
+
+    if timeline is None:
+        timeline = build_timeline(df_members, df_ledger, as_of_month(months_passed))
+    report.due_per_person = timeline.due_from_start
+    report.analysis, report.total_paid = analysis_table(df_members, df_ledger, timeline)
+
+    if cube is None:
+        cube = build_ledger_cube(df_ledger)
+    report.expense_by_kind = expense_by_kind(cube)
+    if report.expense_by_kind:
+        report.expenses, report.exp_total = expense_table(report.expense_by_kind)
+        report.expense_trend = cube.trend('출금', 'Y')
+
+    # 장부상 잔액은 잔액 대사의 누적 잔액 하나만 씀 (통장 잔액 기준일과 같은 시점)
+    rec = report.reconciliation = reconcile(df_ledger, snapshot.frames["assets"], reconcile_config, today)
+    bank = rec.bank_balance
+    report.real_balance = fee_account_balance(df_assets) if bank is None else bank
+    report.book_balance = rec.book_balance
+    report.review_diff = report.real_balance - report.book_balance
+    report.review = review_table(report.real_balance, report.book_balance)
+
+    report.assets = df_assets
+    report.total_assets = total_assets(df_assets)
+
+    savings = savings_tables(df_ledger, df_assets, cube)
+    if savings:
+        report.savings_ledger, report.savings_principal, report.savings_assets, report.savings_value = savings
+        report.interest = report.savings_value - report.savings_principal
+    return report
+
+
+def report_tables(report):
+    """StatusReport → {표 이름: DataFrame} (없는 표는 제외, 내보내기/출력용)"""
+    tables = {
+        "분석적검토": report.analysis,
+        "지출": report.expenses,
+        "연도별지출": report.expense_trend.reset_index() if report.expense_trend is not None else None,
+        "검토": report.review,
+        "잔액대사": report.reconciliation.snapshots if report.reconciliation is not None else None,
+        "대사확인거래": report.reconciliation.flagged if report.reconciliation is not None else None,
+        "자산": report.assets,
+        "적금원금": report.savings_ledger,
+        "적금평가": report.savings_assets,
+    }
+    return {name: df for name, df in tables.items() if df is not None}
+
+
+def report_summary(report):
+    """StatusReport 의 주요 수치 → dict"""
+    return {
+        "1인당 납부할 금액": report.due_per_person,
+        "전체 입금액": report.total_paid,
+        "회비통장 지출액": report.exp_total,
+        "실제 통장 잔액": report.real_balance,
+        "장부상 잔액": report.book_balance,
+        "분석적검토 차이": report.review_diff,
+        "총 자산": report.total_assets,
+        "적금 원금": report.savings_principal,
+        "적금 평가액": report.savings_value,
+        "이자 발생 누적액": report.interest,
+    }
+
+
+@dataclass
+class PersonalReport:
+    user: dict                          # 회원 시트의 한 행
+    stats: object                       # member_index.MemberStats
+    month_label: str                    # 기준월 (지난달) 표시용
+    dues: dict                          # due, paid, unpaid, status, overdue, overdue_since
+    timeline: object = field(default=None, repr=False)  # dues_timeline.DuesTimeline (월별 내역용)
+
+    @property
+    def has_history(self):
+        return self.timeline is not None and self.user.get('성명') in self.timeline
+
+    @cached_property
+    def history(self):
+        """월별 납부 내역 (처음 읽을 때 타임라인에서 꺼냄), 타임라인에 없으면 None"""
+        return self.timeline.history(self.user.get('성명')) if self.has_history else None
+
+
+def build_personal_report(member_index, timeline, user_id, today=None):
+    """아이디 → PersonalReport / 일치하는 회원이 없으면 None (월별 내역은 history 를 읽을 때 만듦)"""
+    found = member_index.lookup(user_id)
+    if not found:
+        return None
+    user, stats = found
+    today, months_passed = get_dues_calc_info(today)
+    name = user.get('성명')
+
+    dues = lookup_member_dues(timeline, name) if timeline is not None else None
+    if dues is None:
+        # 타임라인에 없는 회원: 기준일부터 회원이었던 것으로 계산 (최초 가입금 + 월 회비)
+        due = timeline.due_from_start if timeline is not None else total_due_target(months_passed)
+        dues = {"due": due, "paid": stats.deposit, "unpaid": due - stats.deposit,
+                "status": dues_status(due - stats.deposit), "overdue": 0, "overdue_since": None}
+    return PersonalReport(
+        user=user,
+        stats=stats,
+        month_label=(today - relativedelta(months=1)).strftime('%Y년 %m월'),
+        dues=dues,
+        timeline=timeline,
+    )
+
+
+def personal_tables(report):
+    """PersonalReport → {표 이름: DataFrame} (내보내기/출력용)"""
+    user = report.user
+    info = pd.DataFrame({
+        "항목": ["성명", "직책", "가입일자", "조의횟수", "조의금 수령액", "근조화환 수령액",
+               "총 납부해야 할 회비", "실제 납부한 회비", "미납액", "연체 개월수"],
+        "값": [user.get('성명', ''), user.get('직책', ''), user.get('가입일자', ''),
+              report.stats.condolence_count, report.stats.condolence_amt, report.stats.wreath_amt,
+              report.dues["due"], report.dues["paid"], report.dues["unpaid"], report.dues["overdue"]],
+    })
+    tables = {"개인현황": info}
+    if report.has_history: tables["월별납부내역"] = report.history
+    return tables
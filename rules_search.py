@@ -0,0 +1,120 @@
+# -----------------------------------------------------------------------------
+# 회칙 검색 색인
+# -----------------------------------------------------------------------------
+# 조항/제목/내용을 글자 2-gram 역색인으로 만들어 두고(회칙 시트가 바뀔 때만),
+# 검색어는 정규식이 아닌 일반 문자열로 취급한다. ('(' 같은 입력도 안전)
+#   - 한글은 음절 2-gram, 한 글자 검색은 1-gram
+#   - 초성만 입력하면(예: 'ㅅㅈㄱ') 초성 색인으로 검색
+#   - 여러 단어는 모두 포함된 조항만 (AND), 조항 > 제목 > 내용 순으로 가중치
+import html
+import re
+import unicodedata
+from collections import defaultdict
+
+FIELDS = [('조항', 3), ('제목', 2), ('내용', 1)]  # (컬럼, 가중치)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+
+
+def normalize_text(text):
+    return unicodedata.normalize("NFC", str(text)).lower()
+
+
+def to_choseong(text):
+    """한글 음절 → 초성 (그 외 문자는 그대로, 길이 보존)"""
+    return "".join(
+        CHOSEONG[(ord(ch) - _HANGUL_FIRST) // 588] if _HANGUL_FIRST <= ord(ch) <= _HANGUL_LAST else ch
+        for ch in text
+    )
+
+
+def is_choseong_query(word):
+    return all(ch in CHOSEONG for ch in word)
+
+
+def ngrams(text):
+    """공백으로 나눈 단어별 1-gram + 2-gram"""
+    grams = set()
+    for word in text.split():
+        grams.update(word)
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def query_grams(word):
+    return {word} if len(word) == 1 else {word[i:i + 2] for i in range(len(word) - 1)}
+
+
+class RuleIndex:
+    """회칙 프레임 → 역색인 (search 는 [(행 위치, 점수)] 를 점수 순으로)"""
+
+    def __init__(self, df_rules):
+        self.texts = []       # 행별 {컬럼: 정규화된 문자열}
+        self.choseong = []    # 행별 {컬럼: 초성 문자열}
+        self._postings = defaultdict(set)
+        self._cho_postings = defaultdict(set)
+        columns = [col for col, _ in FIELDS if col in df_rules.columns]
+        for pos, row in enumerate(df_rules[columns].itertuples(index=False, name=None)):
+            texts = {col: normalize_text(value) for col, value in zip(columns, row)}
+            cho = {col: to_choseong(text) for col, text in texts.items()}
+            self.texts.append(texts)
+            self.choseong.append(cho)
+            for text in texts.values():
+                for gram in ngrams(text): self._postings[gram].add(pos)
+            for text in cho.values():
+                for gram in ngrams(text): self._cho_postings[gram].add(pos)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _candidates(self, word, postings):
+        result = None
+        for gram in query_grams(word):
+            docs = postings.get(gram, set())
+            result = docs if result is None else result & docs
+            if not result: return set()
+        return result or set()
+
+    def search(self, query):
+        words = normalize_text(query).split()
+        if not words: return [(pos, 0) for pos in range(len(self))]
+
+        scores = None
+        for word in words:
+            cho = is_choseong_query(word)
+            docs = self.choseong if cho else self.texts
+            word_scores = {}
+            for pos in self._candidates(word, self._cho_postings if cho else self._postings):
+                score = sum(weight * docs[pos].get(col, "").count(word) for col, weight in FIELDS)
+                if score: word_scores[pos] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {pos: scores[pos] + s for pos, s in word_scores.items() if pos in scores}
+            if not scores: return []
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def highlight(text, query):
+    """검색어와 일치하는 부분을 <mark> 로 감싼 HTML (원문은 이스케이프)"""
+    text = "" if text is None else str(text)
+    words = [w for w in normalize_text(query).split() if w]
+    lowered = normalize_text(text)
+    if not words or len(lowered) != len(text):
+        return html.escape(text)
+
+    marked = [False] * len(text)
+    cho_text = to_choseong(lowered)
+    for word in words:
+        haystack = cho_text if is_choseong_query(word) else lowered
+        for m in re.finditer(re.escape(word), haystack):
+            for i in range(m.start(), m.end()): marked[i] = True
+
+    out, i = [], 0
+    while i < len(text):
+        j = i
+        while j < len(text) and marked[j] == marked[i]: j += 1
+        chunk = html.escape(text[i:j])
+        out.append(f"<mark>{chunk}</mark>" if marked[i] else chunk)
+        i = j
+    return "".join(out)
@@ -0,0 +1,154 @@
+# -----------------------------------------------------------------------------
+# 시트 정규화 (타입 변환)
+# -----------------------------------------------------------------------------
+# 구글 시트에서 받은 문자열(dtype=str) 프레임을 한 번만 정리해서
+# 금액은 정수, 구분/분류/내용은 category, 거래일시는 datetime64 로 변환한다.
+# 장부는 행 수가 가장 많으므로 메모리를 줄이는 형태로 보관한다.
+#   - 구분/분류/내용: 같은 문자열이 반복되므로 category (작은 사전 + 정수 코드)
+#   - 금액: 값 범위가 맞으면 int32 (합계는 int64 로 올려서 계산 - sum_amount)
+# streamlit 에 의존하지 않는 순수 pandas 코드.
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# pandas 2.x 에서도 Copy-on-Write 동작 보장 (3.x 는 기본값)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+ASSET_NAME_COLS = ['항목', '자산명', '자산', '계좌명', '구분', '내용', 'Asset']
+ASSET_AMOUNT_COLS = ['금액', '잔액', '평가액', '자산금액', 'Amount']
+ASSET_BANK_COLS = ['은행', 'Bank', '금융기관', '은행명']
+ASSET_DATE_COLS = ['기준일', '기준일자', '일자', '날짜', 'Date']     # 잔액 기록 날짜 (있으면 잔액 이력)
+
+
+def parse_amount(series):
+    """'1,000,000' 같은 문자열 → int64 (숫자가 아니면 0, safe_int 와 동일 규칙)"""
+    cleaned = series.astype("string").str.replace(r'[,\s]', '', regex=True)
+    valid = cleaned.str.fullmatch(r'[+-]?\d+').fillna(False).astype(bool)
+    return pd.to_numeric(cleaned.where(valid), errors='coerce').fillna(0).astype("int64")
+
+
+def parse_datetime(series):
+    """'2020.02.05 10:00' / '2020-02-05' 등 → datetime64 (실패 시 NaT)"""
+    cleaned = series.astype("string").str.strip().str.replace(r'(\d)\.\s*(?=\d)', r'\1-', regex=True)
+    return pd.to_datetime(cleaned, format='mixed', errors='coerce')
+
+
+def compact_int(series):
+    """정수 Series → 값 범위가 맞으면 int32, 아니면 int64"""
+    info = np.iinfo("int32")
+    if series.empty or (series.min() >= info.min and series.max() <= info.max):
+        return series.astype("int32")
+    return series.astype("int64")
+
+
+def sum_amount(df, by):
+    """by 별 금액 합계/건수 (int32 금액도 int64 로 합산해 넘침 방지)"""
+    amounts = df['금액'].astype("int64")
+    keys = [df[col] for col in ([by] if isinstance(by, str) else by)]
+    return amounts.groupby(keys, observed=True, sort=False).agg(['sum', 'count'])
+
+
+def strip_text(series):
+    """문자열 앞뒤 공백 제거 (NaN 은 빈 문자열)"""
+    return series.fillna('').astype(str).str.strip()
+
+
+def find_column(df, candidates):
+    for col in candidates:
+        if col in df.columns: return col
+    return None
+
+
+def find_asset_columns(df_assets):
+    """자산 시트의 (항목명 컬럼, 금액 컬럼)"""
+    return find_column(df_assets, ASSET_NAME_COLS), find_column(df_assets, ASSET_AMOUNT_COLS)
+
+
+def append_rows(base, tail):
+    """정규화된 프레임 뒤에 행 추가 (category 컬럼은 범주를 합쳐서 유지)"""
+    if base.empty: return tail.reset_index(drop=True)
+    tail = tail.copy()
+    base = base.copy()
+    for col in base.columns:
+        if isinstance(base[col].dtype, pd.CategoricalDtype) and col in tail.columns:
+            categories = base[col].cat.categories.union(pd.Index(tail[col].dropna().unique().astype(str)))
+            base[col] = base[col].cat.set_categories(categories)
+            tail[col] = tail[col].astype(str).astype(pd.CategoricalDtype(categories))
+    return pd.concat([base, tail], ignore_index=True)
+
+
+def normalize_ledger(df):
+    """장부: 구분/분류/내용 category, 금액 int32(범위 밖이면 int64), 거래일시 datetime64"""
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip()
+    for col in ['구분', '분류', '내용']:
+        if col in df.columns: df[col] = strip_text(df[col]).astype("category")
+    if '금액' in df.columns: df['금액'] = compact_int(parse_amount(df['금액']))
+    if '거래일시' in df.columns: df['거래일시'] = parse_datetime(df['거래일시'])
+    return df
+
+
+def normalize_assets(df):
+    """자산: 금액 컬럼 int64, 기준일 컬럼 datetime64"""
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip()
+    name_col, amount_col = find_asset_columns(df)
+    if name_col: df[name_col] = strip_text(df[name_col])
+    if amount_col: df[amount_col] = parse_amount(df[amount_col])
+    date_col = find_column(df, ASSET_DATE_COLS)
+    if date_col: df[date_col] = parse_datetime(df[date_col])
+    return df
+
+
+def normalize_members(df):
+    """회원: 성명 공백 제거"""
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip()
+    if '성명' in df.columns: df['성명'] = strip_text(df['성명'])
+    return df
+
+
+def normalize_rules(df):
+    """회칙: 빈 칸은 빈 문자열"""
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip()
+    for col in df.columns:
+        df[col] = strip_text(df[col])
+    return df
+
+
+NORMALIZERS = {
+    "members": normalize_members,
+    "ledger": normalize_ledger,
+    "assets": normalize_assets,
+    "rules": normalize_rules,
+}
+
+
+# -----------------------------------------------------------------------------
+# 시트별 스키마 (ingest.py 가 읽으면서 검증)
+# -----------------------------------------------------------------------------
+class SchemaError(ValueError):
+    """필수 컬럼이 없는 등 시트 전체를 쓸 수 없는 경우"""
+
+
+@dataclass(frozen=True)
+class SheetSchema:
+    required: tuple = ()    # 없으면 SchemaError
+    amount: tuple = ()      # 금액 컬럼 후보 (처음 있는 것 하나) - 숫자가 아니면 0 으로 두고 보고
+    dates: tuple = ()       # 날짜 컬럼 - 읽을 수 없으면 NaT 로 두고 보고
+    choices: tuple = ()     # (컬럼, 허용값들) - 그 밖의 값은 보고
+
+    def missing(self, columns):
+        return [col for col in self.required if col not in columns]
+
+
+SCHEMAS = {
+    "members": SheetSchema(required=('성명',)),
+    "ledger": SheetSchema(required=('구분', '분류', '내용', '금액'), amount=('금액',), dates=('거래일시',),
+                          choices=(('구분', ('입금', '출금')),)),
+    "assets": SheetSchema(amount=tuple(ASSET_AMOUNT_COLS), dates=tuple(ASSET_DATE_COLS)),
+    "rules": SheetSchema(),
+}
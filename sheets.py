@@ -0,0 +1,205 @@
+# -----------------------------------------------------------------------------
+# 구글 시트 CSV 가져오기 (gviz)
+# -----------------------------------------------------------------------------
+# 네 장의 시트를 하나의 세션(커넥션 풀)으로 동시에 요청하고,
+# ETag / Last-Modified / 내용 해시로 재검증해서 바뀌지 않은 시트는 다시 파싱하지 않는다.
+# 응답은 스트리밍으로 받아 해시를 계산하면서 임시 파일(SPOOL_MEMORY 를 넘으면 디스크)에 쌓고,
+# 바뀐 시트만 ingest.read_sheet 로 청크 단위 파싱/검증한다.
+# fingerprint() 는 파싱 없이 해시만 계산해서 장부 증분 동기화(store.LedgerSync)의 재검증에 쓴다.
+# streamlit 에 의존하지 않으므로 로컬 HTTP 대역(benchmarks/mock_sheets.py)으로 검증할 수 있다.
+import hashlib
+import io
+import tempfile
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from ingest import read_sheet
+from perf import span
+
+SHEET_NAMES = ("members", "ledger", "assets", "rules")
+SHEET_LABELS = {"members": "회원", "ledger": "장부", "assets": "자산", "rules": "회칙"}
+REQUEST_TIMEOUT = 10  # 초
+DOWNLOAD_BLOCK = 1 << 16       # 스트리밍 수신 단위 (바이트)
+SPOOL_MEMORY = 8 << 20         # 이보다 큰 응답은 임시 파일로
+
+
+def sheet_csv_url(sheet_url, sheet_name):
+    """시트 주소 → gviz CSV 주소 (주소에 '/d/' 가 없으면 None)"""
+    if "/d/" not in sheet_url:
+        return None
+    base, rest = sheet_url.split("/d/", 1)
+    sheet_id = rest.split("/")[0]
+    return f"{base}/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
+
+
+@dataclass
+class SheetResult:
+    frame: pd.DataFrame
+    digest: str = ""        # 내용 해시 (데이터 버전)
+    changed: bool = True    # 이번 요청에서 새로 파싱했는지
+    error: str = ""         # 실패 사유 (마지막 정상 데이터를 돌려줌)
+    bad_rows: pd.DataFrame = None   # 스키마에 맞지 않는 행 (ingest.BAD_COLUMNS), 없으면 None
+    bad_count: int = 0
+    rows: int = 0           # 시트의 데이터 행 수 (버린 행 포함)
+    size: int = 0           # CSV 바이트 수 (모르면 0)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """파싱하지 않고 훑은 시트 CSV (앞부분 해시 + 그 뒤에 붙은 바이트)"""
+    size: int = 0
+    digest: str = ""            # 전체 내용 해시 (SheetResult.digest 와 같은 방식)
+    prefix_digest: str = ""     # 앞 prefix_size 바이트의 해시
+    prefix_ends_line: bool = True   # 앞부분이 줄바꿈으로 끝나는지
+    header: bytes = b""         # 첫 줄 (열 이름)
+    tail: bytes = b""           # prefix_size 이후 바이트
+    etag: str = ""
+    last_modified: str = ""
+    not_modified: bool = False  # 304 (나머지 값은 비어 있음)
+
+
+@dataclass
+class _Validator:
+    etag: str = ""
+    last_modified: str = ""
+    digest: str = ""
+    frame: pd.DataFrame = field(default_factory=pd.DataFrame)
+    bad_rows: pd.DataFrame = None
+    bad_count: int = 0
+    rows: int = 0
+    size: int = 0
+
+    def result(self, changed=False, error=""):
+        return SheetResult(self.frame, self.digest, changed, error, self.bad_rows, self.bad_count, self.rows,
+                           self.size)
+
+
+class SheetFetcher:
+    """시트 묶음을 동시에 가져오고, 바뀐 시트만 파싱하는 로더
+
+    read(sheet_name, 파일 객체) → ingest.IngestResult 로 파싱한다 (기본값: 스키마 검증 + 정규화).
+    """
+
+    def __init__(self, sheet_url, read=read_sheet, max_workers=len(SHEET_NAMES), timeout=REQUEST_TIMEOUT):
+        self.sheet_url = sheet_url
+        self.read = read
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheet-fetch")
+        self._validators = {}
+        self._lock = threading.Lock()
+
+    def seed(self, sheet_name, digest, frame):
+        """저장된 스냅샷으로 재검증 정보 채우기 (내용이 같으면 다시 파싱하지 않음)"""
+        with self._lock:
+            self._validators[sheet_name] = _Validator(digest=digest, frame=frame, rows=len(frame))
+
+    def fetch(self, sheet_name):
+        """시트 한 장 가져오기 (조건부 요청)"""
+        with self._lock:
+            cached = self._validators.get(sheet_name, _Validator())
+        csv_url = sheet_csv_url(self.sheet_url, sheet_name)
+        if not csv_url:
+            return SheetResult(pd.DataFrame(), changed=False, error="잘못된 시트 주소")
+
+        headers = {}
+        if cached.etag: headers["If-None-Match"] = cached.etag
+        if cached.last_modified: headers["If-Modified-Since"] = cached.last_modified
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY) as body:
+                with span(f"fetch.{sheet_name}"):
+                    with self.session.get(csv_url, headers=headers, timeout=self.timeout, stream=True) as resp:
+                        if resp.status_code == 304:
+                            return cached.result()
+                        resp.raise_for_status()
+                        digest = hashlib.sha1()
+                        for block in resp.iter_content(DOWNLOAD_BLOCK):
+                            digest.update(block)
+                            body.write(block)
+                        digest = digest.hexdigest()
+                        etag, last_modified = resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", "")
+
+                size = body.tell()
+                if digest == cached.digest:
+                    validator = _Validator(etag, last_modified, digest, cached.frame,
+                                           cached.bad_rows, cached.bad_count, cached.rows, size)
+                    changed = False
+                else:
+                    body.seek(0)
+                    with span(f"parse.{sheet_name}", bytes=size):
+                        parsed = self.read(sheet_name, body)
+                    validator = _Validator(etag, last_modified, digest, parsed.frame,
+                                           parsed.bad_rows if parsed.bad_count else None, parsed.bad_count,
+                                           parsed.rows, size)
+                    changed = True
+
+            with self._lock:
+                self._validators[sheet_name] = validator
+            return validator.result(changed)
+        except Exception as e:
+            return cached.result(error=str(e))
+
+    def fingerprint(self, sheet_name, prefix_size=0, etag="", last_modified=""):
+        """시트 한 장을 파싱 없이 훑기 → Fingerprint (실패 시 예외)
+
+        앞 prefix_size 바이트의 해시와 그 뒤 바이트를 따로 돌려주므로, 예전 내용 뒤에
+        행만 붙었는지를 전체를 다시 파싱하지 않고 확인할 수 있다.
+        """
+        csv_url = sheet_csv_url(self.sheet_url, sheet_name)
+        if not csv_url:
+            raise ValueError("잘못된 시트 주소")
+        headers = {}
+        if etag: headers["If-None-Match"] = etag
+        if last_modified: headers["If-Modified-Since"] = last_modified
+        digest, prefix_digest = hashlib.sha1(), hashlib.sha1()
+        head, tail = bytearray(), io.BytesIO()
+        size, last = 0, b"\n"
+        with span(f"fingerprint.{sheet_name}"):
+            with self.session.get(csv_url, headers=headers, timeout=self.timeout, stream=True) as resp:
+                if resp.status_code == 304:
+                    return Fingerprint(etag=etag, last_modified=last_modified, not_modified=True)
+                resp.raise_for_status()
+                for block in resp.iter_content(DOWNLOAD_BLOCK):
+                    digest.update(block)
+                    if b"\n" not in head: head += block
+                    cut = max(0, min(len(block), prefix_size - size))
+                    if cut:
+                        prefix_digest.update(block[:cut])
+                        last = block[cut - 1:cut]
+                    tail.write(block[cut:])
+                    size += len(block)
+                etag, last_modified = resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", "")
+        return Fingerprint(size, digest.hexdigest(), prefix_digest.hexdigest(), size >= prefix_size and last == b"\n",
+                           bytes(head.split(b"\n", 1)[0]).rstrip(b"\r"), tail.getvalue(), etag, last_modified)
+
+    def fetch_query(self, sheet_name, query):
+        """gviz 쿼리(tq) 결과 → IngestResult (재검증 없이 항상 새로 받음, 실패 시 예외)"""
+        csv_url = sheet_csv_url(self.sheet_url, sheet_name)
+        if not csv_url:
+            raise ValueError("잘못된 시트 주소")
+        with span(f"fetch.{sheet_name}.query"):
+            resp = self.session.get(f"{csv_url}&tq={urllib.parse.quote(query)}", timeout=self.timeout)
+        resp.raise_for_status()
+        return self.read(sheet_name, io.BytesIO(resp.content))
+
+    def fetch_all(self, sheet_names=SHEET_NAMES):
+        """여러 시트를 동시에 가져오기 → {시트명: SheetResult}"""
+        futures = {name: self._pool.submit(self.fetch, name) for name in sheet_names}
+        return {name: fut.result() for name, fut in futures.items()}
+
+    def submit(self, fn, *args):
+        """로더의 스레드 풀에서 작업 실행"""
+        return self._pool.submit(fn, *args)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,133 @@
+# -----------------------------------------------------------------------------
+# 로컬 스냅샷 저장소 (Arrow/Feather)
+# -----------------------------------------------------------------------------
+# 정규화된 시트를 압축하지 않은 Feather(Arrow IPC) 파일로 저장해 두고,
+# 앱이 새로 뜰 때 메모리 맵으로 바로 읽어서 구글 시트를 기다리지 않는다.
+# 네트워크가 끊겨도 마지막 정상 스냅샷으로 화면을 보여줄 수 있다.
+# 회원번호 × 월 입금액(장부 동기화가 새 행만큼 갱신하는 합계)도 함께 저장해서 다시 집계하지 않는다.
+# 한 번의 저장은 임시 폴더에 모든 파일을 쓴 뒤 버전 이름의 폴더로 바꾸고, 마지막에 meta.json 이
+# 그 폴더를 가리키도록 교체한다. 중간에 멈춰도 meta.json 은 이전에 완성된 폴더를 가리키므로
+# 새 시트 파일과 이전 해시/버전이 섞인 스냅샷을 읽지 않는다.
+# pyarrow 가 없으면 저장/복원을 조용히 건너뛴다.
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow 미설치 환경
+    pa = feather = None
+
+from dues_timeline import PaidTotals
+from sheets import SHEET_NAMES
+
+DEFAULT_SNAPSHOT_DIR = ".snapshots"
+META_FILE = "meta.json"
+TOTALS_FILE = "paid_totals.feather"
+TMP_PREFIX = ".tmp-"
+
+
+def _atomic_write(path, write):
+    """같은 폴더의 임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+
+
+def _totals_table(totals):
+    """PaidTotals → 표 (성명 + 월별 열)"""
+    months = pd.period_range(totals.first, periods=totals.paid.shape[1], freq="M").strftime("%Y-%m")
+    table = pd.DataFrame(totals.paid, columns=months)
+    table.insert(0, '성명', totals.names.to_numpy())
+    return table
+
+
+def _totals_from_table(table):
+    months = table.columns[1:]
+    return PaidTotals(pd.Index(table['성명'], dtype=object), pd.Period(months[0], freq="M"),
+                      table[months].to_numpy(dtype="int64"))
+
+
+class SnapshotStore:
+    """시트 주소별 폴더에 DataSnapshot 을 저장/복원"""
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR, sheet_url=""):
+        key = hashlib.sha1(sheet_url.encode()).hexdigest()[:12]
+        self.directory = os.path.join(root, key)
+
+    @property
+    def enabled(self):
+        return feather is not None
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def save(self, snapshot):
+        """스냅샷 저장 (버전 폴더를 다 쓴 뒤 meta.json 을 교체해서 완성된 스냅샷만 보이게)"""
+        if not self.enabled: return False
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.directory, prefix=TMP_PREFIX)
+        try:
+            for name in SHEET_NAMES:
+                table = pa.Table.from_pandas(snapshot.frames[name], preserve_index=False)
+                feather.write_feather(table, os.path.join(tmp, f"{name}.feather"), compression="uncompressed")
+            if snapshot.paid_totals is not None:
+                feather.write_feather(_totals_table(snapshot.paid_totals), os.path.join(tmp, TOTALS_FILE),
+                                      compression="uncompressed")
+            folder = f"{snapshot.version[:12] or 'empty'}-{os.path.basename(tmp)[len(TMP_PREFIX):]}"
+            os.rename(tmp, self._path(folder))
+        finally:
+            if os.path.exists(tmp): shutil.rmtree(tmp, ignore_errors=True)
+        meta = {
+            "folder": folder,
+            "version": snapshot.version,
+            "digests": snapshot.digests,
+            "loaded_at": snapshot.loaded_at.isoformat(),
+            "sheet_loaded_at": {name: snapshot.sheet_time(name).isoformat() for name in SHEET_NAMES},
+            "paid_totals": snapshot.paid_totals is not None,
+        }
+
+        def write_meta(tmp):
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(meta, f, ensure_ascii=False)
+        _atomic_write(self._path(META_FILE), write_meta)
+        self._remove_others(folder)
+        return True
+
+    def _remove_others(self, folder):
+        """지금 가리키는 폴더 말고 남은 것 (이전 버전, 멈춘 저장의 임시 폴더, 이전 형식의 파일) 지우기"""
+        for entry in os.listdir(self.directory):
+            if entry in (folder, META_FILE): continue
+            path = self._path(entry)
+            try:
+                if os.path.isdir(path): shutil.rmtree(path)
+                else: os.remove(path)
+            except OSError:
+                pass  # 다음 저장 때 다시 지움
+
+    def load(self):
+        """저장된 스냅샷 → (frames, meta) / 없거나 깨졌으면 None (meta["paid_totals"]: PaidTotals 또는 None)"""
+        if not self.enabled or not os.path.exists(self._path(META_FILE)): return None
+        try:
+            with open(self._path(META_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+            folder = self._path(meta["folder"])  # 폴더가 없는 이전 형식은 버리고 시트에서 다시 받음
+            frames = {name: feather.read_table(os.path.join(folder, f"{name}.feather"), memory_map=True).to_pandas()
+                      for name in SHEET_NAMES}
+            meta["loaded_at"] = datetime.fromisoformat(meta["loaded_at"])
+            meta["sheet_loaded_at"] = {name: datetime.fromisoformat(value)
+                                       for name, value in meta["sheet_loaded_at"].items()}
+            meta["paid_totals"] = _totals_from_table(feather.read_feather(os.path.join(folder, TOTALS_FILE))) \
+                if meta.get("paid_totals") else None
+            return frames, meta
+        except Exception:
+            return None
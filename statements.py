@@ -0,0 +1,194 @@
+# -----------------------------------------------------------------------------
+# 회원별 현황표 일괄 내보내기 (zip)
+# -----------------------------------------------------------------------------
+# 모든 회원의 현황표(개인 현황 페이지와 같은 수치)와 회원 전체 현황을 하나의 zip 으로 만든다.
+#   - html : 인쇄용 HTML (브라우저에서 열어 PDF 로 저장/인쇄, 한글 글꼴 걱정 없음)
+#   - xlsx : 회원마다 엑셀 파일 하나 (openpyxl 필요)
+# 현황표는 이미 계산된 색인/타임라인(MemberIndex, DuesTimeline)을 조회해서 그리기만 하므로
+# 화면의 공유 집계(data.py)나 CLI 에서 만든 집계를 그대로 넘겨받는다.
+# 회원 수가 많으면 프로세스 풀로 나눠 그리고, 끝난 묶음부터 zip 에 바로 써 넣는다.
+# 풀은 forkserver 로 띄운다 (스레드가 도는 streamlit 서버 프로세스를 fork 하지 않도록).
+# streamlit 에 의존하지 않는다.
+import html
+import importlib.util
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from render import personal_card_html, format_comma
+from reports import build_personal_report, personal_tables, report_tables, report_summary
+
+FORMATS = ("html", "xlsx")
+CHUNK = 50              # 작업 하나에 넣는 회원 수
+MIN_PARALLEL = 200      # 이보다 적으면 풀을 띄우지 않고 바로 그림 (풀 시작 비용이 더 큼)
+STATEMENT_DIR = "개인현황"
+HISTORY_MONEY = ["납부할금액", "납부한금액", "누적미납액"]
+
+# 인쇄용 밝은 테마 (화면 테마 CSS 의 status-card 구성을 그대로 따름)
+STATEMENT_CSS = """
+body { font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', 'Noto Sans KR', sans-serif; color: #222; margin: 24px; }
+.status-card { border: 1px solid #ccc; border-radius: 10px; padding: 16px 20px; }
+.status-card h3 { margin: 0; }
+.status-caption { color: #666; font-size: 0.9rem; margin-bottom: 12px; }
+.status-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 6px 24px; }
+.status-note { padding: 12px 14px; border-radius: 8px; margin-top: 10px; }
+.status-note.unpaid { background-color: #fde2e2; }
+.status-note.paid { background-color: #dcf5e3; }
+.status-note.prepaid { background-color: #dbeafb; }
+table { border-collapse: collapse; margin-top: 8px; font-size: 0.9rem; }
+th, td { border: 1px solid #ccc; padding: 4px 10px; }
+td.num { text-align: right; }
+@media print { body { margin: 0; } .status-card { break-inside: avoid; } h4 { break-after: avoid; } }
+"""
+
+_UNSAFE = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def has_xlsx():
+    return importlib.util.find_spec("openpyxl") is not None
+
+
+def _file_name(text):
+    return _UNSAFE.sub('_', str(text)).strip('_') or '_'
+
+
+def _table_html(df, money=()):
+    """DataFrame → 간단한 HTML 표 (금액 열은 천 단위 쉼표, 오른쪽 정렬)"""
+    head = "".join(f"<th>{html.escape(str(col))}</th>" for col in df.columns)
+    # 행마다 꺼내지 않고 열 단위로 문자열을 만든 뒤 이어 붙임
+    columns = []
+    for col in df.columns:
+        values = df[col].tolist()
+        if col in money: columns.append([f"<td class='num'>{format_comma(v)}</td>" for v in values])
+        else: columns.append([f"<td>{html.escape('' if pd.isna(v) else str(v))}</td>" for v in values])
+    rows = "".join("<tr>" + "".join(cells) + "</tr>" for cells in zip(*columns))
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{rows}</tbody></table>"
+
+
+def _page(title, body):
+    return (f"<!DOCTYPE html><html lang='ko'><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            f"<style>{STATEMENT_CSS}</style></head><body>{body}</body></html>")
+
+
+def statement_html(report):
+    """PersonalReport → 인쇄용 HTML 문서 (현황표 + 월별 납부 내역)"""
+    body = personal_card_html(report.user, report.stats, report.dues["due"], report.month_label,
+                              report.dues["overdue"])
+    if report.has_history:
+        body += "<h4>📅 월별 납부 내역</h4>" + _table_html(report.history, HISTORY_MONEY)
+    return _page(f"{report.user.get('성명', '')} 현황표", body)
+
+
+def _xlsx(tables):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for name, df in tables.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return buffer.getvalue()
+
+
+def statement_bytes(report, fmt):
+    if fmt == "xlsx": return _xlsx(personal_tables(report))
+    return statement_html(report).encode("utf-8")
+
+
+def status_bytes(report, fmt, today):
+    """StatusReport → 전체 현황 파일 하나 (요약 + 표)"""
+    summary = pd.DataFrame({"항목": list(report_summary(report)), "금액": list(report_summary(report).values())})
+    tables = {"요약": summary, **report_tables(report)}
+    if fmt == "xlsx": return _xlsx(tables)
+    body = f"<h3>📊 회원 전체 현황</h3><div class='status-caption'>기준일: {today:%Y-%m-%d}</div>"
+    for name, df in tables.items():
+        money = [col for col in df.columns if pd.api.types.is_integer_dtype(df[col])]
+        body += f"<h4>{html.escape(name)}</h4>" + _table_html(df, money)
+    return _page("회원 전체 현황", body).encode("utf-8")
+
+
+class StatementRenderer:
+    """회원 아이디 묶음 → [(zip 안 경로, 내용)] (풀의 작업 프로세스마다 한 번 만들어 둠)"""
+
+    def __init__(self, member_index, timeline, fmt, today):
+        self.member_index = member_index
+        self.timeline = timeline
+        self.fmt = fmt
+        self.today = today
+
+    def __call__(self, user_ids):
+        files = []
+        for user_id in user_ids:
+            report = build_personal_report(self.member_index, self.timeline, user_id, self.today)
+            if report is None: continue
+            name = _file_name(f"{report.user.get('성명', '')}_{user_id}")
+            files.append((f"{STATEMENT_DIR}/{name}.{self.fmt}", statement_bytes(report, self.fmt)))
+        return files
+
+
+_renderer = None
+
+
+def _init_worker(member_index, timeline, fmt, today):
+    # 색인/타임라인은 작업마다가 아니라 작업 프로세스마다 한 번만 넘긴다
+    global _renderer
+    _renderer = StatementRenderer(member_index, timeline, fmt, today)
+
+
+def _render_chunk(user_ids):
+    return _renderer(user_ids)
+
+
+def _pool_context():
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload([__name__])
+    return ctx
+
+
+def default_workers(n_members):
+    if n_members < MIN_PARALLEL: return 1
+    return max(1, min(os.cpu_count() or 1, -(-n_members // CHUNK)))
+
+
+def export_statements(out, member_index, timeline, status_report=None, fmt="html", workers=None, today=None,
+                      progress=None):
+    """회원별 현황표 (+ 전체 현황) → zip / 현황표 수
+
+    out: zip 파일 경로 또는 쓰기 가능한 파일 객체 (BytesIO 등)
+    workers: 작업 프로세스 수 (None 이면 회원 수/코어 수로 정함, 1 이면 풀 없이 이 프로세스에서)
+    progress(done, total): 묶음이 끝날 때마다 호출
+    """
+    if fmt not in FORMATS: raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    if fmt == "xlsx" and not has_xlsx(): raise RuntimeError("엑셀 내보내기에는 openpyxl 이 필요합니다 (pip install openpyxl)")
+    today = today or datetime.now()
+    user_ids = list(member_index.by_id)
+    chunks = [user_ids[i:i + CHUNK] for i in range(0, len(user_ids), CHUNK)]
+    workers = default_workers(len(user_ids)) if workers is None else max(1, min(workers, len(chunks) or 1))
+    # xlsx 는 이미 압축된 형식이라 다시 압축하지 않음
+    compression = zipfile.ZIP_STORED if fmt == "xlsx" else zipfile.ZIP_DEFLATED
+
+    count, done = 0, 0
+    with zipfile.ZipFile(out, "w", compression) as bundle:
+        if status_report is not None:
+            bundle.writestr(f"전체현황.{fmt}", status_bytes(status_report, fmt, today))
+        if workers <= 1:
+            results, pool = map(StatementRenderer(member_index, timeline, fmt, today), chunks), None
+        else:
+            pool = ProcessPoolExecutor(workers, mp_context=_pool_context(), initializer=_init_worker,
+                                       initargs=(member_index, timeline, fmt, today))
+            results = pool.map(_render_chunk, chunks)
+        try:
+            for files in results:
+                for path, data in files:
+                    bundle.writestr(path, data)
+                count += len(files)
+                done += 1
+                if progress: progress(done, len(chunks))
+        finally:
+            if pool is not None: pool.shutdown(cancel_futures=True)
+    return count
@@ -0,0 +1,401 @@
+# -----------------------------------------------------------------------------
+# 데이터 스냅샷 (시트 묶음 + 파생 집계)
+# -----------------------------------------------------------------------------
+# 한 번의 새로고침으로 얻은 네 장의 정규화 시트를 하나의 불변 스냅샷으로 묶는다.
+# 장부는 계속 늘어나기만 하므로 LedgerSync 가 새로 추가된 꼬리 행만 받아 붙이고,
+# 회원번호 × 월 입금액(dues_timeline.PaidTotals)도 꼬리 행의 내용만 회원번호로 해석해서 더한다.
+# (회비 타임라인은 이 합계를 그대로 쓰므로 새로고침 비용이 장부 전체 길이가 아니라 새 거래 수에 비례)
+# DataSource 는 현재 스냅샷을 들고 있고, 백그라운드 스레드가 TTL 마다 새로고침해서
+# 새 불변 스냅샷으로 통째로 바꿔 끼운다 (stale-while-revalidate: 화면 요청은 시트를 기다리지 않음).
+# 앱이 새로 뜰 때는 로컬 스냅샷(snapshots.py)을 먼저 보여준 뒤 백그라운드로 새로고침한다.
+# streamlit 에 의존하지 않는다 (data.py 가 캐시로 감싼다).
+import hashlib
+import io
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
+import pandas as pd
+
+from dues_timeline import tally_paid
+from ingest import MAX_BAD_ROWS
+from member_resolve import MemberResolver, member_names
+from perf import span
+from schema import append_rows
+from sheets import SheetResult, SHEET_NAMES
+
+VERIFY_EVERY = 5      # 증분 동기화 N회마다 시트 전체를 해시로 재검증 (중간 수정/삭제 반영, TTL 60초면 5분)
+MAX_BACKOFF = 8       # 연속 실패 시 새로고침 간격을 최대 TTL × 8 까지 늘림
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    frames: dict                 # 시트명 → 정규화 프레임 (읽기 전용)
+    version: str = ""            # 데이터 버전 (시트 해시 조합)
+    digests: dict = field(default_factory=dict)  # 시트명 → 내용 해시
+    errors: dict = field(default_factory=dict)
+    loaded_at: datetime = field(default_factory=datetime.now)  # 가장 오래된 시트의 기준 시각
+    bad_rows: dict = field(default_factory=dict)    # 시트명 → 스키마에 맞지 않는 행 (있는 시트만)
+    bad_counts: dict = field(default_factory=dict)  # 시트명 → 오류 행 전체 개수
+    sheet_loaded_at: dict = field(default_factory=dict)  # 시트명 → 마지막으로 정상적으로 읽은 시각
+    paid_totals: object = None   # 회원번호 × 월 입금액 (dues_timeline.PaidTotals, 없으면 타임라인이 장부에서 집계)
+
+    def sheet_time(self, name):
+        """시트 한 장의 데이터 기준 시각 (실패해서 이전 데이터를 쓰는 시트는 그때 시각)"""
+        return self.sheet_loaded_at.get(name, self.loaded_at)
+
+
+def empty_snapshot():
+    return DataSnapshot({name: pd.DataFrame() for name in SHEET_NAMES})
+
+
+def _row_key(row):
+    return tuple(str(v) for v in row)
+
+
+def _same_rows(a, b):
+    """두 프레임의 행 내용이 같은지 (dtype 차이는 무시)"""
+    if len(a) != len(b) or list(a.columns) != list(b.columns): return False
+    if a.empty: return True
+    return bool((pd.util.hash_pandas_object(a.astype(str), index=False).to_numpy()
+                 == pd.util.hash_pandas_object(b.astype(str), index=False).to_numpy()).all())
+
+
+@dataclass(frozen=True)
+class _Verified:
+    """마지막으로 시트 전체와 맞춰 본 시점의 장부 (재검증 기준)"""
+    size: int = 0           # 그때의 CSV 바이트 수
+    digest: str = ""        # 그때의 CSV 해시
+    rows: int = 0           # 그때의 시트 행 수 (버린 행 포함)
+    frame_rows: int = 0     # 그때의 frame 행 수
+    etag: str = ""
+    last_modified: str = ""
+
+
+class LedgerSync:
+    """장부 증분 동기화
+
+    마지막으로 본 시트 행 수(rows, 형식 오류로 버린 행 포함)를 기억해 두었다가, 다음 동기화 때는
+    gviz 쿼리 'select * offset rows-1' 로 겹치는 한 행 + 새 행만 받는다.
+    겹치는 행이 기억한 마지막 행과 다르면 (중간 수정/삭제) 전체를 다시 받는다.
+    겹치는 행만으로는 중간 행 수정이나 '삭제 + 추가'를 알 수 없으므로 verify_every 회마다
+    시트 전체를 파싱 없이 해시로 재검증한다 (SheetFetcher.fingerprint):
+    마지막 재검증 때의 CSV 가 그대로 앞부분에 있고, 그 뒤에 붙은 행이 증분으로 받은 행과 같으면 통과,
+    아니면 전체를 다시 받는다. 저장된 스냅샷에서 시작하면 첫 동기화는 항상 전체 동기화다.
+
+    회원번호 × 월 입금액(paid_totals)은 증분으로 받은 행만 해석/집계해서 더하고, 전체 동기화로 내용이
+    바뀌었거나 회원 시트의 성명 목록이 바뀌었을 때(totals_for)만 장부 전체로 다시 집계한다.
+    """
+
+    def __init__(self, fetcher, verify_every=VERIFY_EVERY):
+        self.fetcher = fetcher
+        self.verify_every = verify_every
+        self.frame = pd.DataFrame()
+        self.version = ""
+        self.rows = 0
+        self.bad_rows = None
+        self.bad_count = 0
+        self.paid_totals = None     # dues_timeline.PaidTotals (성명 목록을 알기 전에는 None)
+        self._resolver = None       # 마지막 성명 목록의 MemberResolver
+        self._verified = _Verified()
+        self._since_verify = 0
+        self._needs_full = True
+        self._lock = threading.Lock()
+
+    def seed(self, frame, version, paid_totals=None):
+        """저장된 스냅샷에서 이어서 동기화 (그동안 바뀌었을 수 있으므로 다음 동기화는 전체)"""
+        with self._lock:
+            self.frame, self.version, self.paid_totals = frame, version, paid_totals
+            self.rows = len(frame)
+            self._needs_full = True
+
+    def totals_for(self, df_members):
+        """회원 시트 기준 회원번호 × 월 입금액 (성명 목록이 바뀌었으면 장부 전체로 다시 집계)"""
+        names = member_names(df_members)
+        with self._lock, span("ledger.totals"):
+            if self._resolver is None or not self._resolver.names.equals(names):
+                self._resolver = MemberResolver(names)
+                if self.paid_totals is not None and not self.paid_totals.names.equals(names):
+                    self.paid_totals = None
+            if self.paid_totals is None:
+                self._tally(self.frame)
+            return self.paid_totals
+
+    def _tally(self, rows, add=False):
+        """rows 의 입금을 회원번호로 해석해서 집계 (add: 지금까지의 합계에 더함)"""
+        if self._resolver is None or (add and self.paid_totals is None):
+            self.paid_totals = None  # 성명 목록을 알게 되면 totals_for 에서 전체 집계
+            return
+        self.paid_totals = tally_paid(self._resolver.names, self._resolver.member_ids(rows), rows,
+                                      self.paid_totals if add else None)
+
+    def _result(self, changed, error=""):
+        return SheetResult(self.frame, self.version, changed, error, self.bad_rows, self.bad_count, self.rows)
+
+    def sync(self):
+        """새 행을 반영하고 SheetResult(frame, 버전, 변경 여부) 반환"""
+        with self._lock, span("ledger.sync"):
+            if self._needs_full or self.rows == 0:
+                return self._full()
+            result = self._append()
+            self._since_verify += 1
+            if result.error or self._since_verify < self.verify_every or self._verify():
+                return result
+            full = self._full()
+            return self._result(result.changed or full.changed, full.error)
+
+    def _append(self):
+        """꼬리 쿼리로 새 행만 받아 붙이기"""
+        offset = self.rows - 1
+        try:
+            parsed = self.fetcher.fetch_query("ledger", f"select * offset {offset}")
+        except Exception as e:
+            return self._result(changed=False, error=str(e))
+
+        tail = parsed.frame
+        if tail.empty or list(tail.columns) != list(self.frame.columns) \
+                or _row_key(tail.iloc[0]) != _row_key(self.frame.iloc[-1]):
+            return self._full()
+
+        new_rows = tail.iloc[1:]
+        if parsed.rows <= 1:
+            return self._result(changed=False)
+
+        self.rows += parsed.rows - 1
+        if parsed.bad_count: self._add_bad_rows(parsed, offset)
+        if new_rows.empty:
+            return self._result(changed=False)
+
+        self.frame = append_rows(self.frame, new_rows)
+        self._tally(new_rows, add=True)
+        tail_hash = pd.util.hash_pandas_object(new_rows.astype(str), index=False).sum()
+        self.version = hashlib.sha1(f"{self.version}:{tail_hash}".encode()).hexdigest()
+        return self._result(changed=True)
+
+    def _add_bad_rows(self, parsed, offset):
+        """꼬리 쿼리의 오류 행을 시트 행 번호로 옮겨 누적 (겹치는 첫 행은 이미 보고됨)"""
+        bad = parsed.bad_rows[parsed.bad_rows['행'] > 2].assign(행=lambda df: df['행'] + offset)
+        self.bad_count += parsed.bad_count - (len(parsed.bad_rows) - len(bad))
+        merged = bad if self.bad_rows is None else pd.concat([self.bad_rows, bad], ignore_index=True)
+        self.bad_rows = merged.head(MAX_BAD_ROWS)
+
+    def _verify(self):
+        """마지막 재검증 이후 시트 끝에 행만 붙었는지 (False 면 전체 동기화 필요)"""
+        verified = self._verified
+        try:
+            fp = self.fetcher.fingerprint("ledger", verified.size, verified.etag, verified.last_modified)
+        except Exception:
+            return True  # 연결 문제 - 다음 동기화 때 다시 확인
+        with span("ledger.verify"):
+            if fp.not_modified:
+                ok, fp = self.rows == verified.rows, replace(fp, size=verified.size, digest=verified.digest)
+            elif fp.digest == verified.digest:
+                ok = self.rows == verified.rows
+            else:
+                ok = fp.prefix_digest == verified.digest and self._tail_matches(fp, verified)
+        if not ok:
+            self._needs_full = True
+            return False
+        self._verified = _Verified(fp.size, fp.digest, self.rows, len(self.frame), fp.etag, fp.last_modified)
+        self._since_verify = 0
+        return True
+
+    def _tail_matches(self, fp, verified):
+        """재검증 이후 붙은 바이트 = 그동안 증분으로 받은 행인지"""
+        if not (fp.prefix_ends_line or fp.tail.startswith((b"\n", b"\r\n"))):
+            return False  # 예전 마지막 행이 뒤로 늘어남 (수정)
+        parsed = self.fetcher.read("ledger", io.BytesIO(fp.header + b"\n" + fp.tail.lstrip(b"\r\n")))
+        return parsed.rows == self.rows - verified.rows \
+            and _same_rows(parsed.frame, self.frame.iloc[verified.frame_rows:])
+
+    def _full(self):
+        result = self.fetcher.fetch("ledger")
+        if result.error:
+            return self._result(changed=False, error=result.error)
+        # 받은 내용을 그대로 채택 (증분으로 붙인 행이 시트에서 사라졌을 수도 있으므로)
+        same = result.digest == self.version   # 기억한 내용과 같으면 입금 합계도 그대로
+        changed = result.changed or not same
+        self.frame, self.version = result.frame, result.digest
+        if not same: self._tally(self.frame)
+        self.rows, self.bad_rows, self.bad_count = result.rows, result.bad_rows, result.bad_count
+        self._verified = _Verified(result.size, result.digest, result.rows, len(result.frame))
+        self._since_verify = 0
+        self._needs_full = False
+        return self._result(changed)
+
+
+def load_snapshot(fetcher, ledger_sync):
+    """시트 묶음을 동시에 새로고침해서 DataSnapshot 생성 (장부는 증분 동기화)"""
+    ledger_future = fetcher.submit(ledger_sync.sync)
+    results = fetcher.fetch_all([name for name in SHEET_NAMES if name != "ledger"])
+    results["ledger"] = ledger_future.result()
+    paid_totals = ledger_sync.totals_for(results["members"].frame)
+
+    digests = {name: results[name].digest for name in SHEET_NAMES}
+    now = datetime.now()
+    return DataSnapshot(
+        frames={name: results[name].frame for name in SHEET_NAMES},
+        version=combine_digests(digests),
+        digests=digests,
+        errors={name: r.error for name, r in results.items() if r.error},
+        loaded_at=now,
+        bad_rows={name: r.bad_rows for name, r in results.items() if r.bad_count},
+        bad_counts={name: r.bad_count for name, r in results.items() if r.bad_count},
+        sheet_loaded_at={name: now for name, r in results.items() if not r.error},
+        paid_totals=paid_totals,
+    )
+
+
+def combine_digests(digests):
+    return hashlib.sha1("|".join(digests.get(name, "") for name in SHEET_NAMES).encode()).hexdigest()
+
+
+class DataSource:
+    """시트 주소 하나에 대한 현재 스냅샷 관리자
+
+    - get(): 현재 스냅샷 (메모리만 읽음 - 시트를 한 번도 못 읽은 첫 호출만 기다림)
+    - 처음 불릴 때 로컬 스냅샷이 있으면 그것을 즉시 돌려주고 백그라운드로 새로고침
+    - 새로고침 스레드: TTL 마다 (연결 실패가 이어지면 간격을 늘려) 새로고침, request_refresh() 로 즉시 깨움
+    - 새로고침에 실패한 시트는 마지막 정상 데이터를 유지
+    - prepare(새 스냅샷): 보이는 스냅샷을 새 버전으로 바꾸기 직전에 (새로고침 스레드에서) 호출
+      → 공유 집계를 미리 만들어 두면 화면은 바뀐 직후에도 계산을 기다리지 않음
+    - subscribe(callback): 데이터 버전이 바뀔 때마다 callback(이전, 새 스냅샷) 호출
+      (백그라운드 새로고침이면 새로고침 스레드에서 호출됨)
+    """
+
+    def __init__(self, fetcher, ledger_sync, disk=None, ttl=60, prepare=None):
+        self.fetcher = fetcher
+        self.ledger_sync = ledger_sync
+        self.disk = disk
+        self.ttl = ttl
+        self.prepare = prepare
+        self.current = None
+        self.checked_at = 0.0   # 마지막 새로고침 시도 시각 (time.monotonic)
+        self.failures = 0       # 연속으로 모든 시트가 실패한 새로고침 횟수
+        self._init_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._listeners = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def _swap(self, new):
+        old, self.current = self.current, new
+        if old is None or old.version != new.version:
+            for callback in self._listeners:
+                try:
+                    callback(old, new)
+                except Exception:
+                    pass  # 캐시 무효화 실패가 새로고침을 막지 않도록
+
+    def is_stale(self):
+        return time.monotonic() - self.checked_at >= self.ttl
+
+    def get(self):
+        if self.current is None:
+            with self._init_lock:
+                if self.current is None: self._cold_start()
+        if not self._closed and (self._thread is None or not self._thread.is_alive()):
+            self.start()
+        return self.current
+
+    # --- 백그라운드 새로고침 ---
+    def start(self):
+        """새로고침 스레드 시작 (이미 돌고 있으면 무시)"""
+        with self._init_lock:
+            if self._thread is not None and self._thread.is_alive(): return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="snapshot-refresher")
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def close(self):
+        """새로고침 스레드를 멈추고 HTTP 세션/다운로드 스레드를 닫음 (이후 get() 은 마지막 스냅샷만 돌려줌)"""
+        self._closed = True
+        self.stop()
+        self.fetcher.close()
+
+    def request_refresh(self):
+        """다음 주기를 기다리지 않고 곧바로 새로고침"""
+        self._wake.set()
+
+    def next_delay(self):
+        """다음 새로고침까지 남은 시간 (초, 연속 실패 시 TTL × 2^n, 최대 TTL × MAX_BACKOFF)"""
+        interval = self.ttl * min(2 ** self.failures, MAX_BACKOFF)
+        return max(0.0, interval - (time.monotonic() - self.checked_at))
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._wake.wait(self.next_delay()): self._wake.clear()
+            if self._stop.is_set(): break
+            try:
+                self.refresh(force=True)
+            except Exception:
+                # 예상 못 한 실패도 스레드를 멈추지 않음 (다음 주기에 다시 시도)
+                self.failures += 1
+                self.checked_at = time.monotonic()
+
+    def _cold_start(self):
+        with span("snapshot.load"):
+            saved = self.disk.load() if self.disk else None
+        if saved is None:
+            self.refresh(force=True)
+            return
+        frames, meta = saved
+        digests = meta.get("digests", {})
+        for name in SHEET_NAMES:
+            if name != "ledger": self.fetcher.seed(name, digests.get(name, ""), frames[name])
+        self.ledger_sync.seed(frames["ledger"], digests.get("ledger", ""), meta.get("paid_totals"))
+        self._swap(DataSnapshot(frames, meta.get("version", ""), digests, loaded_at=meta["loaded_at"],
+                                sheet_loaded_at=meta["sheet_loaded_at"], paid_totals=meta.get("paid_totals")))
+        # 새로고침 스레드가 바로 시트를 받아오고, 그동안 요청은 저장된 스냅샷을 그대로 본다
+        self.checked_at = time.monotonic()
+        self.request_refresh()
+
+    def refresh(self, force=False):
+        """시트를 새로고침해서 현재 스냅샷 교체 (바뀐 경우 로컬에도 저장)"""
+        with self._refresh_lock:
+            if not force and not self.is_stale(): return self.current
+            with span("refresh"):
+                new = load_snapshot(self.fetcher, self.ledger_sync)
+            self.checked_at = time.monotonic()
+            # 시트 전부가 실패했을 때(연결 문제)만 간격을 늘림 - 한 장의 형식 오류는 평소 주기로 다시 확인
+            self.failures = self.failures + 1 if len(new.errors) == len(SHEET_NAMES) else 0
+            current = self.current
+            if current is not None and new.errors:
+                # 실패한 시트는 이전 데이터(와 그때의 오류 행 보고, 읽은 시각) 유지
+                src = {name: current if name in new.errors else new for name in SHEET_NAMES}
+                frames = {name: src[name].frames[name] for name in SHEET_NAMES}
+                digests = {name: src[name].digests.get(name, "") for name in SHEET_NAMES}
+                # (장부 입금 합계는 LedgerSync 가 마지막 정상 장부 기준으로 들고 있으므로 새 스냅샷 것을 그대로)
+                sheet_loaded_at = {name: src[name].sheet_loaded_at[name] for name in SHEET_NAMES
+                                   if name in src[name].sheet_loaded_at}
+                new = DataSnapshot(frames, combine_digests(digests), digests, new.errors,
+                                   loaded_at=min(sheet_loaded_at.values(), default=new.loaded_at),
+                                   sheet_loaded_at=sheet_loaded_at, paid_totals=new.paid_totals,
+                                   bad_rows={name: src[name].bad_rows[name] for name in SHEET_NAMES
+                                             if name in src[name].bad_rows},
+                                   bad_counts={name: src[name].bad_counts[name] for name in SHEET_NAMES
+                                               if name in src[name].bad_counts})
+            if current is None or new.version != current.version or new.errors != current.errors:
+                if self.prepare and current is not None and new.version != current.version:
+                    try:
+                        with span("refresh.prepare"):
+                            self.prepare(new)
+                    except Exception:
+                        pass  # 미리 계산하지 못하면 화면이 처음 읽을 때 계산
+                self._swap(new)
+                if self.disk and not new.errors and (current is None or new.version != current.version):
+                    try:
+                        self.disk.save(new)
+                    except OSError:
+                        pass  # 저장 실패는 화면 표시에 영향 없음
+            return self.current
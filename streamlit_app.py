@@ -1,19 +1,34 @@
+import html
+import io
+import time
+
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-import base64
+
+from background import prepare_static_background, find_source, data_uri, background_css
+from data import load_view, load_all, load_rules, load_personal_report, load_rule_index, load_status_report, load_ledger_cube, load_member_resolution, load_statement_inputs, get_source, get_registry_table, cached_render, current_club, get_clubs
+from render import format_comma, rules_html, personal_card_html, page_count
+from member_index import normalize_id
+from perf import span, start_trace, current_trace, span_table, cache_table, frame_memory, export_events
+from schema import find_asset_columns
+from sheets import SHEET_LABELS
+from statements import export_statements, has_xlsx, FORMATS as STATEMENT_FORMATS
+from tables import show_table, blank_zeros
+from dues import COL_DUE, COL_PAID, COL_DIFF
 
 # -----------------------------------------------------------------------------
 # 1. 페이지 설정 (가장 먼저 실행)
 # -----------------------------------------------------------------------------
+# 상조회별 이름 (secrets 의 [clubs.<아이디>] title, 없으면 기본 이름)
+club = current_club()
+app_title = club.title if club and club.title else "천비칠마 상조회"
+
 # [수정 1] 아이콘을 bg.jpg로 변경
-st.set_page_config(page_title="천비칠마 상조회", page_icon="bg.jpg", layout="wide")
+st.set_page_config(page_title=app_title, page_icon="bg.jpg", layout="wide")
 
 # [수정 2] 카카오톡 미리보기 이미지 주소를 bg.jpg로 변경
-meta_tags = """
+meta_tags = f"""
 <head>
-    <meta property="og:title" content="천비칠마 상조회" />
+    <meta property="og:title" content="{app_title}" />
     <meta property="og:description" content="투명하고 편리한 모바일 회비 장부" />
     <meta property="og:image" content="https://raw.githubusercontent.com/ant11353-cyber/sangjo-app/main/bg.jpg" />
     <meta property="og:image:width" content="1200" />
@@ -25,46 +40,14 @@ st.markdown(meta_tags, unsafe_allow_html=True)
 # -----------------------------------------------------------------------------
 # 2. 공통 함수 및 스타일 정의
 # -----------------------------------------------------------------------------
-def get_base64_of_bin_file(bin_file):
-    try:
-        with open(bin_file, 'rb') as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except:
-        return ""
-
-def format_comma(val):
-    try: return f"{int(val):,}"
-    except: return val
-
-def safe_int(value):
-    try: return int(str(value).replace(',', '').replace(' ', ''))
-    except: return 0
-
-@st.cache_data(ttl=60)
-def load_data(sheet_name):
-    try:
-        url = st.secrets["connections"]["sheet_url"]
-        if "/d/" in url:
-            sheet_id = url.split("/d/")[1].split("/")[0]
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-            df = pd.read_csv(csv_url, dtype=str)
-            df.columns = df.columns.str.strip()
-            return df
-        else:
-            return pd.DataFrame()
-    except Exception:
-        return pd.DataFrame()
-
-def get_dues_calc_info():
-    today = datetime.now()
-    start_date = datetime(2020, 2, 1)
-    
-    # 경과 월수 계산 (현재년 - 시작년)*12 + (현재월 - 시작월)
-    months_passed = (today.year - start_date.year) * 12 + (today.month - start_date.month)
-    
-    if months_passed < 0: months_passed = 0
-    return today, months_passed
+@st.cache_resource
+def get_home_background_css():
+    """홈 배경 CSS (프로세스당 한 번만 생성)"""
+    if st.get_option("server.enableStaticServing"):
+        desktop_url, mobile_url = prepare_static_background()
+        if desktop_url: return background_css(desktop_url, mobile_url)
+    source = find_source()
+    return background_css(data_uri(source)) if source else None
 
 def apply_theme_style(page_type="sub"):
     # 다크 모드 공통 CSS
@@ -151,6 +134,7 @@ def apply_theme_style(page_type="sub"):
         margin-top: 15px;
         line-height: 1.6;
     }
+    .conclusion-box.warn { border-color: rgba(255, 75, 75, 0.6); }
     
     /* 이자 강조 */
     .interest-box {
@@ -179,6 +163,57 @@ def apply_theme_style(page_type="sub"):
          font-weight: bold;
     }
     
+    /* 회칙 목록 */
+    .rule-divider {
+        border: none;
+        border-top: 1px solid rgba(255, 255, 255, 0.15);
+        margin: 12px 0;
+    }
+    .rule-content summary {
+        cursor: pointer;
+        opacity: 0.85;
+    }
+
+    /* 개인 현황표 */
+    .status-card h3 {
+        margin-bottom: 0;
+    }
+    .status-caption {
+        opacity: 0.7;
+        font-size: 0.9rem;
+        margin-bottom: 12px;
+    }
+    .status-grid {
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        grid-template-rows: repeat(3, auto);
+        grid-auto-flow: column;
+        gap: 8px 20px;
+    }
+    @media only screen and (max-width: 600px) {
+        .status-grid {
+            grid-template-columns: 1fr;
+            grid-template-rows: none;
+            grid-auto-flow: row;
+        }
+    }
+    .status-note {
+        padding: 14px 16px;
+        border-radius: 8px;
+        margin-top: 10px;
+    }
+    .status-note.unpaid { background-color: rgba(255, 75, 75, 0.2); }
+    .status-note.paid { background-color: rgba(33, 195, 84, 0.2); }
+    .status-note.prepaid { background-color: rgba(28, 131, 225, 0.2); }
+
+    /* 회칙 검색어 강조 */
+    mark {
+        background-color: rgba(255, 204, 0, 0.35);
+        color: #ffffff !important;
+        padding: 0 2px;
+        border-radius: 3px;
+    }
+    
     /* 입력창 */
     .stTextInput input {
         background-color: rgba(255, 255, 255, 0.1);
@@ -193,42 +228,11 @@ def apply_theme_style(page_type="sub"):
     st.markdown(common_css, unsafe_allow_html=True)
 
     if page_type == 'home':
-        try:
-            # [수정 3] 배경 이미지도 bg.jpg를 읽도록 변경
-            bin_str = get_base64_of_bin_file('bg.jpg')
-            
-            # 혹시나 파일이 없을 경우를 대비해 예외 처리 강화
-            if not bin_str:
-                 # bg.jpg 읽기 실패시 bg.png 시도 (안전장치)
-                 bin_str = get_base64_of_bin_file('bg.png')
-
-            bg_css = f"""
-            <style>
-            .stApp {{
-                background-image: url("data:image/png;base64,{bin_str}");
-                background-size: cover;
-                background-position: center;
-                background-repeat: no-repeat;
-                background-attachment: fixed;
-            }}
-            .block-container {{
-                padding-top: 0rem;
-            }}
-            .footer-credit {{
-                position: fixed;
-                bottom: 10px;
-                right: 10px;
-                color: rgba(255, 255, 255, 0.5) !important;
-                font-size: 0.8rem;
-                padding: 4px 10px;
-                background-color: rgba(0, 0, 0, 0.4);
-                border-radius: 15px;
-                z-index: 9999;
-            }}
-            </style>
-            """
+        # 배경 이미지는 정적 파일(또는 한 번 만든 data URI)로 재사용
+        bg_css = get_home_background_css()
+        if bg_css:
             st.markdown(bg_css, unsafe_allow_html=True)
-        except:
+        else:
             st.error("배경화면 파일(bg.jpg)을 찾을 수 없습니다.")
     else:
         bg_css = """
@@ -241,16 +245,132 @@ def apply_theme_style(page_type="sub"):
         """
         st.markdown(bg_css, unsafe_allow_html=True)
 
-def render_header_nav(title):
+def render_header_nav(title, view):
     st.markdown('<div class="content-box">', unsafe_allow_html=True)
     c1, c2 = st.columns([8, 2])
     with c1: st.header(title)
     with c2:
         if st.button("🏠 홈으로"):
             st.switch_page(home) 
-
-def render_footer_div():
+    snap = load_all(view)
+    stale = [name for name in snap.errors if not snap.frames[name].empty]
+    failed = [name for name in snap.errors if snap.frames[name].empty]
+    if stale:
+        loaded_at = min(snap.sheet_time(name) for name in stale)
+        st.caption(f"⚠️ 구글 시트에 연결하지 못해 {loaded_at.strftime('%Y-%m-%d %H:%M')} 기준 데이터를 표시합니다. "
+                   f"({', '.join(SHEET_LABELS.get(name, name) for name in stale)})")
+    if failed:
+        # 한 번도 읽지 못한 시트: '데이터 없음' 대신 사유를 보여줌
+        st.error("구글 시트를 읽지 못했습니다.\n\n" + "\n".join(
+            f"- {SHEET_LABELS.get(name, name)}: {snap.errors[name]}" for name in failed))
+    if snap.bad_counts:
+        st.caption("⚠️ 형식에 맞지 않는 행: " + ", ".join(
+            f"{SHEET_LABELS.get(name, name)} {count:,}행" for name, count in snap.bad_counts.items()))
+
+def render_footer_div(view):
     st.markdown('</div>', unsafe_allow_html=True)
+    if is_admin():
+        render_sheet_issues(view)
+        render_debug_panel(view)
+
+
+def is_admin():
+    """관리자 여부: 주소에 ?debug=<그 상조회의 debug_token> 으로 한 번 들어오면 세션 동안 그 상조회에서만 유지"""
+    club = current_club()
+    if club is None or not club.debug_token: return False
+    admin_clubs = st.session_state.setdefault("admin_clubs", set())
+    if club.club_id in admin_clubs: return True
+    if st.query_params.get("debug") == club.debug_token:
+        admin_clubs.add(club.club_id)
+        return True
+    return False
+
+
+def render_sheet_issues(view):
+    """관리자 전용 시트 점검 (읽기 실패 사유 / 스키마에 맞지 않는 행 / 회원에 맞추지 못한 장부 내용)"""
+    snap = load_all(view)
+    resolution = load_member_resolution(view)
+    fuzzy = resolution.fuzzy()
+    if not (snap.errors or snap.bad_counts or len(resolution.unresolved) or len(fuzzy)): return
+    with st.expander("🧾 시트 점검 (관리자)"):
+        for name, error in snap.errors.items():
+            st.error(f"{SHEET_LABELS.get(name, name)}: {error}")
+        for name, count in snap.bad_counts.items():
+            bad = snap.bad_rows[name]
+            st.markdown(f"**{SHEET_LABELS.get(name, name)}** {count:,}행" + (f" (앞 {len(bad):,}행 표시)" if len(bad) < count else ""))
+            st.dataframe(bad, hide_index=True)
+        if len(resolution.unresolved):
+            unresolved = resolution.unresolved
+            st.markdown(f"**회원에 맞추지 못한 장부 내용** {len(unresolved):,}건 · {resolution.unresolved_count:,}행 · "
+                        f"{format_comma(unresolved['금액'].sum())}원 (회원별 합계에서 빠짐)")
+            st.dataframe(unresolved, hide_index=True)
+        if len(fuzzy):
+            st.markdown(f"**이름이 달라도 회원에 맞춘 장부 내용** {len(fuzzy):,}건 (확인용)")
+            st.dataframe(fuzzy, hide_index=True)
+
+
+def render_debug_panel(view):
+    """관리자 전용 성능 패널 (이번 실행 구간 / 프로세스 누적 집계 / 캐시 적중률 / 로그 내보내기)"""
+    trace = current_trace()
+    with st.expander("⏱️ 성능 (관리자)"):
+        if trace:
+            spans = trace["spans"]
+            elapsed = (time.time() - trace["started"]) * 1000
+            st.caption(f"이번 실행: {trace['page']} · 구간 {len(spans)}개 · 시작 후 {elapsed:.1f} ms")
+            st.dataframe([{"구간": name, "ms": round(ms, 2)} for name, ms in spans], hide_index=True)
+        st.markdown("**누적 구간 집계**")
+        st.dataframe(span_table(), hide_index=True)
+        st.markdown("**캐시 적중률**")
+        st.dataframe(cache_table(), hide_index=True)
+        source = get_source()
+        if source:
+            age = time.monotonic() - source.checked_at
+            st.markdown("**데이터 새로고침 (백그라운드)**")
+            st.caption(f"마지막 확인 {age:.0f}초 전 · 다음 확인까지 {source.next_delay():.0f}초 · "
+                       f"연속 연결 실패 {source.failures}회 · 데이터 기준 {load_all(view).loaded_at:%H:%M:%S}")
+            if st.button("🔄 지금 새로고침"):
+                source.request_refresh()
+        st.markdown("**데이터 메모리**")
+        st.dataframe(frame_memory(load_all(view).frames), hide_index=True)
+        st.markdown("**상조회별 메모리 (최근 사용 순)**")
+        st.dataframe(get_registry_table(), hide_index=True)
+        st.download_button("📥 로그 내려받기 (JSON Lines)", export_events(), file_name="perf.jsonl",
+                           mime="application/x-ndjson")
+
+
+def render_statement_export(view):
+    """관리자 전용 현황표 일괄 내보내기 (공유 집계를 그대로 넘겨 회원별 현황표 + 전체 현황을 zip 으로)"""
+    with st.expander("📦 현황표 일괄 내보내기 (관리자)"):
+        formats = list(STATEMENT_FORMATS) if has_xlsx() else ["html"]
+        fmt = st.radio("형식", formats, horizontal=True,
+                       format_func=lambda f: {"html": "HTML (인쇄/PDF 저장용)", "xlsx": "엑셀"}[f])
+        version, index, timeline, report = load_statement_inputs(view)
+        key = (version, fmt)
+        if st.button("현황표 만들기"):
+            bar = st.progress(0.0, text="현황표를 만드는 중...")
+            buffer = io.BytesIO()
+            with span("status.statements"):
+                count = export_statements(buffer, index, timeline, report, fmt,
+                                          progress=lambda done, total: bar.progress(done / total, text=f"{done}/{total} 묶음"))
+            bar.empty()
+            # 내려받기 버튼을 누르면 다시 실행되므로 만든 zip 은 세션에 둠 (데이터 버전/형식이 같을 때만)
+            st.session_state["statements"] = (key, buffer.getvalue(), count)
+        made = st.session_state.get("statements")
+        if made and made[0] == key:
+            st.download_button(f"📥 현황표 {made[2]:,}장 내려받기 (zip)", made[1],
+                               file_name=f"현황표_{time.strftime('%Y%m%d')}.zip", mime="application/zip")
+
+
+def personal_card(view, user_key, month_label, report):
+    # 가입월 최초 가입금 100,000원 + 이후 월 회비
+    return cached_render("personal_card", (load_all(view).version, user_key, month_label),
+                         lambda: personal_card_html(report.user, report.stats, report.dues["due"], month_label,
+                                                    report.dues["overdue"]), max_entries=512, view=view)
+
+
+def rules_page(view, query, page, df_rules, positions):
+    return cached_render("rules_page", (load_all(view).digests.get("rules", ""), query, page),
+                         lambda: rules_html(df_rules, positions, query, page), max_entries=256, view=view)
 
 
 # -----------------------------------------------------------------------------
@@ -280,8 +400,10 @@ def page_home():
 
 def page_personal():
     """회원 개인 현황"""
+    start_trace("personal")
     apply_theme_style("sub")
-    render_header_nav("🔒 회원 개인 현황")
+    view = load_view()  # 이 페이지의 모든 데이터는 같은 스냅샷에서
+    render_header_nav("🔒 회원 개인 현황", view)
     
     spacer_left, col_center, spacer_right = st.columns([1, 2, 1])
     with col_center:
@@ -302,290 +424,173 @@ def page_personal():
         user_id_input = st.text_input("아이디입력", placeholder="여기에 아이디를 입력하세요")
     
     if user_id_input:
-        df_members = load_data("members")
-        df_ledger = load_data("ledger")
-        
-        target_col = '아이디' if '아이디' in df_members.columns else '비밀번호'
-        user_info = df_members[df_members[target_col].astype(str).str.lower() == str(user_id_input).lower()]
+        # 아이디 → 개인 현황 (데이터가 바뀔 때만 다시 만드는 색인/타임라인 조회)
+        with span("personal.lookup"):
+            report = load_personal_report(user_id_input, view)
 
-        if not user_info.empty:
-            user = user_info.iloc[0]
-            user_name = user['성명']
-            st.success(f"환영합니다, {user_name} ({user['직책']})님!")
-            
-            today_date, months_passed = get_dues_calc_info()
-            
-            # 최초 가입금 100,000원
-            total_due_target = 100000 + (months_passed * 30000)
-            
-            my_deposit = 0; my_condolence_amt = 0; my_wreath_amt = 0
-            if not df_ledger.empty:
-                if '금액' in df_ledger.columns:
-                    df_ledger['금액'] = df_ledger['금액'].apply(safe_int)
-                    my_deposit = df_ledger[(df_ledger['구분'] == '입금') & (df_ledger['내용'] == user_name)]['금액'].sum()
-                    
-                    my_condolence_amt = df_ledger[(df_ledger['구분'] == '출금') & (df_ledger['분류'] == '상조금') & (df_ledger['내용'] == user_name)]['금액'].sum()
-                    my_wreath_amt = df_ledger[(df_ledger['구분'] == '출금') & (df_ledger['분류'] == '근조화환') & (df_ledger['내용'] == user_name)]['금액'].sum()
-
-            unpaid = total_due_target - my_deposit
-            condolence_count = int(my_condolence_amt / 1000000) if my_condolence_amt > 0 else 0
-            
+        if report:
+            user = report.user
+            st.success(f"환영합니다, {user['성명']} ({user['직책']})님!")
+
+            # 현황표 전체를 하나의 HTML 블록으로 (데이터 버전별 캐시)
             st.divider()
-            st.subheader(f"📋 {user_name}님의 현황표")
-            prev_month_date = today_date - relativedelta(months=1)
-            st.caption(f"기준월: {prev_month_date.strftime('%Y년 %m월')}")
-            
-            col_list1, col_list2 = st.columns(2)
-            with col_list1:
-                st.write(f"**1. 성명:** {user_name}")
-                st.write(f"**2. 직책:** {user['직책']}")
-                st.write(f"**3. 가입일자:** {user['가입일자']}")
-            with col_list2:
-                st.write(f"**4. 조의횟수:** {condolence_count} 회")
-                st.write(f"**5. 조의금 수령액:** {format_comma(my_condolence_amt)} 원")
-                st.write(f"**6. 근조화환 수령액:** {format_comma(my_wreath_amt)} 원")
-            
-            st.write("---")
-            st.write("**7. 미납금 현황**")
-            st.markdown(f"- **총 납부해야 할 회비:** {format_comma(total_due_target)} 원")
-            st.markdown(f"- **실제 납부한 회비:** {format_comma(my_deposit)} 원")
-            
-            if unpaid > 0: st.error(f"👉 **미납액: {format_comma(unpaid)} 원**")
-            elif unpaid == 0: st.success("👉 **완납** 상태입니다.")
-            else: st.info(f"👉 **선납액: {format_comma(abs(unpaid))} 원**")
+            with span("personal.render"):
+                st.markdown(personal_card(view, normalize_id(user_id_input), report.month_label, report),
+                            unsafe_allow_html=True)
+
+            if report.has_history:
+                # 펼쳤을 때만 월별 내역을 만들어 그림 (조회 자체는 색인/타임라인 조회만)
+                history = st.expander("📅 월별 납부 내역", key="personal_history", on_change="rerun")
+                if history.open:
+                    with history:
+                        show_table(report.history.iloc[::-1], money=["납부할금액", "납부한금액", "누적미납액"])
         else:
             with col_center:
                 st.error("일치하는 아이디가 없습니다. 다시 확인해주세요.")
-    render_footer_div()
+    render_footer_div(view)
 
 
 def page_all_status():
     """회원 전체 현황"""
+    start_trace("status")
     apply_theme_style("sub")
-    render_header_nav("📊 회원전체현황")
+    view = load_view()  # 이 페이지의 모든 데이터는 같은 스냅샷에서
+    render_header_nav("📊 회원전체현황", view)
     
-    df_members = load_data("members")
-    df_ledger = load_data("ledger")
-    df_assets = load_data("assets")
-    
-    if not df_ledger.empty:
-        if '구분' in df_ledger.columns: df_ledger['구분'] = df_ledger['구분'].astype(str).str.strip()
-        if '분류' in df_ledger.columns: df_ledger['분류'] = df_ledger['분류'].astype(str).str.strip()
-        if '금액' in df_ledger.columns: df_ledger['금액'] = df_ledger['금액'].apply(safe_int)
-
-    asset_name_col = None; asset_amount_col = None
-    if not df_assets.empty:
-        for col in ['항목', '자산명', '자산', '계좌명', '구분', '내용', 'Asset']:
-            if col in df_assets.columns: asset_name_col = col; break
-        for col in ['금액', '잔액', '평가액', '자산금액', 'Amount']:
-            if col in df_assets.columns: asset_amount_col = col; break
-        if asset_amount_col:
-            df_assets[asset_amount_col] = df_assets[asset_amount_col].apply(safe_int)
-
-    tab1, tab2, tab3 = st.tabs(["분석적검토", "자산 현황", "이자 분석"])
-    
-    _, months_passed = get_dues_calc_info()
-    total_due_target_per_person = 100000 + (months_passed * 30000)
+    # 데이터 버전마다 한 번만 계산되어 모든 세션이 공유하는 집계
+    with span("status.report"):
+        report = load_status_report(view)
+    df_assets = report.assets
+    _, asset_amount_col = find_asset_columns(df_assets)
+
+    tab1, tab2, tab3, tab4 = st.tabs(["분석적검토", "자산 현황", "이자 분석", "지출 추이"])
     
-    with tab1:
+    with tab1, span("status.render.review"):
         # [1] 전체 입금액
-        total_paid_sum = 0
-        df_display = pd.DataFrame()
-        
-        if not df_members.empty and not df_ledger.empty:
-            analysis_data = []
-            for index, row in df_members.iterrows():
-                name = row['성명']
-                paid_total = 0
-                if '금액' in df_ledger.columns:
-                    paid_total = df_ledger[(df_ledger['구분'] == '입금') & (df_ledger['내용'] == name)]['금액'].sum()
-                unpaid = total_due_target_per_person - paid_total
-                note = "미납" if unpaid > 0 else ("선납" if unpaid < 0 else "완납")
-                analysis_data.append({
-                    "회원명": name, 
-                    "A.납부할금액": total_due_target_per_person, 
-                    "B.납부한금액": paid_total, 
-                    "차이금액(=A-B)": unpaid, 
-                    "상태": note
-                })
-            df_analysis = pd.DataFrame(analysis_data)
-            total_due = df_analysis['A.납부할금액'].sum()
-            total_paid_sum = df_analysis['B.납부한금액'].sum()
-            total_diff = df_analysis['차이금액(=A-B)'].sum()
-            
-            total_row = pd.DataFrame([{
-                "회원명": "합계",
-                "A.납부할금액": total_due,
-                "B.납부한금액": total_paid_sum,
-                "차이금액(=A-B)": total_diff,
-                "상태": "-"
-            }])
-            df_display = pd.concat([df_analysis, total_row], ignore_index=True)
-            
-            st.subheader(f"1. 전체 입금내역 분석 : {format_comma(total_paid_sum)} 원")
-            cols_to_comma = ["A.납부할금액", "B.납부한금액", "차이금액(=A-B)"]
-            for col in cols_to_comma:
-                df_display[col] = df_display[col].apply(format_comma)
-            st.dataframe(df_display, use_container_width=True, hide_index=True)
+        if report.analysis is not None:
+            st.subheader(f"1. 전체 입금내역 분석 : {format_comma(report.total_paid)} 원")
+            show_table(report.analysis, money=[COL_DUE, COL_PAID, COL_DIFF])
         else:
             st.warning("데이터가 없습니다.")
             
         st.divider()
         
         # [2] 지출액
-        exp_total = 0
-        df_exp = pd.DataFrame()
-        
-        if '금액' in df_ledger.columns:
-            exp_condolence = df_ledger[(df_ledger['구분'] == '출금') & (df_ledger['분류'] == '상조금')]['금액'].sum()
-            exp_wreath = df_ledger[(df_ledger['구분'] == '출금') & (df_ledger['분류'] == '근조화환')]['금액'].sum()
-            exp_meeting = df_ledger[(df_ledger['구분'] == '출금') & (df_ledger['분류'] == '회의비외')]['금액'].sum()
-            exp_savings = df_ledger[(df_ledger['구분'] == '출금') & (df_ledger['분류'] == '적금')]['금액'].sum()
-            
-            # 합계에 적금 포함
-            exp_total = exp_condolence + exp_wreath + exp_meeting + exp_savings
-            
-            exp_data = {
-                "지출 항목": ["(1) 조의금", "(2) 근조화환", "(3) 회의비등", "(4) 적금", "(5) 합계"],
-                "내용 설명": [
-                    "조의건당 1백만원", 
-                    "조의건당 1십만원", 
-                    "상조기 및 모임식대, 각종소포품 등", 
-                    "최초적금가입원금", 
-                    "=(1)+(2)+(3)+(4)"
-                ],
-                "금액": [exp_condolence, exp_wreath, exp_meeting, exp_savings, exp_total]
-            }
-            df_exp = pd.DataFrame(exp_data)
-            df_exp['금액'] = df_exp['금액'].apply(format_comma)
-
-        st.subheader(f"2. 회비통장지출액 : {format_comma(exp_total)} 원")
-        if '금액' in df_ledger.columns:
-            st.dataframe(df_exp, use_container_width=True, hide_index=True)
+        st.subheader(f"2. 회비통장지출액 : {format_comma(report.exp_total)} 원")
+        if report.expenses is not None:
+            show_table(report.expenses, money=['금액'])
         
         st.divider()
 
         # [3] 분석적 검토
-        real_balance = 0
-        if asset_amount_col and asset_name_col:
-            try: 
-                mask = df_assets[asset_name_col].str.contains('회비통장', na=False)
-                if mask.any(): real_balance = df_assets[mask][asset_amount_col].iloc[0]
-            except: pass
-        
-        val_a = total_paid_sum - exp_total # 장부상 잔액
-        val_b = real_balance # 실제 통장 잔액
-        
-        diff_final = val_b - val_a
-        
-        review_data = {
-            "구분": ["A. 실제 통장 잔액", "B. 장부상 잔액", "차이 (A-B)"],
-            "산출 근거": [
-                "회비통장실제잔액",
-                "전체 입금액 합계 - 회비통장 지출 총계",
-                "이자수익 및 적금불입액 등 차이"
-            ],
-            "금액": [val_b, val_a, diff_final]
-        }
-        df_review = pd.DataFrame(review_data)
-        df_review['금액'] = df_review['금액'].apply(format_comma)
+        st.subheader(f"3. 분석적검토 (차이: {format_comma(report.review_diff)} 원)")
+        show_table(report.review, money=['금액'])
+
+        st.divider()
 
-        st.subheader(f"3. 분석적검토 (차이: {format_comma(diff_final)} 원)")
-        st.dataframe(df_review, use_container_width=True, hide_index=True)
+        # [4] 잔액 대사: 기준일마다 장부 누적 잔액 vs 통장 잔액, 차이가 생긴 기간의 거래
+        rec = report.reconciliation
+        st.subheader(f"4. 잔액 대사 (기준일 {len(rec.snapshots)}개, 허용 범위 {format_comma(rec.config.tolerance)} 원"
+                     f" + 연 {rec.config.interest_rate:.2%} 예상 이자)")
+        if len(rec.snapshots):
+            show_table(rec.snapshots, money=['통장 잔액', '장부 잔액', '차이', '예상 이자', '기간 입금', '기간 출금', '차이 변동'])
+        if len(rec.balance) > 1:
+            st.line_chart(rec.balance)
+        if rec.flagged_count:
+            shown = f" (앞 {len(rec.flagged):,}건 표시)" if len(rec.flagged) < rec.flagged_count else ""
+            st.markdown(f"**확인할 거래** {rec.flagged_count:,}건{shown}")
+            show_table(rec.flagged, money=['금액', '장부 잔액'])
+        if rec.undated:
+            st.caption(f"거래일시가 없는 장부 {rec.undated:,}행은 누적 잔액에서 빠졌습니다.")
 
         st.divider()
-        st.subheader("4. 결론")
-        st.markdown("""<div class="conclusion-box">차이금액은 회비통장의 이자수익 등 미반영으로 차이 발생분으로 중요성관점에서 문제없음</div>""", unsafe_allow_html=True)
+        st.subheader("5. 결론")
+        st.markdown(f"<div class='conclusion-box{'' if rec.ok else ' warn'}'>{html.escape(rec.conclusion())}</div>",
+                    unsafe_allow_html=True)
 
-    with tab2:
+    with tab2, span("status.render.assets"):
         st.subheader("보유 자산")
         if not df_assets.empty:
-            total_asset_val = 0
+            # 0/빈 값은 공란으로, 금액은 숫자 그대로 서식만 적용
+            show_table(blank_zeros(df_assets), money=[asset_amount_col] if asset_amount_col else [])
             if asset_amount_col:
-                if asset_name_col:
-                    mask = ~df_assets[asset_name_col].astype(str).str.contains('합계', na=False)
-                    total_asset_val = df_assets[mask][asset_amount_col].sum()
-                else:
-                    total_asset_val = df_assets[asset_amount_col].sum()
-                
-                df_assets_disp = df_assets.copy()
-                df_assets_disp[asset_amount_col] = df_assets_disp[asset_amount_col].apply(format_comma)
-                
-                df_assets_disp = df_assets_disp.astype(str)
-                df_assets_disp = df_assets_disp.replace({'None': '', 'nan': '', '0': '', '0.0': ''}, regex=False)
-                
-                st.dataframe(df_assets_disp, use_container_width=True, hide_index=True)
-                st.metric("총 자산", f"{format_comma(total_asset_val)} 원")
-            else:
-                df_assets_disp = df_assets.astype(str).replace({'None': '', 'nan': '', '0': '', '0.0': ''}, regex=False)
-                st.dataframe(df_assets_disp, use_container_width=True, hide_index=True)
+                st.metric("총 자산", f"{format_comma(report.total_assets)} 원")
         else:
             st.warning("자산 데이터를 불러오지 못했습니다.")
 
-    with tab3:
-        if not df_ledger.empty and not df_assets.empty and asset_amount_col and asset_name_col and '금액' in df_ledger.columns:
+    with tab3, span("status.render.interest"):
+        if report.savings_ledger is not None:
+            st.subheader(f"1. 적금가입원금 : {format_comma(report.savings_principal)} 원")
             
-            target_ledger = df_ledger[df_ledger['분류'] == '적금'].copy()
-            principal_sum = target_ledger['금액'].sum()
-            
-            st.subheader(f"1. 적금가입원금 : {format_comma(principal_sum)} 원")
-            
-            if not target_ledger.empty:
-                df_disp_ledger = pd.DataFrame()
-                df_disp_ledger['거래일시'] = target_ledger['거래일시']
-                df_disp_ledger['금액'] = target_ledger['금액'].apply(format_comma)
-                df_disp_ledger['내용'] = "적금원금"
-                st.dataframe(df_disp_ledger, use_container_width=True, hide_index=True)
+            if not report.savings_ledger.empty:
+                show_table(report.savings_ledger, money=['금액'])
             else:
                 st.info("적금 가입 내역이 없습니다.")
             
             st.divider()
             
-            target_assets = df_assets[df_assets[asset_name_col].str.contains('적금', na=False)].copy()
-            current_val_sum = target_assets[asset_amount_col].sum()
-            st.subheader(f"2. 적금통장가입액(평가액) : {format_comma(current_val_sum)} 원")
-            
-            bank_col = None
-            for col in ['은행', 'Bank', '금융기관', '은행명']:
-                if col in df_assets.columns: bank_col = col; break
-            
-            df_disp_assets = pd.DataFrame()
-            df_disp_assets['구분'] = target_assets[asset_name_col]
-            df_disp_assets['은행'] = target_assets[bank_col] if bank_col else '-'
-            df_disp_assets['잔액'] = target_assets[asset_amount_col].apply(format_comma)
-            st.dataframe(df_disp_assets, use_container_width=True, hide_index=True)
+            st.subheader(f"2. 적금통장가입액(평가액) : {format_comma(report.savings_value)} 원")
+            show_table(report.savings_assets, money=['잔액'])
 
             st.divider()
-            interest = current_val_sum - principal_sum
             st.subheader(f"3. 이자발생누적액(2-1)")
-            st.markdown(f"<div class='interest-box'>💰 {format_comma(interest)} 원</div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='interest-box'>💰 {format_comma(report.interest)} 원</div>", unsafe_allow_html=True)
             
             st.divider()
             st.subheader("4. 총평")
-            st.markdown("""<div class="conclusion-box">회비는 매우 투명하게 관리되고 있으며, 입출금내역 검토시 설명할 수 없는 내역은 존재하지 아니함. 매우 훌륭하다고 평가됨</div>""", unsafe_allow_html=True)
-    render_footer_div()
+            # 잔액 대사에서 설명할 수 없는 차이가 없을 때만 기존 총평
+            if report.reconciliation.ok:
+                st.markdown("""<div class="conclusion-box">회비는 매우 투명하게 관리되고 있으며, 입출금내역 검토시 설명할 수 없는 내역은 존재하지 아니함. 매우 훌륭하다고 평가됨</div>""", unsafe_allow_html=True)
+            else:
+                st.markdown("""<div class="conclusion-box warn">잔액 대사에서 확인할 차이가 있습니다. 분석적검토 탭의 잔액 대사를 참고하세요.</div>""", unsafe_allow_html=True)
+
+    with tab4, span("status.render.trend"):
+        # 장부 큐브에서 바로 꺼내므로 연도를 바꿔도 장부를 다시 훑지 않음
+        yearly = report.expense_trend
+        if yearly is not None and not yearly.empty:
+            st.subheader("1. 연도별 지출")
+            st.bar_chart(yearly)
+            show_table(yearly.assign(합계=yearly.sum(axis=1)).reset_index(), money=[*yearly.columns, '합계'])
+
+            st.divider()
+            year = st.selectbox("연도 선택", list(yearly.index)[::-1])
+            st.subheader(f"2. {year}년 월별 지출")
+            monthly = load_ledger_cube(view).trend('출금', 'M', year, year)
+            show_table(monthly.assign(합계=monthly.sum(axis=1)).reset_index(), money=[*monthly.columns, '합계'])
+        else:
+            st.info("거래일시가 있는 지출 내역이 없습니다.")
+    if is_admin():
+        render_statement_export(view)
+    render_footer_div(view)
 
 
 def page_rules():
     """회칙 페이지"""
+    start_trace("rules")
     apply_theme_style("sub")
-    render_header_nav("📜 회칙 및 규정")
-    df_rules = load_data("rules")
-    search_rule = st.text_input("규정 검색", placeholder="검색어를 입력하세요")
+    view = load_view()  # 이 페이지의 모든 데이터는 같은 스냅샷에서
+    render_header_nav("📜 회칙 및 규정", view)
+    df_rules = load_rules(view)
+    search_rule = st.text_input("규정 검색", placeholder="검색어를 입력하세요 (초성 검색 가능: ㅅㅈㄱ)")
     
     if not df_rules.empty:
+        # 회칙 시트가 바뀔 때만 만드는 색인으로 검색 (정확도 순)
+        with span("rules.search"):
+            hits = load_rule_index(view).search(search_rule) if search_rule else [(pos, 0) for pos in range(len(df_rules))]
+        positions = [pos for pos, _ in hits]
         if search_rule:
-            df_rules = df_rules[df_rules['내용'].str.contains(search_rule) | df_rules['조항'].str.contains(search_rule)]
+            st.caption(f"검색 결과 {len(hits)}건")
         
-        for idx, row in df_rules.iterrows():
-            article = row.get('조항', '')
-            title = row.get('제목', row.get('항목', ''))
-            header_text = f"{article}({title})" if title and str(title).lower() != 'nan' else article
-            
-            st.markdown(f"<div class='rule-header' style='font-weight:bold; font-size:1.1rem; color:#fff; margin-top:10px;'>{header_text}</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='rule-content' style='color:#e0e0e0; margin-bottom:10px;'>{row.get('내용', '-')}</div>", unsafe_allow_html=True)
-            st.divider()
-    render_footer_div()
+        # 조항 목록은 페이지 단위로 하나의 HTML 블록으로 전송
+        page = 1
+        n_pages = page_count(len(positions))
+        if n_pages > 1:
+            page = st.number_input(f"페이지 (전체 {n_pages})", min_value=1, max_value=n_pages, value=1,
+                                   step=1, key=f"rules_page_{search_rule}")
+        with span("rules.render"):
+            st.markdown(rules_page(view, search_rule, page, df_rules, positions),
+                        unsafe_allow_html=True)
+    render_footer_div(view)
 
 
 # -----------------------------------------------------------------------------
@@ -597,4 +602,8 @@ personal = st.Page(page_personal, title="회원개인현황", url_path="personal
 rules = st.Page(page_rules, title="회칙", url_path="rules")
 
 pg = st.navigation([home, status, personal, rules], position="hidden")
+if club is None and len(get_clubs()) > 1:
+    # 여러 상조회를 서비스할 때는 주소(?club=아이디)로 상조회를 골라야 함
+    st.error("상조회를 찾을 수 없습니다. 안내받은 주소(…?club=아이디)로 다시 접속해 주세요.")
+    st.stop()
 pg.run()
@@ -0,0 +1,38 @@
+# -----------------------------------------------------------------------------
+# 표 표시 (숫자는 숫자 그대로, 서식은 화면에서)
+# -----------------------------------------------------------------------------
+# 금액 컬럼을 format_comma 로 문자열로 바꾸지 않고 숫자 그대로 st.dataframe 에 넘기고,
+# 천 단위 콤마는 column_config.NumberColumn 이 브라우저에서 붙인다.
+#   - 셀마다 파이썬 함수 호출/문자열 복사본이 없고
+#   - 표에서 금액 정렬이 숫자 순으로 된다
+# 자산 표의 '0/빈 값은 공란' 규칙도 문자열 치환 대신 벡터 마스크로 처리한다.
+import pandas as pd
+import streamlit as st
+
+MONEY_FORMAT = "localized"   # 사용자 언어 기준 천 단위 구분 (한국어: 1,000,000)
+BLANK_TEXT = ['None', 'nan', '0', '0.0']
+
+
+def money_column(label=None):
+    return st.column_config.NumberColumn(label, format=MONEY_FORMAT)
+
+
+def show_table(df, money=(), **column_config):
+    """money 에 든 컬럼은 금액 서식으로 표시 (프레임은 복사/변환하지 않음)"""
+    config = {col: money_column() for col in money if col in df.columns}
+    config.update(column_config)
+    st.dataframe(df, column_config=config, use_container_width=True, hide_index=True)
+
+
+def blank_zeros(df):
+    """자산 표 표시용: 금액 0 과 빈 값/'0' 문자열은 공란으로 (숫자 컬럼은 숫자 유지)"""
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_integer_dtype(values):
+            out[col] = values.astype("Int64").mask(values.eq(0))   # 0 → 공란, 나머지는 정수 그대로
+        elif pd.api.types.is_numeric_dtype(values):
+            out[col] = values.mask(values.eq(0))
+        else:
+            out[col] = values.mask(values.isna() | values.isin(BLANK_TEXT), '')
+    return pd.DataFrame(out, index=df.index)
@@ -0,0 +1,244 @@
+# -----------------------------------------------------------------------------
+# 여러 상조회(테넌트)를 한 프로세스에서 서비스
+# -----------------------------------------------------------------------------
+# secrets.toml 의 [clubs.<아이디>] 마다 시트 주소/이름/메모리 한도를 두고, 주소의 ?club=<아이디> 로 고른다.
+#   [clubs.seoul]
+#   sheet_url = "https://docs.google.com/spreadsheets/d/.../edit"
+#   title = "서울 상조회"
+#   memory_mb = 256
+#   debug_token = "..."   # 이 상조회의 관리자 패널 (?club=seoul&debug=<토큰>), 다른 상조회에는 통하지 않음
+# 상조회마다 DataSource(정규화된 프레임) 와 AggregateCache(공유 집계) 를 따로 가지므로
+#   - 한 상조회가 메모리 한도(데이터 + 집계)를 넘으면 그 상조회의 오래 안 쓴 집계만 밀려나고
+#   - 메모리에 올린 상조회가 max_active 를 넘으면 가장 오래 안 쓴 상조회를 통째로 내린다
+#     (새로고침 스레드와 HTTP 세션 정지 + 메모리 해제 - 로컬 스냅샷은 남아서 다음 접속 때 바로 뜬다)
+# 테마 CSS / 배경 이미지 같은 정적 자원은 상조회와 무관하게 프로세스에서 한 번만 만든다.
+# [clubs] 가 없으면 기존처럼 [connections] sheet_url 하나를 기본 상조회로 쓴다 (관리자 토큰은 [admin] debug_token).
+# streamlit 에 의존하지 않는다 (소스 생성/집계 계산은 data.py 가 넘겨줌).
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CLUB = "default"
+CLUB_PARAM = "club"           # 상조회를 고르는 주소 파라미터 (?club=<아이디>)
+MAX_ACTIVE = 8                # 메모리에 올려 두는 상조회 수
+TENANT_MEMORY_MB = 256        # 상조회 하나의 기본 메모리 한도 (데이터 + 집계)
+AGGREGATE_VERSIONS = 2        # 집계 종류별 보관 항목 수 (현재 + 바꿔 끼우기 직전의 이전 버전)
+
+
+@dataclass(frozen=True)
+class Club:
+    club_id: str
+    sheet_url: str
+    title: str = ""
+    memory_mb: int = TENANT_MEMORY_MB
+    debug_token: str = ""         # 관리자 패널 토큰 (없으면 관리자 패널 없음)
+
+
+def load_clubs(secrets):
+    """secrets → {아이디: Club} ([clubs.<아이디>] 들, 없으면 [connections] sheet_url 하나를 기본 상조회로)"""
+    clubs = {}
+    for club_id, conf in (secrets.get("clubs") or {}).items():
+        if not conf.get("sheet_url"): continue
+        clubs[str(club_id)] = Club(str(club_id), conf["sheet_url"], conf.get("title", ""),
+                                   int(conf.get("memory_mb", TENANT_MEMORY_MB)), str(conf.get("debug_token", "")))
+    if not clubs:
+        sheet_url = (secrets.get("connections") or {}).get("sheet_url", "")
+        token = str((secrets.get("admin") or {}).get("debug_token", ""))
+        if sheet_url: clubs[DEFAULT_CLUB] = Club(DEFAULT_CLUB, sheet_url, debug_token=token)
+    return clubs
+
+
+def approx_size(obj, _seen=None):
+    """객체의 대략적인 메모리 (프레임/배열은 실제 크기, 나머지는 sys.getsizeof 로 따라 내려감)"""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen: return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame): return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)): return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray): return obj.nbytes
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))): return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(approx_size(k, seen) + approx_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(approx_size(item, seen) for item in obj)
+    if is_dataclass(obj):
+        return sys.getsizeof(obj) + sum(approx_size(getattr(obj, f.name), seen) for f in fields(obj))
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + approx_size(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+def snapshot_bytes(snapshot):
+    """스냅샷 프레임 메모리 합계"""
+    return sum(int(df.memory_usage(deep=True).sum()) for df in snapshot.frames.values())
+
+
+class AggregateCache:
+    """상조회 하나의 공유 집계: (이름, 키) → 값
+
+    - 이름별로 max_entries 개까지 (넘으면 그 이름의 가장 오래 안 쓴 항목부터)
+    - 데이터(reserve 한 스냅샷 프레임) + 집계가 limit 을 넘으면 전체에서 가장 오래 안 쓴 항목부터 밀어냄
+    - 같은 항목을 여러 세션이 동시에 요청하면 한 번만 계산
+    """
+
+    def __init__(self, limit):
+        self.limit = limit            # 바이트
+        self.data_bytes = 0           # 현재 스냅샷 프레임 메모리 (한도에 포함)
+        self.size = 0                 # 집계 메모리
+        self.evictions = 0
+        self._items = OrderedDict()   # (이름, 키) → (값, 크기)
+        self._frame_ids = frozenset() # 집계가 들고 있어도 다시 세지 않을 프레임
+        self._lock = threading.Lock()
+        self._building = {}           # (이름, 키) → 계산 중 잠금
+
+    def __len__(self):
+        return len(self._items)
+
+    def _hit(self, item_key):
+        entry = self._items.get(item_key)
+        if entry is None: return None
+        self._items.move_to_end(item_key)
+        return entry
+
+    def get(self, name, key, build, max_entries=AGGREGATE_VERSIONS):
+        item_key = (name, key)
+        with self._lock:
+            entry = self._hit(item_key)
+            if entry is not None: return entry[0]
+            building = self._building.setdefault(item_key, threading.Lock())
+        with building:
+            with self._lock:
+                entry = self._hit(item_key)
+                if entry is not None: return entry[0]
+            try:
+                value = build()
+                with self._lock:
+                    size = approx_size(value, set(self._frame_ids))
+                    self._items[item_key] = (value, size)
+                    self.size += size
+                    self._evict(name, max_entries, keep=item_key)
+            finally:
+                with self._lock:
+                    self._building.pop(item_key, None)
+        return value
+
+    def reserve(self, snapshot):
+        """스냅샷 프레임 메모리를 한도에 넣음 (넘으면 오래 안 쓴 집계부터 밀어냄)"""
+        frame_ids = frozenset(id(df) for df in snapshot.frames.values())
+        with self._lock:
+            if frame_ids == self._frame_ids: return
+        data_bytes = snapshot_bytes(snapshot)
+        with self._lock:
+            self.data_bytes, self._frame_ids = data_bytes, frame_ids
+            self._shrink()
+
+    def _drop(self, item_key):
+        _, size = self._items.pop(item_key)
+        self.size -= size
+        self.evictions += 1
+
+    def _shrink(self, keep=None):
+        budget = self.limit - self.data_bytes
+        for item_key in list(self._items):
+            if self.size <= budget: break
+            if item_key != keep: self._drop(item_key)
+
+    def _evict(self, name, max_entries, keep):
+        same = [k for k in self._items if k[0] == name]
+        for item_key in same[:max(len(same) - max_entries, 0)]:
+            self._drop(item_key)
+        self._shrink(keep)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+class Tenant:
+    """상조회 하나: 데이터 소스 + 공유 집계 캐시"""
+
+    def __init__(self, club):
+        self.club = club
+        self.source = None
+        self.aggregates = AggregateCache(club.memory_mb * 2**20)
+        self.last_used = time.time()
+
+    @property
+    def data_bytes(self):
+        return self.aggregates.data_bytes
+
+    def attach(self, source):
+        self.source = source
+        source.subscribe(self._on_swap)
+
+    def prepare(self, snapshot, warm):
+        """바꿔 끼울 스냅샷의 프레임을 먼저 한도에 넣고 warm(집계 캐시, 스냅샷) 으로 집계를 미리 계산"""
+        self.aggregates.reserve(snapshot)
+        warm(self.aggregates, snapshot)
+
+    def _on_swap(self, old, new):
+        self.aggregates.reserve(new)   # prepare 없이 바뀐 경우 (처음 읽기, 로컬 스냅샷)
+
+    def close(self):
+        if self.source is not None: self.source.close()
+        self.aggregates.clear()
+
+
+class TenantRegistry:
+    """상조회 아이디 → Tenant (최근 사용 순, max_active 를 넘으면 가장 오래 안 쓴 상조회를 내림)
+
+    make_source(tenant): 상조회의 DataSource 생성 (집계를 미리 계산할 tenant 를 받음)
+    """
+
+    def __init__(self, clubs, make_source, max_active=MAX_ACTIVE):
+        self.clubs = clubs
+        self.make_source = make_source
+        self.max_active = max_active
+        self.evictions = 0
+        self._active = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, club_id):
+        """상조회 아이디 → Tenant (처음이면 데이터 소스를 만듦) / 없는 아이디면 None"""
+        club = self.clubs.get(club_id)
+        if club is None: return None
+        evicted = []
+        with self._lock:
+            tenant = self._active.get(club_id)
+            if tenant is None:
+                tenant = Tenant(club)
+                tenant.attach(self.make_source(tenant))
+                self._active[club_id] = tenant
+                while len(self._active) > self.max_active:
+                    evicted.append(self._active.popitem(last=False)[1])
+                    self.evictions += 1
+            self._active.move_to_end(club_id)
+            tenant.last_used = time.time()
+        for old in evicted: old.close()
+        return tenant
+
+    def active(self):
+        with self._lock:
+            return list(self._active.values())
+
+    def close(self):
+        with self._lock:
+            tenants, self._active = list(self._active.values()), OrderedDict()
+        for tenant in tenants: tenant.close()
+
+    def table(self):
+        """상조회별 메모리/집계 현황 → [dict] (최근 사용 순)"""
+        rows = []
+        for tenant in reversed(self.active()):
+            cache = tenant.aggregates
+            rows.append({"상조회": tenant.club.club_id, "데이터MB": round(tenant.data_bytes / 2**20, 2),
+                         "집계MB": round(cache.size / 2**20, 2), "한도MB": tenant.club.memory_mb,
+                         "집계 수": len(cache), "밀려난 집계": cache.evictions,
+                         "마지막 사용": time.strftime("%H:%M:%S", time.localtime(tenant.last_used))})
+        return rows
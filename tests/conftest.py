@@ -0,0 +1,5 @@
+# 저장소 최상위의 모듈(flat layout)을 tests/ 에서 import 할 수 있게
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
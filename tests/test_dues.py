@@ -0,0 +1,24 @@
+import pandas as pd
+
+from dues import DUES_COLUMNS, INITIAL_FEE, MONTHLY_FEE, compute_dues_table, lookup_member_dues
+from dues_timeline import as_of_month, build_timeline
+
+MEMBERS = pd.DataFrame({'성명': ['김철수', '박영희', '이민호']})
+LEDGER = pd.DataFrame({'구분': ['입금', '입금', '입금', '출금'], '분류': ['회비', '회비', '회비', '회의비외'],
+                       '내용': ['김철수', '박영희님', '이민호', '김철수'],
+                       '금액': [INITIAL_FEE + MONTHLY_FEE, INITIAL_FEE, INITIAL_FEE + 2 * MONTHLY_FEE, 50000]})
+
+
+def test_dues_table():
+    table = compute_dues_table(build_timeline(MEMBERS, LEDGER, as_of_month(1)))
+    assert list(table.columns) == DUES_COLUMNS
+    # '박영희님' 입금도 이름 해석표로 박영희에게, 출금은 제외
+    assert table['B.납부한금액'].tolist() == [130000, 100000, 160000]
+    assert table['상태'].tolist() == ['완납', '미납', '선납']
+
+
+def test_lookup_member_dues():
+    timeline = build_timeline(MEMBERS, LEDGER, as_of_month(1))
+    dues = lookup_member_dues(timeline, '박영희')
+    assert (dues['due'], dues['paid'], dues['unpaid'], dues['status']) == (130000, 100000, 30000, '미납')
+    assert lookup_member_dues(timeline, '없는사람') is None
@@ -0,0 +1,68 @@
+import pandas as pd
+
+from dues import INITIAL_FEE, MONTHLY_FEE, total_due_target
+from dues_timeline import RATE_SCHEDULE, as_of_month, build_timeline, load_rate_schedule, monthly_rates, tally_paid
+from member_resolve import MemberResolver, member_names
+
+MEMBERS = pd.DataFrame({'성명': ['김철수', '박영희'], '가입일자': ['', '2020-04-10']})
+LEDGER = pd.DataFrame({'거래일시': pd.to_datetime(['2020-02-10', '2020-05-01']), '구분': '입금',
+                       '분류': '회비', '내용': ['김철수', '박영희'], '금액': [100000, 130000]})
+
+
+def test_rates_before_first_schedule_entry():
+    months = pd.period_range('2020-02', '2020-06', freq='M')
+    rates = monthly_rates(months, (('2020-04', 40000),))
+    assert rates.tolist() == [MONTHLY_FEE, MONTHLY_FEE, 40000, 40000, 40000]
+
+
+def test_rate_changes():
+    months = pd.period_range('2020-02', '2020-04', freq='M')
+    assert monthly_rates(months, (('2020-02', 30000), ('2020-04', 40000))).tolist() == [30000, 30000, 40000]
+
+
+def test_timeline_with_schedule():
+    timeline = build_timeline(MEMBERS, LEDGER, as_of_month(4), (('2020-05', 40000),))
+    # 2020-02 가입금, 03·04 기본 월 회비, 05·06 변경된 월 회비
+    assert timeline.due_from_start == INITIAL_FEE + 2 * MONTHLY_FEE + 2 * 40000
+    assert timeline.due_total.tolist() == [timeline.due_from_start, INITIAL_FEE + 2 * 40000]
+    assert timeline.paid_total.tolist() == [100000, 130000]
+
+
+def test_default_schedule_matches_flat_fee():
+    timeline = build_timeline(MEMBERS, LEDGER, as_of_month(12))
+    assert timeline.due_from_start == total_due_target(12)
+
+
+def test_load_rate_schedule():
+    assert load_rate_schedule({}) == RATE_SCHEDULE
+    assert load_rate_schedule({"dues": {"rates": {"2024-01": "40000", "2020-02": 30000}}}) == \
+        (("2020-02", 30000), ("2024-01", 40000))
+
+
+def test_tally_in_parts_matches_whole():
+    resolver = MemberResolver(member_names(MEMBERS))
+    whole = tally_paid(resolver.names, resolver.member_ids(LEDGER), LEDGER)
+    first, rest = LEDGER.iloc[:1], LEDGER.iloc[1:]
+    parts = tally_paid(resolver.names, resolver.member_ids(first), first)
+    parts = tally_paid(resolver.names, resolver.member_ids(rest), rest, base=parts)
+    assert (parts.paid == whole.paid).all()
+    # 2020-02 ~ 2020-05 (장부의 마지막 달까지)
+    assert whole.paid.tolist() == [[100000, 0, 0, 0], [0, 0, 0, 130000]]
+
+
+def test_timeline_uses_paid_totals():
+    resolver = MemberResolver(member_names(MEMBERS))
+    totals = tally_paid(resolver.names, resolver.member_ids(LEDGER), LEDGER)
+    # 장부를 다시 훑지 않고 합계를 씀 (빈 장부를 넘겨도 같은 결과)
+    timeline = build_timeline(MEMBERS, LEDGER.iloc[:0], as_of_month(2), paid_totals=totals)
+    rescanned = build_timeline(MEMBERS, LEDGER, as_of_month(2))
+    # 기준월(2020-04) 뒤의 입금은 마지막 달로
+    assert (timeline.paid == rescanned.paid).all()
+    assert timeline.paid.tolist() == [[100000, 0, 0], [0, 0, 130000]]
+
+
+def test_timeline_ignores_totals_for_other_members():
+    resolver = MemberResolver(member_names(MEMBERS.iloc[:1]))
+    totals = tally_paid(resolver.names, resolver.member_ids(LEDGER), LEDGER)
+    timeline = build_timeline(MEMBERS, LEDGER, as_of_month(4), paid_totals=totals)
+    assert timeline.paid_total.tolist() == [100000, 130000]
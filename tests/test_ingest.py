@@ -0,0 +1,76 @@
+import io
+
+import pandas as pd
+import pytest
+
+from ingest import concat_chunks, read_sheet
+from schema import SchemaError
+
+HEADER = "거래일시,구분,분류,내용,금액\n"
+
+
+def read(text, chunksize=2, sheet="ledger"):
+    return read_sheet(sheet, io.BytesIO(text.encode()), chunksize=chunksize)
+
+
+def test_missing_required_column():
+    with pytest.raises(SchemaError, match="금액"):
+        read("거래일시,구분,분류,내용\n2024-01-01,입금,회비,김철수\n")
+    with pytest.raises(SchemaError):
+        read("")
+
+
+def test_extra_fields_are_reported_and_dropped():
+    result = read(HEADER + "2024-01-01,입금,회비,김철수,30000\n"
+                           "2024-01-02,입금,회비,박영희,30000,메모\n"
+                           "2024-01-03,입금,회비,이영수,30000\n")
+    assert result.rows == 3 and result.bad_count == 1
+    assert result.frame['내용'].astype(str).tolist() == ['김철수', '이영수']
+    bad = result.bad_rows.iloc[0]
+    assert (bad['행'], bad['값']) == (3, '메모') and '컬럼 수 초과' in bad['사유']
+
+
+def test_bad_amounts_and_dates_are_counted():
+    result = read(HEADER + "2024-01-01,입금,회비,김철수,\"30,000\"\n"
+                           "어제,입금,회비,박영희,삼만원\n"
+                           "2024-01-03,입금,회비,이영수,30000\n"
+                           "2024-01-04,송금,회비,최민수,1000\n")
+    assert result.frame['금액'].tolist() == [30000, 0, 30000, 1000]
+    assert result.frame['거래일시'].isna().tolist() == [False, True, False, False]
+    assert result.bad_count == 3
+    reasons = result.bad_rows.set_index('컬럼')['사유']
+    assert '금액 형식 오류' in reasons['금액'] and '날짜 형식 오류' in reasons['거래일시']
+    assert reasons['구분'] == '허용되지 않는 값'
+    assert result.bad_rows['행'].tolist() == sorted(result.bad_rows['행'])
+
+
+def test_categories_are_unioned_across_chunks():
+    result = read(HEADER + "2024-01-01,입금,회비,김철수,1\n"
+                           "2024-01-02,입금,회비,박영희,1\n"
+                           "2024-01-03,출금,상조금,이영수,1\n"
+                           "2024-01-04,출금,근조화환,김철수,1\n"
+                           "2024-01-05,입금,회비,최민수,1\n", chunksize=2)
+    frame = result.frame
+    assert isinstance(frame['내용'].dtype, pd.CategoricalDtype)
+    assert list(frame['내용'].cat.categories) == sorted(['김철수', '박영희', '이영수', '최민수'])
+    assert frame['내용'].astype(str).tolist() == ['김철수', '박영희', '이영수', '김철수', '최민수']
+    assert frame['분류'].astype(str).tolist() == ['회비', '회비', '상조금', '근조화환', '회비']
+    # 한 번에 읽은 결과와 같음
+    pd.testing.assert_frame_equal(frame, read(HEADER + "2024-01-01,입금,회비,김철수,1\n"
+                                                       "2024-01-02,입금,회비,박영희,1\n"
+                                                       "2024-01-03,출금,상조금,이영수,1\n"
+                                                       "2024-01-04,출금,근조화환,김철수,1\n"
+                                                       "2024-01-05,입금,회비,최민수,1\n", chunksize=100).frame)
+
+
+def test_concat_chunks_keeps_column_order():
+    a = pd.DataFrame({'내용': pd.Categorical(['가']), '금액': [1]})
+    b = pd.DataFrame({'내용': pd.Categorical(['나']), '금액': [2]})
+    merged = concat_chunks([a, b])
+    assert list(merged.columns) == ['내용', '금액']
+    assert merged['내용'].astype(str).tolist() == ['가', '나'] and merged['금액'].tolist() == [1, 2]
+
+
+def test_empty_sheet_keeps_header():
+    result = read(HEADER)
+    assert result.rows == 0 and result.frame.empty and list(result.frame.columns) == HEADER.strip().split(",")
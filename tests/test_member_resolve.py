@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from member_resolve import UNRESOLVED, resolve_members
+
+NAMES = ['김철수', '박영희', '이자영', '최민', '홍길동순', '남궁민수호']
+
+
+def resolve(values):
+    df_members = pd.DataFrame({'성명': NAMES})
+    df_ledger = pd.DataFrame({'구분': '입금', '분류': '회비', '내용': values, '금액': 30000})
+    return resolve_members(df_members, df_ledger)
+
+
+def matched(value):
+    resolution = resolve([value])
+    row = resolution.table.iloc[0]
+    return (row['성명'] or None), row['방법']
+
+
+@pytest.mark.parametrize("value, name, method", [
+    ('김철수', '김철수', '일치'),
+    ('김철수님', '김철수', '정규화'),
+    ('김철수(3월)', '김철수', '정규화'),
+    ('김 철수 3월분 회비', '김철수', '정규화'),
+    ('홍길동', '홍길동순', '앞부분'),           # 은행이 끝 글자를 잘라 낸 이름
+    ('남궁민수효', '남궁민수호', '유사'),       # 같은 길이의 오타 한 글자
+])
+def test_matches(value, name, method):
+    assert matched(value) == (name, method)
+
+
+@pytest.mark.parametrize("value", [
+    '이자',             # 이자 수입 - 이자영의 앞부분이지만 두 글자뿐
+    '최민수',           # 최민 + 다른 글자 - 꼬리말이 아님
+    '김철수 박영희',     # 두 사람 이름
+    '홍길',             # 성명보다 두 글자 짧음
+])
+def test_collisions_stay_unresolved(value):
+    name, _ = matched(value)
+    assert name is None
+
+
+def test_member_ids_and_unresolved():
+    resolution = resolve(['김철수님', '이자', '이자', '박영희'])
+    assert resolution.member_ids.tolist() == [0, UNRESOLVED, UNRESOLVED, 1]
+    assert resolution.unresolved_count == 2
+    assert resolution.unresolved.loc[0, '금액'] == 60000
@@ -0,0 +1,83 @@
+import io
+from datetime import datetime
+
+from dues_timeline import as_of_month, build_timeline
+from ingest import read_sheet
+from reconcile import ReconcileConfig, VERDICT_DRIFT, VERDICT_OK, reconcile
+from reports import build_status_report
+from store import DataSnapshot
+
+MEMBERS = "성명,아이디,직책,가입일자\n김철수,kim,회원,2020-02-01\n박영희,park,회원,2020-02-01\n"
+LEDGER = """거래일시,구분,분류,내용,금액
+2024-01-05 10:00:00,입금,회비,김철수,"1,000,000"
+2024-01-06 10:00:00,입금,회비,박영희,"1,000,000"
+2024-02-10 10:00:00,출금,회의비외,정기총회,"200,000"
+2024-03-10 10:00:00,출금,적금,적금가입,"500,000"
+"""
+
+
+def frame(name, text):
+    return read_sheet(name, io.BytesIO(text.encode())).frame
+
+
+def snapshot(assets):
+    return DataSnapshot({"members": frame("members", MEMBERS), "ledger": frame("ledger", LEDGER),
+                         "assets": frame("assets", assets), "rules": frame("rules", "조항,제목,내용\n")})
+
+
+def test_dated_snapshots():
+    assets = "항목,금액,기준일\n회비통장,\"2,000,000\",2024-01-31\n회비통장,\"1,800,000\",2024-02-29\n"
+    rec = reconcile(snapshot(assets).frames["ledger"], snapshot(assets).frames["assets"])
+    assert rec.snapshots['장부 잔액'].tolist() == [2_000_000, 1_800_000]
+    assert rec.snapshots['판정'].tolist() == [VERDICT_OK, VERDICT_OK]
+    assert rec.book_balance == 1_800_000 and rec.bank_balance == 1_800_000
+    assert rec.closing == 1_300_000
+
+
+def test_missing_transaction_flagged():
+    assets = "항목,금액,기준일\n회비통장,\"2,000,000\",2024-01-31\n회비통장,\"1,500,000\",2024-02-29\n"
+    snap = snapshot(assets)
+    rec = reconcile(snap.frames["ledger"], snap.frames["assets"], ReconcileConfig(tolerance=10_000))
+    assert rec.snapshots['판정'].tolist() == [VERDICT_OK, VERDICT_DRIFT]
+    assert rec.snapshots['차이 변동'].iloc[-1] == -300_000
+
+
+def test_review_uses_reconciled_book_balance():
+    # 기준일 없는 자산 시트: 장부 전체(적금 가입 출금 포함)와 맞춤
+    snap = snapshot("항목,금액\n회비통장,\"1,300,000\"\n적금통장,\"500,000\"\n")
+    members, ledger = snap.frames["members"], snap.frames["ledger"]
+    report = build_status_report(snap, 0, build_timeline(members, ledger, as_of_month(0)))
+    assert report.book_balance == report.reconciliation.book_balance == 1_300_000
+    assert report.real_balance == 1_300_000 and report.review_diff == 0
+    assert report.review['금액'].tolist() == [1_300_000, 1_300_000, 0]
+
+
+def test_expected_interest_is_not_a_mismatch():
+    # 1억원을 1년 두면 연 0.1% 예상 이자는 약 10만원 - 반기 이자 6만원이 붙은 통장 잔액은 일치
+    ledger = frame("ledger", '거래일시,구분,분류,내용,금액\n2024-01-01 00:00:00,입금,회비,김철수,"100,000,000"\n')
+    assets = frame("assets", "항목,금액,기준일\n회비통장,\"100,000,000\",2024-06-01\n회비통장,\"100,060,000\",2024-12-31\n")
+    rec = reconcile(ledger, assets, ReconcileConfig(interest_rate=0.001))
+    assert rec.snapshots['예상 이자'].iloc[-1] > 60_000
+    assert rec.snapshots['판정'].tolist() == [VERDICT_OK, VERDICT_OK]
+    assert rec.snapshots['차이'].iloc[-1] == 60_000        # 표의 차이는 그대로
+    # 이자를 빼지 않으면 허용 범위를 넘음
+    rec = reconcile(ledger, assets, ReconcileConfig(interest_rate=0))
+    assert rec.snapshots['판정'].tolist() == [VERDICT_OK, VERDICT_DRIFT]
+
+
+def test_interest_does_not_hide_missing_deposit():
+    ledger = frame("ledger", '거래일시,구분,분류,내용,금액\n2024-01-01 00:00:00,입금,회비,김철수,"1,000,000"\n')
+    assets = frame("assets", "항목,금액,기준일\n회비통장,\"1,030,000\",2024-12-31\n")
+    rec = reconcile(ledger, assets)
+    assert rec.snapshots['예상 이자'].iloc[0] == 1_003      # 100만원 × 366일 × 0.1%
+    assert rec.snapshots['판정'].iloc[0] == VERDICT_DRIFT
+
+
+def test_back_dated_report_uses_book_balance_at_that_date():
+    # 기준일 없는 통장 잔액은 보고서 기준일까지의 장부와 맞춤 (적금 가입 출금 전)
+    snap = snapshot("항목,금액\n회비통장,\"1,800,000\"\n")
+    members, ledger = snap.frames["members"], snap.frames["ledger"]
+    today = datetime(2024, 3, 1)
+    report = build_status_report(snap, 0, build_timeline(members, ledger, as_of_month(0)), today=today)
+    assert report.book_balance == 1_800_000 and report.review_diff == 0
+    assert build_status_report(snap, 0).book_balance == 1_300_000
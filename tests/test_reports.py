@@ -0,0 +1,35 @@
+import pandas as pd
+
+import dues_timeline
+from dues_timeline import as_of_month, build_timeline
+from member_index import build_member_index
+from reports import build_personal_report, personal_tables
+
+MEMBERS = pd.DataFrame({'성명': ['김철수', '박영희'], '아이디': ['kim', 'park'], '직책': ['회원', '총무'],
+                        '가입일자': ['', '2020-03-05']})
+LEDGER = pd.DataFrame({'거래일시': pd.to_datetime(['2020-02-10', '2020-03-10']), '구분': '입금', '분류': '회비',
+                       '내용': ['김철수', '박영희'], '금액': [130000, 100000]})
+
+
+def test_personal_lookup_builds_history_only_when_read(monkeypatch):
+    timeline = build_timeline(MEMBERS, LEDGER, as_of_month(1))
+    index = build_member_index(MEMBERS, LEDGER)
+    calls = []
+    history = dues_timeline.DuesTimeline.history
+    monkeypatch.setattr(dues_timeline.DuesTimeline, "history", lambda self, name: calls.append(name) or history(self, name))
+
+    report = build_personal_report(index, timeline, 'PARK')
+    assert report.dues['due'] == 100000 and report.dues['status'] == '완납'
+    assert report.has_history and calls == []
+
+    assert report.history['월'].tolist() == ['2020-03']
+    report.history
+    assert calls == ['박영희']
+    assert list(personal_tables(report)) == ['개인현황', '월별납부내역']
+
+
+def test_personal_report_without_timeline():
+    index = build_member_index(MEMBERS, LEDGER)
+    report = build_personal_report(index, None, 'kim')
+    assert not report.has_history and report.history is None
+    assert list(personal_tables(report)) == ['개인현황']
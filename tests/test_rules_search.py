@@ -0,0 +1,58 @@
+import pandas as pd
+
+from rules_search import RuleIndex, highlight, to_choseong
+
+RULES = pd.DataFrame({
+    '조항': ['제1조', '제2조', '제3조', '제4조'],
+    '제목': ['목적', '회비', '상조금 지급', '탈퇴'],
+    '내용': ['회원 상호 간의 상조를 목적으로 한다 (상조회)', '회비는 매월 30,000원으로 한다',
+           '회원 경조사에 상조금을 지급한다. 회비 미납자는 제외', '탈퇴 시 회비는 반환하지 않는다'],
+})
+
+
+def positions(index, query):
+    return [pos for pos, _ in index.search(query)]
+
+
+def test_regex_metacharacters_are_plain_text():
+    index = RuleIndex(RULES)
+    assert positions(index, '(') == [0]
+    assert positions(index, '(상조회)') == [0]
+    assert positions(index, '.*') == []
+    assert positions(index, '30,000원') == [1]
+
+
+def test_choseong_query():
+    index = RuleIndex(RULES)
+    assert to_choseong('상조금') == 'ㅅㅈㄱ'
+    assert positions(index, 'ㅅㅈㄱ') == [2]
+    assert positions(index, 'ㅌㅌ') == [3]
+
+
+def test_all_words_must_match_and_title_ranks_higher():
+    index = RuleIndex(RULES)
+    # '회비'는 제2조 제목(가중치 2) + 내용, 제3조/제4조는 내용만
+    assert positions(index, '회비') == [1, 2, 3]
+    assert positions(index, '회비 상조금') == [2]
+    assert positions(index, '회비 없는말') == []
+
+
+def test_one_character_query():
+    index = RuleIndex(RULES)
+    assert positions(index, '탈') == [3]
+    assert set(positions(index, '회')) == {0, 1, 2, 3}
+
+
+def test_empty_query_lists_everything():
+    assert positions(RuleIndex(RULES), '  ') == [0, 1, 2, 3]
+
+
+def test_highlight_escapes_html():
+    assert highlight('<b>회비</b> & 상조', '회비') == '&lt;b&gt;<mark>회비</mark>&lt;/b&gt; &amp; 상조'
+    assert highlight('<script>', '') == '&lt;script&gt;'
+    assert highlight('a<b', '<') == 'a<mark>&lt;</mark>b'
+
+
+def test_highlight_choseong_and_case():
+    assert highlight('상조금 지급', 'ㅅㅈㄱ') == '<mark>상조금</mark> 지급'
+    assert highlight('Rule ABC', 'abc') == 'Rule <mark>ABC</mark>'
@@ -0,0 +1,107 @@
+import time
+from collections import Counter
+
+from benchmarks.mock_sheets import MockSheetServer
+from ingest import read_sheet
+from sheets import SheetFetcher, SHEET_NAMES
+
+SHEETS = {
+    "members": "성명,아이디\n김철수,kim\n박영희,park\n",
+    "ledger": "거래일시,구분,분류,내용,금액\n2026-01-01,입금,회비,김철수,\"30,000\"\n",
+    "assets": "항목,금액\n회비통장,\"30,000\"\n",
+    "rules": "조항,내용\n제1조,목적\n",
+}
+
+
+class CountingRead:
+    """시트별 파싱 횟수"""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def __call__(self, sheet_name, stream):
+        self.calls[sheet_name] += 1
+        return read_sheet(sheet_name, stream)
+
+
+def fetcher_for(server):
+    read = CountingRead()
+    return SheetFetcher(server.sheet_url, read=read), read
+
+
+def test_fetch_all_one_request_per_sheet():
+    with MockSheetServer(SHEETS) as server:
+        fetcher, read = fetcher_for(server)
+        results = fetcher.fetch_all()
+        assert server.requests == len(SHEET_NAMES)
+        assert all(r.changed and not r.error for r in results.values())
+        assert read.calls == Counter(SHEET_NAMES)
+        assert results["ledger"].frame['금액'].tolist() == [30000]
+        fetcher.close()
+
+
+def test_not_modified_reuses_cached_frame():
+    with MockSheetServer(SHEETS) as server:
+        fetcher, read = fetcher_for(server)
+        first = fetcher.fetch("members")
+        second = fetcher.fetch("members")
+        assert server.not_modified == 1
+        assert not second.changed and second.frame is first.frame and second.digest == first.digest
+        assert read.calls["members"] == 1
+        fetcher.close()
+
+
+def test_same_body_with_new_etag_is_not_parsed():
+    with MockSheetServer(SHEETS) as server:
+        fetcher, read = fetcher_for(server)
+        first = fetcher.fetch("ledger")
+        server.touch("ledger")
+        second = fetcher.fetch("ledger")
+        assert server.not_modified == 0          # 새 ETag 라 본문을 다시 받음
+        assert not second.changed and second.frame is first.frame
+        assert read.calls["ledger"] == 1         # 해시가 같으므로 파싱하지 않음
+        # 새 ETag 를 기억했으므로 다음 요청은 304
+        fetcher.fetch("ledger")
+        assert server.not_modified == 1
+        fetcher.close()
+
+
+def test_changed_sheet_is_parsed_again():
+    with MockSheetServer(SHEETS) as server:
+        fetcher, read = fetcher_for(server)
+        fetcher.fetch("members")
+        server.set_sheet("members", SHEETS["members"] + "이영수,lee\n")
+        result = fetcher.fetch("members")
+        assert result.changed and result.frame['성명'].tolist() == ['김철수', '박영희', '이영수']
+        assert read.calls["members"] == 2
+        fetcher.close()
+
+
+def test_failing_sheet_does_not_fail_others():
+    sheets = {name: content for name, content in SHEETS.items() if name != "assets"}
+    with MockSheetServer(sheets) as server:
+        fetcher, _ = fetcher_for(server)
+        results = fetcher.fetch_all()
+        assert results["assets"].error and results["assets"].frame.empty
+        assert all(not results[name].error and not results[name].frame.empty for name in sheets)
+        fetcher.close()
+
+
+def test_failed_refresh_keeps_last_good_frame():
+    with MockSheetServer(SHEETS) as server:
+        fetcher, _ = fetcher_for(server)
+        first = fetcher.fetch("rules")
+        del server.sheets["rules"]
+        second = fetcher.fetch("rules")
+        assert second.error and second.frame is first.frame and second.digest == first.digest
+        fetcher.close()
+
+
+def test_fetch_all_is_concurrent():
+    with MockSheetServer(SHEETS, latency=0.3) as server:
+        fetcher, _ = fetcher_for(server)
+        t0 = time.perf_counter()
+        fetcher.fetch_all()
+        # 하나씩 받으면 0.3초 × 4
+        assert time.perf_counter() - t0 < 0.3 * len(SHEET_NAMES) * 0.75
+        fetcher.close()
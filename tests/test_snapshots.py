@@ -0,0 +1,104 @@
+import json
+import os
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dues_timeline import PaidTotals
+from sheets import SHEET_NAMES
+import snapshots
+from snapshots import SnapshotStore, META_FILE
+from store import DataSnapshot
+
+pytest.importorskip("pyarrow")
+
+
+def make_snapshot():
+    frames = {name: pd.DataFrame({'내용': [f"{name}-1", f"{name}-2"], '금액': [1, 2]}) for name in SHEET_NAMES}
+    frames["ledger"]['구분'] = pd.Categorical(['입금', '출금'])
+    digests = {name: f"digest-{name}" for name in SHEET_NAMES}
+    sheet_loaded_at = {name: datetime(2026, 3, 1, 9, i) for i, name in enumerate(SHEET_NAMES)}
+    totals = PaidTotals(pd.Index(['김철수', '박영희'], dtype=object), pd.Period('2020-02', freq='M'),
+                        np.array([[100000, 0, 30000], [0, 130000, 0]], dtype="int64"))
+    return DataSnapshot(frames, "v1", digests, loaded_at=datetime(2026, 3, 1, 9, 0), sheet_loaded_at=sheet_loaded_at,
+                        paid_totals=totals)
+
+
+def test_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path), "https://example.com/sheet")
+    snapshot = make_snapshot()
+    assert store.save(snapshot)
+
+    frames, meta = store.load()
+    for name in SHEET_NAMES:
+        pd.testing.assert_frame_equal(frames[name], snapshot.frames[name])
+    assert meta["version"] == "v1"
+    assert meta["digests"] == snapshot.digests
+    assert meta["loaded_at"] == snapshot.loaded_at
+    assert meta["sheet_loaded_at"] == snapshot.sheet_loaded_at
+    totals = meta["paid_totals"]
+    assert totals.names.equals(snapshot.paid_totals.names) and totals.first == snapshot.paid_totals.first
+    assert (totals.paid == snapshot.paid_totals.paid).all()
+
+
+def test_without_paid_totals(tmp_path):
+    store = SnapshotStore(str(tmp_path), "https://example.com/sheet")
+    store.save(DataSnapshot(make_snapshot().frames, "v1"))
+    assert store.load()[1]["paid_totals"] is None
+
+
+def test_missing_or_broken(tmp_path):
+    store = SnapshotStore(str(tmp_path), "https://example.com/sheet")
+    assert store.load() is None
+    store.save(make_snapshot())
+    with open(store._path(META_FILE), "w", encoding="utf-8") as f: f.write("{")
+    assert store.load() is None
+
+
+def test_separate_folder_per_sheet(tmp_path):
+    store = SnapshotStore(str(tmp_path), "https://example.com/a")
+    store.save(make_snapshot())
+    assert SnapshotStore(str(tmp_path), "https://example.com/b").load() is None
+
+
+def test_interrupted_save_keeps_previous_snapshot(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path), "https://example.com/sheet")
+    old = make_snapshot()
+    store.save(old)
+
+    new = replace(old, version="v2", frames={**old.frames, "members": old.frames["members"].head(1)},
+                  digests={**old.digests, "members": "digest-new"})
+    written = []
+
+    def crash_on_third(table, path, **kwargs):
+        if len(written) == 2: raise OSError("디스크 가득 참")
+        written.append(path)
+        real_write(table, path, **kwargs)
+    real_write = snapshots.feather.write_feather
+    monkeypatch.setattr(snapshots.feather, "write_feather", crash_on_third)
+    with pytest.raises(OSError):
+        store.save(new)
+    monkeypatch.undo()
+
+    # 새 회원 시트가 이미 쓰였어도 이전 버전/해시와 섞이지 않음
+    frames, meta = store.load()
+    assert meta["version"] == "v1" and meta["digests"] == old.digests
+    pd.testing.assert_frame_equal(frames["members"], old.frames["members"])
+
+    store.save(new)
+    frames, meta = store.load()
+    assert meta["version"] == "v2" and len(frames["members"]) == 1
+    # 이전 버전 폴더와 멈춘 저장의 임시 폴더는 지워짐
+    assert sorted(os.listdir(store.directory)) == sorted([META_FILE, meta["folder"]])
+
+
+def test_previous_format_is_ignored(tmp_path):
+    store = SnapshotStore(str(tmp_path), "https://example.com/sheet")
+    store.save(make_snapshot())
+    with open(store._path(META_FILE), encoding="utf-8") as f: meta = json.load(f)
+    del meta["folder"]
+    with open(store._path(META_FILE), "w", encoding="utf-8") as f: json.dump(meta, f)
+    assert store.load() is None
@@ -0,0 +1,182 @@
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+import pandas as pd
+
+import store
+from benchmarks.mock_sheets import MockSheetServer
+from dues_timeline import tally_paid
+from member_resolve import resolve_members
+from sheets import SheetFetcher, SheetResult, SHEET_NAMES
+from store import DataSource, LedgerSync
+
+
+class FakeFetcher:
+    """시트명 → DataFrame 또는 실패 사유(str)"""
+
+    def __init__(self, sheets):
+        self.sheets = sheets
+
+    def result(self, name):
+        sheet = self.sheets[name]
+        if isinstance(sheet, str): return SheetResult(pd.DataFrame(), error=sheet)
+        return SheetResult(sheet, digest=str(len(sheet)))
+
+    def fetch_all(self, names):
+        return {name: self.result(name) for name in names}
+
+    def submit(self, fn):
+        future = Future()
+        future.set_result(fn())
+        return future
+
+
+class FakeLedgerSync:
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+
+    def sync(self):
+        return self.fetcher.result("ledger")
+
+    def totals_for(self, df_members):
+        return None
+
+
+def frame(n):
+    return pd.DataFrame({'내용': [str(i) for i in range(n)]})
+
+
+def test_failed_sheet_keeps_previous_data_and_time():
+    fetcher = FakeFetcher({name: frame(1) for name in SHEET_NAMES})
+    source = DataSource(fetcher, FakeLedgerSync(fetcher))
+    first = source.refresh(force=True)
+    assert not first.errors
+    time.sleep(0.01)
+
+    fetcher.sheets.update(ledger="연결 실패", rules=frame(2))
+    second = source.refresh(force=True)
+
+    assert second.errors == {"ledger": "연결 실패"}
+    assert len(second.frames["ledger"]) == 1 and len(second.frames["rules"]) == 2
+    # 실패한 장부는 처음 읽은 시각, 다시 읽은 시트는 이번 시각
+    assert second.sheet_time("ledger") == first.sheet_time("ledger")
+    assert second.sheet_time("rules") > first.sheet_time("rules")
+    assert second.loaded_at == first.loaded_at
+
+
+def test_never_loaded_sheet_has_no_time():
+    fetcher = FakeFetcher({**{name: frame(1) for name in SHEET_NAMES}, "assets": "없는 시트"})
+    source = DataSource(fetcher, FakeLedgerSync(fetcher))
+    source.refresh(force=True)
+    snap = source.refresh(force=True)
+    assert "assets" not in snap.sheet_loaded_at
+    assert snap.loaded_at == min(snap.sheet_loaded_at.values())
+    assert snap.loaded_at <= datetime.now()
+
+
+# --- 장부 증분 동기화 (로컬 시트 대역) ---
+def ledger_csv(rows):
+    lines = ["거래일시,구분,분류,내용,금액"]
+    lines += [f"2026-01-{day:02d} 10:00:00,입금,회비,{name},\"{amount:,}\"" for day, name, amount in rows]
+    return "\n".join(lines) + "\n"
+
+
+ROWS = [(1, '김철수', 30000), (2, '박영희', 30000), (3, '이영수', 30000)]
+
+
+def synced(server, verify_every=2):
+    fetcher = SheetFetcher(server.sheet_url)
+    ledger = LedgerSync(fetcher, verify_every=verify_every)
+    assert not ledger.sync().error
+    return fetcher, ledger
+
+
+def contents(ledger):
+    return ledger.frame['내용'].astype(str).tolist()
+
+
+def test_ledger_appends_tail():
+    with MockSheetServer({"ledger": ledger_csv(ROWS)}) as server:
+        fetcher, ledger = synced(server)
+        server.set_sheet("ledger", ledger_csv(ROWS + [(4, '최민수', 50000)]))
+        result = ledger.sync()
+        assert result.changed and contents(ledger) == ['김철수', '박영희', '이영수', '최민수']
+        # 재검증: 끝에 붙은 행이 증분으로 받은 행과 같으므로 전체를 다시 받지 않음
+        assert not ledger.sync().changed
+        assert ledger._verified.rows == 4
+        fetcher.close()
+
+
+def test_ledger_middle_edit_found_by_verify():
+    with MockSheetServer({"ledger": ledger_csv(ROWS)}) as server:
+        fetcher, ledger = synced(server)
+        edited = [ROWS[0], (2, '박영희', 10000), ROWS[2]]
+        server.set_sheet("ledger", ledger_csv(edited))
+        assert not ledger.sync().changed      # 마지막 행이 같아서 증분만으로는 모름
+        assert ledger.sync().changed          # 재검증에서 발견 → 전체 동기화
+        assert ledger.frame['금액'].tolist() == [30000, 10000, 30000]
+        fetcher.close()
+
+
+def test_ledger_delete_and_append_same_count():
+    with MockSheetServer({"ledger": ledger_csv(ROWS)}) as server:
+        fetcher, ledger = synced(server, verify_every=1)
+        server.set_sheet("ledger", ledger_csv([ROWS[0], ROWS[2], (4, '최민수', 50000)]))
+        assert ledger.sync().changed
+        assert contents(ledger) == ['김철수', '이영수', '최민수']
+        fetcher.close()
+
+
+def test_ledger_seed_forces_full_sync():
+    with MockSheetServer({"ledger": ledger_csv(ROWS)}) as server:
+        fetcher, ledger = synced(server)
+        stale = ledger.frame.iloc[:2]
+        server.set_sheet("ledger", ledger_csv([ROWS[0], (2, '박영희', 10000), *ROWS[2:]]))
+        restarted = LedgerSync(SheetFetcher(server.sheet_url))
+        restarted.seed(stale, "old-version")
+        assert restarted.sync().changed
+        assert restarted.frame['금액'].tolist() == [30000, 10000, 30000]
+        restarted.fetcher.close()
+        fetcher.close()
+
+
+def test_ledger_paid_totals_add_only_new_rows(monkeypatch):
+    members = pd.DataFrame({'성명': ['김철수', '박영희', '이영수', '최민수']})
+    tallied = []
+
+    def spy(names, member_ids, rows, base=None):
+        tallied.append(len(rows))
+        return tally_paid(names, member_ids, rows, base)
+    monkeypatch.setattr(store, "tally_paid", spy)
+
+    with MockSheetServer({"ledger": ledger_csv(ROWS)}) as server:
+        fetcher, ledger = synced(server, verify_every=100)
+        ledger.totals_for(members)
+        server.set_sheet("ledger", ledger_csv(ROWS + [(4, '최민수님', 50000), (5, '김철수', 30000)]))
+        assert ledger.sync().changed
+        totals = ledger.totals_for(members)
+        assert tallied == [3, 2]   # 처음 전체 3행, 그다음은 새로 붙은 2행만
+
+        whole = tally_paid(totals.names, resolve_members(members, ledger.frame).member_ids, ledger.frame)
+        assert (totals.paid == whole.paid).all()
+        assert totals.paid.sum(axis=1).tolist() == [60000, 30000, 30000, 50000]
+
+        # 성명 목록이 바뀌면 장부 전체로 다시 집계
+        changed = ledger.totals_for(members.iloc[:2])
+        assert tallied[-1] == 5 and changed.paid.sum(axis=1).tolist() == [60000, 30000]
+        fetcher.close()
+
+
+def test_seeded_paid_totals_are_kept_until_the_ledger_changes():
+    members = pd.DataFrame({'성명': ['김철수', '박영희', '이영수']})
+    with MockSheetServer({"ledger": ledger_csv(ROWS)}) as server:
+        fetcher, ledger = synced(server)
+        saved = ledger.totals_for(members)
+        restarted = LedgerSync(SheetFetcher(server.sheet_url))
+        restarted.seed(ledger.frame, ledger.version, saved)
+        assert restarted.totals_for(members) is saved
+        assert not restarted.sync().error            # 시작 후 첫 동기화는 전체 - 내용이 같으므로 합계 유지
+        assert restarted.totals_for(members) is saved
+        restarted.fetcher.close()
+        fetcher.close()
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from sheets import SHEET_NAMES
+from store import DataSnapshot, DataSource
+from tenants import DEFAULT_CLUB, AggregateCache, Club, Tenant, TenantRegistry, load_clubs, snapshot_bytes
+
+
+def test_debug_token_per_club():
+    clubs = load_clubs({
+        "clubs": {
+            "seoul": {"sheet_url": "https://example.com/d/A/edit", "debug_token": "s-token"},
+            "busan": {"sheet_url": "https://example.com/d/B/edit"},
+        },
+        "admin": {"debug_token": "global"},
+    })
+    assert clubs["seoul"].debug_token == "s-token"
+    assert clubs["busan"].debug_token == ""     # [admin] 토큰은 여러 상조회에 통하지 않음
+
+
+def test_single_club_uses_admin_token():
+    clubs = load_clubs({"connections": {"sheet_url": "https://example.com/d/A/edit"},
+                        "admin": {"debug_token": "global"}})
+    assert list(clubs) == [DEFAULT_CLUB]
+    assert clubs[DEFAULT_CLUB].debug_token == "global"
+
+
+# --- 상조회 메모리 한도 ---
+MB = 2**20
+
+
+def big_snapshot(mb, version="v1"):
+    frames = {name: pd.DataFrame() for name in SHEET_NAMES}
+    frames["ledger"] = pd.DataFrame({'금액': np.zeros(mb * MB // 8, dtype="int64")})
+    return DataSnapshot(frames, version)
+
+
+def test_frames_count_toward_limit():
+    cache = AggregateCache(4 * MB)
+    cache.get("a", 1, lambda: np.zeros(MB // 8))
+    cache.get("b", 1, lambda: np.zeros(MB // 8))
+    assert len(cache) == 2
+    snap = big_snapshot(2)
+    cache.reserve(snap)
+    assert cache.data_bytes == snapshot_bytes(snap)
+    assert len(cache) == 1 and cache.get("b", 1, lambda: None) is not None   # 오래 안 쓴 "a" 부터
+    assert cache.data_bytes + cache.size <= cache.limit
+
+
+def test_aggregate_holding_frames_is_not_counted_twice():
+    cache = AggregateCache(8 * MB)
+    snap = big_snapshot(3)
+    cache.reserve(snap)
+    cache.get("timeline", "v1", lambda: {"ledger": snap.frames["ledger"], "paid": np.zeros(8)})
+    assert cache.size < MB
+
+
+class FakeSource:
+    def __init__(self):
+        self.listeners, self.closed = [], False
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def close(self):
+        self.closed = True
+
+
+def test_prepare_reserves_new_frames_before_warming():
+    tenant = Tenant(Club("seoul", "https://example.com/a", memory_mb=4))
+    tenant.attach(FakeSource())
+    tenant.aggregates.get("old", 1, lambda: np.zeros(MB // 8))
+    new = big_snapshot(2, "v2")
+    seen = []
+
+    def warm(cache, snap):
+        seen.append(cache.data_bytes)
+        cache.get("new", 1, lambda: np.zeros(MB // 8))
+    tenant.prepare(new, warm)
+    assert seen == [snapshot_bytes(new)]
+    # 이전 버전 집계가 밀려나서 새 프레임 + 새 집계가 한도 안에 들어감
+    assert len(tenant.aggregates) == 1 and tenant.data_bytes + tenant.aggregates.size <= 4 * MB
+
+
+def test_evicted_tenant_closes_its_source():
+    clubs = {club_id: Club(club_id, f"https://example.com/{club_id}") for club_id in ("a", "b")}
+    registry = TenantRegistry(clubs, lambda tenant: FakeSource(), max_active=1)
+    first = registry.get("a").source
+    registry.get("b")
+    assert first.closed and registry.evictions == 1
+
+
+def test_closing_source_closes_fetcher():
+    class Fetcher:
+        closed = False
+
+        def close(self):
+            self.closed = True
+    fetcher = Fetcher()
+    DataSource(fetcher, None).close()
+    assert fetcher.closed